@@ -0,0 +1,80 @@
+# app/api/lazy_routes.py
+"""
+Lazily-imported routers (serverless cold starts).
+
+LazyRouterRoute sits in the app's route table in place of a whole router.
+The router module (and everything it drags in: schemas, models, passlib...)
+is imported the first time a request path falls under its prefix; after
+that it simply delegates to the real APIRoutes.
+"""
+import importlib
+import threading
+from typing import Any, List, Optional, Sequence
+
+from fastapi import APIRouter
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+from app.core.logger import logger
+
+
+class LazyRouterRoute(BaseRoute):
+    def __init__(
+        self,
+        module: str,
+        path_prefix: str,
+        *,
+        router_prefix: str = "",
+        include_prefix: str = "",
+        tags: Optional[Sequence[str]] = None,
+        attr: str = "router",
+    ):
+        self.module = module
+        self.attr = attr
+        self.path_prefix = path_prefix          # cheap pre-filter, e.g. "/api/clients"
+        self.router_prefix = router_prefix      # e.g. "/api"
+        self.include_prefix = include_prefix    # e.g. "/auth"
+        self.tags = list(tags) if tags else None
+        self._routes: Optional[List[BaseRoute]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._routes is not None
+
+    def load(self) -> List[BaseRoute]:
+        if self._routes is None:
+            with self._lock:
+                if self._routes is None:
+                    router = getattr(importlib.import_module(self.module), self.attr)
+                    holder = APIRouter(prefix=self.router_prefix)
+                    holder.include_router(router, prefix=self.include_prefix, tags=self.tags)
+                    self._routes = list(holder.routes)
+                    logger.info(f"📦 Lazy router loaded: {self.module} ({len(self._routes)} routes)")
+        return self._routes
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        if scope["type"] not in ("http", "websocket") or not scope["path"].startswith(self.path_prefix):
+            return Match.NONE, {}
+        partial: Optional[tuple[Match, Scope]] = None
+        for route in self.load():
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return match, {**child_scope, "route": route}
+            if match == Match.PARTIAL and partial is None:
+                partial = (match, {**child_scope, "route": route})
+        return partial or (Match.NONE, {})
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await scope["route"].handle(scope, receive, send)
+
+    def url_path_for(self, name: str, /, **path_params: Any):
+        for route in self._routes or []:
+            try:
+                return route.url_path_for(name, **path_params)
+            except NoMatchFound:
+                pass
+        raise NoMatchFound(name, path_params)
+
+    def __repr__(self) -> str:
+        return f"LazyRouterRoute(module={self.module!r}, path_prefix={self.path_prefix!r}, loaded={self.loaded})"
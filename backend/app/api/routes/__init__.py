@@ -1,17 +1,62 @@
 # app/api/routes/__init__.py
+from typing import List
+
 from fastapi import APIRouter
 
-from .auth import router as auth_router
-from .clients import router as clients_router
-from .company_profile import router as company_profile_router
-from .invoice import router as invoice_router
-from .company_settings import router as company_settings_router
+API_PREFIX = "/api"
+
+# (module, include prefix, tags, request-path prefix used for lazy loading)
+# Order matters for lazy loading: the invoice router has bare "/{invoice_id}" paths, so it goes last.
+ROUTER_MODULES = [
+    ("app.api.routes.auth", "/auth", ["Auth"], "/api/auth"),
+    ("app.api.routes.clients", "", None, "/api/clients"),                 # expects prefix="/clients" inside module
+    ("app.api.routes.company_profile", "", None, "/api/company-profile"),  # expects its own prefix inside module
+    ("app.api.routes.company_settings", "", None, "/api/company/"),       # expects its own prefix inside module
+    ("app.api.routes.admin", "", None, "/api/admin"),                     # expects prefix="/admin" inside module
+    ("app.api.routes.invoice", "", None, "/api/"),                        # expects its own prefix inside module
+]
+
+
+def build_api_router() -> APIRouter:
+    """Eagerly import every router under the single /api prefix."""
+    import importlib
+
+    # ✅ Single /api prefix applied to all included routers
+    router = APIRouter(prefix=API_PREFIX)
+    for module, include_prefix, tags, _ in ROUTER_MODULES:
+        sub = importlib.import_module(module).router
+        if tags:
+            router.include_router(sub, prefix=include_prefix, tags=tags)
+        else:
+            router.include_router(sub, prefix=include_prefix)
+    return router
+
+
+def build_lazy_routes() -> List:
+    """Serverless: one placeholder per router; each module is imported on first matching request."""
+    from app.api.lazy_routes import LazyRouterRoute
+
+    return [
+        LazyRouterRoute(
+            module,
+            path_prefix,
+            router_prefix=API_PREFIX,
+            include_prefix=include_prefix,
+            tags=tags,
+        )
+        for module, include_prefix, tags, path_prefix in ROUTER_MODULES
+    ]
+
+
+_api_router = None
 
-# ✅ Single /api prefix applied to all included routers
-api_router = APIRouter(prefix="/api")
 
-api_router.include_router(auth_router, prefix="/auth", tags=["Auth"])
-api_router.include_router(clients_router)              # expects prefix="/clients" inside module
-api_router.include_router(company_profile_router)      # expects its own prefix inside module
-api_router.include_router(invoice_router)              # expects its own prefix inside module
-api_router.include_router(company_settings_router)     # expects its own prefix inside module
+def __getattr__(name: str):
+    # Back-compat: `from app.api.routes import api_router` still works, but the
+    # routers are only imported when somebody actually asks for them.
+    global _api_router
+    if name == "api_router":
+        if _api_router is None:
+            _api_router = build_api_router()
+        return _api_router
+    raise AttributeError(name)
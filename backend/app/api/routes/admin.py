@@ -0,0 +1,31 @@
+# app/api/routes/admin.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.core.logger import logger
+from app.core.profiler import request_profiler
+from app.db.deps import get_master_user
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(
+    profile_id: str,
+    mode: str = Query("wall", pattern="^(wall|cpu|summary)$"),
+    user=Depends(get_master_user),
+):
+    """
+    Profile captured for a request (by the X-Profile-Id its response carried).
+    wall/cpu: collapsed stacks for flamegraph.pl / speedscope; summary: JSON metadata.
+    """
+    logger.info("➡️ GET /admin/profiles/%s | mode=%s", profile_id, mode)
+    profile = request_profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found or expired")
+    if mode == "summary":
+        return profile.summary()
+    return PlainTextResponse(
+        profile.collapsed(mode),
+        headers={"Content-Disposition": f'attachment; filename="{profile.profile_id}.{mode}.collapsed"'},
+    )
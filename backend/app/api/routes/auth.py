@@ -9,28 +9,27 @@ from app.db.deps import get_current_user  # <-- make sure this returns claims fr
 from app.schemas.auth import UserCreate, UserRead, LoginInput, LoginResponse
 from app.services.auth_service import AuthService
 from app.repositories.auth_repo import AuthRepository
-from app.repositories.company_profile_repo import CompanyProfileRepository
+from app.services.company_directory import company_directory
 from app.utils.response_utils import set_refresh_cookie
 from app.utils.security import is_master_username
 
 router = APIRouter()
 service = AuthService()
 auth_repo = AuthRepository()
-company_repo = CompanyProfileRepository()
 
 @router.post("/register", response_model=UserRead)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
-    logger.info(f"➡️ POST /auth/register | user={user.username}")
-    result = service.register_user(user, db)
-    logger.info(f"✅ User registered: {result.username}")
+async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+    logger.info("➡️ POST /auth/register | user=%s", user.username)
+    result = await service.register_user(user, db)
+    logger.info("✅ User registered: %s", result.username)
     return result
 
 @router.post("/login", response_model=LoginResponse)
-def login(payload: LoginInput, response: Response, db: Session = Depends(get_db)):
-    logger.info(f"➡️ POST /auth/login | user={payload.username}")
-    result, refresh_token = service.login(payload, db)
+async def login(payload: LoginInput, response: Response, db: Session = Depends(get_db)):
+    logger.info("➡️ POST /auth/login | user=%s", payload.username)
+    result, refresh_token = await service.login(payload, db)
     set_refresh_cookie(response, refresh_token)
-    logger.info(f"✅ User login successful: {payload.username}")
+    logger.info("✅ User login successful: %s", payload.username)
     return result
 
 @router.post("/refresh", response_model=LoginResponse)
@@ -73,7 +72,7 @@ def me(claims: dict = Depends(get_current_user), db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
     # Fetch company (for db_name) if linked
-    company = company_repo.get_by_id(db, user.company_id) if getattr(user, "company_id", None) else None
+    company = company_directory.lookup(db, user.company_id) if getattr(user, "company_id", None) else None
 
     return {
         "user": {
@@ -1,81 +1,185 @@
-from fastapi import APIRouter, Depends, Query, status
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Sequence
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logger import logger
-from app.schemas.client import ClientCreate, ClientUpdate, ClientOut, ClientListOut, PageMeta
-from app.services.client_service import client_service
-from app.db.deps import get_company_db, get_current_user  # ✅ use your deps
+from app.schemas.client import (
+    ClientBulkRequest, ClientBulkResult, ClientCreate, ClientUpdate, ClientOut, ClientListOut, ClientSuggestion,
+)
+from app.services.client_service import async_client_service as client_service
+from app.services.client_import import IMPORT_FORMATS, detect_format, import_clients
+from app.services.export_service import EXPORT_FORMATS, MEDIA_TYPES, export_filename
+from app.utils.response_utils import FastJSONResponse, UploadStreamingResponse, ndjson_lines, attachment_headers
+from app.db.async_database import release_connection_async
+from app.db.deps import get_company_db_async, get_current_user  # ✅ use your deps
+from app.validators.fields_validator import parse_fields
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
 DEFAULT_PAGE_SIZE = 10
 MAX_PAGE_SIZE = 100
+DEFAULT_SUGGEST_LIMIT = 10
+MAX_SUGGEST_LIMIT = 50
+CLIENT_FIELDS = tuple(ClientOut.model_fields)
+FIELDS_DESCRIPTION = "Comma-separated ClientOut attributes to return (id is always included); default all"
+
+def _row_dicts(rows, fields: Optional[Sequence[str]]) -> List[dict]:
+    if fields is None:
+        return [r._asdict() for r in rows]
+    # List rows also carry the keyset columns; return only what was asked for
+    return [{f: r._mapping[f] for f in fields} for r in rows]
+
+# Handlers are async on an AsyncSession: waiting on Postgres doesn't hold a worker thread.
 
 @router.get("", response_model=ClientListOut)
-def list_clients(
-    q: Optional[str] = Query(None, description="Search name/email/company"),
+async def list_clients(
+    q: Optional[str] = Query(None, description="Search name/email/company (typo-tolerant, best match first)"),
     status: Optional[str] = Query(None, description="Active|Deactivated|Blacklisted"),
     page: int = Query(1, ge=1),
     page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
-    db: Session = Depends(get_company_db),          # ✅ tenant session
+    cursor: Optional[str] = Query(None, description="meta.next / meta.prev from a previous page; overrides page (not with q)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_company_db_async),  # ✅ tenant session
     user: dict = Depends(get_current_user),         # ✅ dict from deps.py
 ):
     uname = user.get("email") or user.get("sub") or "unknown"
-    logger.info(f"➡️ GET /clients | user={uname} q={q} status={status} page={page} size={page_size}")
-    rows, total = client_service.list(db, q, status, page, page_size)
-    logger.info(f"✅ /clients | total={total} returned={len(rows)}")
-    return ClientListOut(
-        data=[ClientOut.model_validate(r) for r in rows],
-        meta=PageMeta(page=page, page_size=page_size, total=total),
+    logger.info("➡️ GET /clients | user=%s q=%s status=%s page=%s size=%s", uname, q, status, page, page_size)
+    selected = parse_fields(fields, CLIENT_FIELDS)
+    rows, meta = await client_service.list(db, q, status, page, page_size, cursor, selected)
+    await release_connection_async(db)  # hand the connection back before serialization
+    logger.info("✅ /clients | total=%s returned=%s", meta.total, len(rows))
+    # Rows are exactly ClientOut's columns straight from the DB: encode them as-is
+    # (no per-row model validation, no second pass against response_model)
+    return FastJSONResponse({"data": _row_dicts(rows, selected), "meta": meta.model_dump()})
+
+# Declared before /{client_id} so "suggest" isn't parsed as a client id
+@router.get("/suggest", response_model=List[ClientSuggestion])
+async def suggest_clients(
+    prefix: str = Query(..., min_length=1, max_length=200, description="Start of a name, any name word, or email"),
+    limit: int = Query(DEFAULT_SUGGEST_LIMIT, ge=1, le=MAX_SUGGEST_LIMIT),
+    db: AsyncSession = Depends(get_company_db_async),
+    user: dict = Depends(get_current_user),
+):
+    # Served from the tenant's in-memory prefix index; only the first call per tenant hits the DB
+    matches = await client_service.suggest(db, prefix, limit)
+    await release_connection_async(db)
+    return [ClientSuggestion(id=i, name=n, email=e, status=st) for i, n, e, st in matches]
+
+@router.post("/import")
+async def import_clients_route(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv|ndjson (default: from Content-Type)"),
+    db: AsyncSession = Depends(get_company_db_async),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Raw CSV (header row of ClientCreate field names) or NDJSON request body.
+    Responds with NDJSON events while the upload is processed: per-row errors,
+    progress every batch, then a final done/aborted summary.
+    """
+    fmt = detect_format(format, request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Send text/csv or application/x-ndjson (or ?format= one of {list(IMPORT_FORMATS)})",
+        )
+    uname = user.get("email") or user.get("sub") or "system"
+    logger.info("➡️ POST /clients/import | user=%s format=%s", uname, fmt)
+    events = import_clients(db, request.stream(), fmt, created_by=uname)
+    return UploadStreamingResponse(ndjson_lines(events), media_type="application/x-ndjson")
+
+@router.get("/export")
+async def export_clients(
+    format: str = Query("csv", pattern="^(csv|ndjson|xlsx)$", description=f"One of {list(EXPORT_FORMATS)}"),
+    q: Optional[str] = Query(None, description="Same filter as the list endpoint"),
+    status: Optional[str] = Query(None, description="Active|Deactivated|Blacklisted"),
+    db: AsyncSession = Depends(get_company_db_async),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Whole (filtered) client list as a download. Rows are streamed off a
+    server-side cursor, so the connection stays checked out until the last
+    byte is sent (no release_connection_async here).
+    """
+    uname = user.get("email") or user.get("sub") or "unknown"
+    logger.info("➡️ GET /clients/export | user=%s format=%s q=%s status=%s", uname, format, q, status)
+    body = client_service.export(db, q, status, format)
+    return StreamingResponse(
+        body, media_type=MEDIA_TYPES[format], headers=attachment_headers(export_filename("clients", format)),
     )
 
+@router.post("/bulk", response_model=ClientBulkResult)
+async def bulk_clients(
+    payload: ClientBulkRequest,
+    db: AsyncSession = Depends(get_company_db_async),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Update (fields and/or status) or delete many clients in one transaction.
+    Select by "ids" or by "filter" ({q, status}, same meaning as the list).
+    Ids that don't exist are skipped; "ids" in the result are the rows affected.
+    """
+    uname = user.get("email") or user.get("sub") or "unknown"
+    logger.info("➡️ POST /clients/bulk | user=%s action=%s", uname, payload.action)
+    result = await client_service.bulk(db, payload)
+    logger.info("✅ /clients/bulk | action=%s affected=%s", result.action, result.affected)
+    return result
+
 @router.get("/{client_id}", response_model=ClientOut)
-def get_client(
+async def get_client(
     client_id: UUID,
-    db: Session = Depends(get_company_db),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_company_db_async),
     user: dict = Depends(get_current_user),
 ):
     uname = user.get("email") or user.get("sub") or "unknown"
-    logger.info(f"➡️ GET /clients/{client_id} | user={uname}")
-    obj = client_service.get(db, client_id)
-    logger.info(f"✅ /clients/{client_id} | found")
+    logger.info("➡️ GET /clients/%s | user=%s fields=%s", client_id, uname, fields)
+    selected = parse_fields(fields, CLIENT_FIELDS)
+    if selected is not None:
+        # Only the requested columns are selected; a partial body can't go through ClientOut
+        row = await client_service.get_fields(db, client_id, selected)
+        await release_connection_async(db)
+        return FastJSONResponse(row._asdict())
+    obj = await client_service.get(db, client_id)
+    await release_connection_async(db)
+    logger.info("✅ /clients/%s | found", client_id)
     return ClientOut.model_validate(obj)
 
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=ClientOut)
-def create_client(
+async def create_client(
     payload: ClientCreate,
-    db: Session = Depends(get_company_db),
+    db: AsyncSession = Depends(get_company_db_async),
     user: dict = Depends(get_current_user),
 ):
     uname = user.get("email") or user.get("sub") or "system"
-    logger.info(f"➡️ POST /clients | user={uname} name={payload.name} email={payload.email}")
-    obj = client_service.create(db, payload, created_by=uname)
-    logger.info(f"✅ /clients created | id={obj.id} name={obj.name}")
+    logger.info("➡️ POST /clients | user=%s name=%s email=%s", uname, payload.name, payload.email)
+    obj = await client_service.create(db, payload, created_by=uname)
+    logger.info("✅ /clients created | id=%s name=%s", obj.id, obj.name)
     return ClientOut.model_validate(obj)
 
 @router.put("/{client_id}", response_model=ClientOut)
-def update_client(
+async def update_client(
     client_id: UUID,
     payload: ClientUpdate,
-    db: Session = Depends(get_company_db),
+    db: AsyncSession = Depends(get_company_db_async),
     user: dict = Depends(get_current_user),
 ):
     uname = user.get("email") or user.get("sub") or "unknown"
-    logger.info(f"➡️ PUT /clients/{client_id} | user={uname}")
-    obj = client_service.update(db, client_id, payload)
-    logger.info(f"✅ /clients/{client_id} updated")
+    logger.info("➡️ PUT /clients/%s | user=%s", client_id, uname)
+    obj = await client_service.update(db, client_id, payload)
+    logger.info("✅ /clients/%s updated", client_id)
     return ClientOut.model_validate(obj)
 
 @router.delete("/{client_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_client(
+async def delete_client(
     client_id: UUID,
-    db: Session = Depends(get_company_db),
+    db: AsyncSession = Depends(get_company_db_async),
     user: dict = Depends(get_current_user),
 ):
     uname = user.get("email") or user.get("sub") or "unknown"
-    logger.info(f"➡️ DELETE /clients/{client_id} | user={uname}")
-    client_service.delete(db, client_id)
-    logger.info(f"🗑️ /clients/{client_id} deleted")
+    logger.info("➡️ DELETE /clients/%s | user=%s", client_id, uname)
+    await client_service.delete(db, client_id)
+    logger.info("🗑️ /clients/%s deleted", client_id)
     return None
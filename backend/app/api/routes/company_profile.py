@@ -2,11 +2,14 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.logger import logger
+from app.db.async_database import release_connection_async
 from app.db.database import get_db
-from app.db.deps import get_company_db  # tenant-scoped session
+from app.db.deps import get_company_db_async  # tenant-scoped session
 from app.schemas.company_profile import CompanyProfileOut
 from app.services.company_profile_service import CompanyProfileService
 
@@ -21,7 +24,7 @@ service = CompanyProfileService()
 
 
 @router.post("/company-profile", response_model=CompanyProfileOut)
-def register_company_profile(
+async def register_company_profile(
     company_name: str = Form(...),
     company_email: str = Form(...),
     company_mobile: str = Form(...),
@@ -42,9 +45,9 @@ def register_company_profile(
     Registers a new company in the MASTER DB, creates tenant DB if missing,
     creates tenant tables, and returns the created profile (including db_name).
     """
-    logger.info(f"🚀 Registering company: {company_name}")
+    logger.info("🚀 Registering company: %s", company_name)
 
-    profile: CompanyProfileOut = service.register(
+    profile: CompanyProfileOut = await service.register(
         master_db=master_db,
         company_name=company_name,
         company_email=company_email,
@@ -69,19 +72,19 @@ def register_company_profile(
         raise HTTPException(status_code=500, detail="Tenant database name missing after registration")
 
     try:
-        create_tenant_database_if_missing(db_name)
+        await run_in_threadpool(create_tenant_database_if_missing, db_name)
     except Exception as e:
         # If DB exists, continue; otherwise surface later
-        logger.warning(f"⚠️ create_tenant_database_if_missing({db_name}) warning: {e}")
+        logger.warning("⚠️ create_tenant_database_if_missing(%s) warning: %s", db_name, e)
 
-    ensure_tenant_tables(db_name)
-    logger.info(f"🔧 Tenant DB + tables ready for '{db_name}'")
+    await run_in_threadpool(ensure_tenant_tables, db_name)
+    logger.info("🔧 Tenant DB + tables ready for '%s'", db_name)
 
     return profile
 
 
 @router.put("/company-profile", response_model=CompanyProfileOut)
-def update_company_profile(
+async def update_company_profile(
     # ✅ all optional for partial updates
     company_name: Optional[str] = Form(None),
     company_email: Optional[str] = Form(None),
@@ -94,12 +97,12 @@ def update_company_profile(
     zip_code: Optional[str] = Form(None),
     tax_rate: Optional[float] = Form(None),
     status: Optional[str] = Form(None),
-    tenant_db: Session = Depends(get_company_db),
+    tenant_db: AsyncSession = Depends(get_company_db_async),
 ):
     """
     Updates the current tenant's company profile (partial allowed).
     """
-    return service.update(
+    return await service.update(
         tenant_db=tenant_db,
         company_name=company_name,
         company_email=company_email,
@@ -116,8 +119,10 @@ def update_company_profile(
 
 
 @router.get("/company-profile", response_model=CompanyProfileOut)
-def get_company_profile(tenant_db: Session = Depends(get_company_db)):
+async def get_company_profile(tenant_db: AsyncSession = Depends(get_company_db_async)):
     """
     Returns the current tenant's company profile.
     """
-    return service.get(tenant_db=tenant_db)
+    profile = await service.get(tenant_db=tenant_db)
+    await release_connection_async(tenant_db)
+    return profile
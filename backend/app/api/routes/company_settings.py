@@ -4,14 +4,22 @@ from __future__ import annotations
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status, Body
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.deps import get_company_db, get_current_user  # 👈 keep your alias
+from app.db.async_database import release_connection_async
+from app.db.deps import get_company_db_async, get_current_user  # 👈 keep your alias
 from app.schemas.company_settings import CompanySettingsOut, CompanySettingsUpdate
-from app.services.company_settings_service import get_or_create_settings, update_settings
+from app.services.company_settings_service import (
+    get_or_create_settings_async,
+    get_settings_fields_async,
+    update_settings_async,
+)
 from app.validators.company_settings_validator import validate_company_settings
 from app.utils.file_utils import save_logo_file, save_signature_file
+from app.utils.response_utils import FastJSONResponse
+from app.validators.fields_validator import parse_fields
 
 router = APIRouter(prefix="/company", tags=["Company Settings"])
 log = logging.getLogger("app.api.routes.company_settings")
@@ -25,18 +33,27 @@ def _to_bool(v):
 
 
 @router.get("/settings", response_model=CompanySettingsOut)
-def get_settings(
-    db: Session = Depends(get_company_db),
+async def get_settings(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated CompanySettingsOut attributes, e.g. logo_url,legal_name; default all",
+    ),
+    db: AsyncSession = Depends(get_company_db_async),
     _user=Depends(get_current_user),
 ):
-    log.info("🔎 Fetching company settings")
-    settings = get_or_create_settings(db)
+    log.info("🔎 Fetching company settings (fields=%s)", fields)
+    selected = parse_fields(fields, tuple(CompanySettingsOut.model_fields))
+    if selected is not None:
+        data = await get_settings_fields_async(db, selected)
+        await release_connection_async(db)
+        return FastJSONResponse(data)
+    settings = await get_or_create_settings_async(db)
+    await release_connection_async(db)
     return settings
 
 
 @router.put("/settings", response_model=CompanySettingsOut, status_code=status.HTTP_200_OK)
 async def put_settings(
-    db: Session = Depends(get_company_db),
+    db: AsyncSession = Depends(get_company_db_async),
     _user=Depends(get_current_user),
 
     # Optional uploads
@@ -115,14 +132,14 @@ async def put_settings(
     # Handle uploads
     if logo is not None:
         try:
-            payload["logo_url"] = save_logo_file(logo)
+            payload["logo_url"] = await run_in_threadpool(save_logo_file, logo)
         except Exception as e:
             log.exception("Logo upload failed")
             raise HTTPException(status_code=400, detail=f"Logo upload failed: {e}")
 
     if signature is not None:
         try:
-            payload["signature_url"] = save_signature_file(signature)
+            payload["signature_url"] = await run_in_threadpool(save_signature_file, signature)
         except Exception as e:
             log.exception("Signature upload failed")
             raise HTTPException(status_code=400, detail=f"Signature upload failed: {e}")
@@ -131,19 +148,19 @@ async def put_settings(
     if not ok:
         raise HTTPException(status_code=422, detail=data_or_err)
 
-    settings = update_settings(db, data_or_err)
+    settings = await update_settings_async(db, data_or_err)
     log.info("✅ Company settings updated")
     return settings
 
 
 # Optional JSON-only endpoint (keep or delete; uses your existing schema)
 @router.put("/settings/json", response_model=CompanySettingsOut, status_code=status.HTTP_200_OK)
-def put_settings_json(
+async def put_settings_json(
     payload: CompanySettingsUpdate = Body(...),
-    db: Session = Depends(get_company_db),
+    db: AsyncSession = Depends(get_company_db_async),
     _user=Depends(get_current_user),
 ):
     log.info("🛠 Updating company settings (JSON)")
-    settings = update_settings(db, payload)
+    settings = await update_settings_async(db, payload)
     log.info("✅ Company settings updated (JSON)")
     return settings
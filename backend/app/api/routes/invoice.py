@@ -1,22 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from app.db.deps import get_company_db, get_company_db_async, get_current_user
+from app.services.export_service import EXPORT_FORMATS, MEDIA_TYPES, export_filename, export_invoices
+from app.utils.response_utils import attachment_headers
 from app.schemas.invoice import InvoiceCreate, InvoiceRead
 from app.crud import invoice as crud
 
 router = APIRouter()
 
+# Invoices are a tenant table: every route reads/writes the caller's tenant DB
 @router.post("/", response_model=InvoiceRead)
-def create_invoice(invoice: InvoiceCreate, db: Session = Depends(get_db)):
+def create_invoice(invoice: InvoiceCreate, db: Session = Depends(get_company_db)):
     return crud.create_invoice(db, invoice)
 
+# Declared before /{invoice_id}; streams off a server-side cursor on the tenant DB
+@router.get("/invoices/export")
+async def export_invoices_route(
+    format: str = Query("csv", pattern="^(csv|ndjson|xlsx)$", description=f"One of {list(EXPORT_FORMATS)}"),
+    status: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_company_db_async),
+    user: dict = Depends(get_current_user),
+):
+    body = export_invoices(db, format, status)
+    return StreamingResponse(
+        body, media_type=MEDIA_TYPES[format], headers=attachment_headers(export_filename("invoices", format)),
+    )
+
 @router.get("/{invoice_id}", response_model=InvoiceRead)
-def read_invoice(invoice_id: int, db: Session = Depends(get_db)):
+def read_invoice(invoice_id: int, db: Session = Depends(get_company_db)):
     db_invoice = crud.get_invoice(db, invoice_id)
     if not db_invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     return db_invoice
 
 @router.get("/", response_model=list[InvoiceRead])
-def list_invoices(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def list_invoices(skip: int = 0, limit: int = 100, db: Session = Depends(get_company_db)):
     return crud.get_all_invoices(db, skip=skip, limit=limit)
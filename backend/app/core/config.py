@@ -15,6 +15,35 @@ class Settings(BaseModel):
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+    # Verified access-token cache (keyed by token hash, entries expire at the token's exp)
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+    TOKEN_CACHE_MAX_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_MAX_TTL_SECONDS", "3600"))
+    # Master company directory (company id -> db_name/slug) used by login/refresh
+    COMPANY_DIRECTORY_SIZE: int = int(os.getenv("COMPANY_DIRECTORY_SIZE", "10000"))
+    COMPANY_DIRECTORY_TTL_SECONDS: int = int(os.getenv("COMPANY_DIRECTORY_TTL_SECONDS", "300"))
+    # Client list totals: per-tenant/per-filter count cache (dropped on client writes in this
+    # process, TTL-bounded elsewhere) and the table size above which unfiltered lists report
+    # the planner's row estimate instead of an exact count(*)
+    CLIENT_COUNT_CACHE_SIZE: int = int(os.getenv("CLIENT_COUNT_CACHE_SIZE", "10000"))
+    CLIENT_COUNT_CACHE_TTL_SECONDS: int = int(os.getenv("CLIENT_COUNT_CACHE_TTL_SECONDS", "60"))
+    CLIENT_COUNT_ESTIMATE_MIN_ROWS: int = int(os.getenv("CLIENT_COUNT_ESTIMATE_MIN_ROWS", "10000"))
+    # Client typeahead: tenants whose prefix index is kept in memory, and how long an index
+    # lives before a rebuild picks up writes made by other workers
+    CLIENT_SUGGEST_MAX_TENANTS: int = int(os.getenv("CLIENT_SUGGEST_MAX_TENANTS", "200"))
+    CLIENT_SUGGEST_TTL_SECONDS: int = int(os.getenv("CLIENT_SUGGEST_TTL_SECONDS", "300"))
+    # Bulk client import: rows per COPY batch / progress event, and per-row errors reported
+    CLIENT_IMPORT_BATCH_SIZE: int = int(os.getenv("CLIENT_IMPORT_BATCH_SIZE", "1000"))
+    CLIENT_IMPORT_MAX_ERRORS: int = int(os.getenv("CLIENT_IMPORT_MAX_ERRORS", "1000"))
+    # Bulk client update/delete: most ids accepted in one request
+    CLIENT_BULK_MAX_IDS: int = int(os.getenv("CLIENT_BULK_MAX_IDS", "5000"))
+    # Exports (CSV/NDJSON/XLSX): rows fetched per server-side cursor round trip and encoded per chunk
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    # Password hashing: bcrypt cost factor (changing it rehashes users on their next login)
+    # and size of the process pool bcrypt runs on (0 = thread pool, e.g. serverless)
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(
+        os.getenv("PASSWORD_HASH_WORKERS", "0" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else str(os.cpu_count() or 1))
+    )
 
     # Master DB
     MASTER_USERNAME: str = os.getenv("MASTER_USERNAME")
@@ -25,9 +54,52 @@ class Settings(BaseModel):
     # Database URL
     DATABASE_URL: str = os.getenv("DATABASE_URL")
 
+    # Serverless (Lambda/Mangum) profile: NullPool engines, no startup DDL, lazy routers
+    SERVERLESS: bool = os.getenv(
+        "SERVERLESS", "true" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "false"
+    ).lower() == "true"
+
+    # Tenant engine registry / connection budget
+    TENANT_ENGINE_CACHE_SIZE: int = int(os.getenv("TENANT_ENGINE_CACHE_SIZE", "256"))
+    TENANT_ENGINE_IDLE_TTL_SECONDS: int = int(os.getenv("TENANT_ENGINE_IDLE_TTL_SECONDS", "900"))
+    # How often idle engines are reaped (on engine lookups, and by a background task when not serverless)
+    TENANT_ENGINE_REAP_INTERVAL_SECONDS: int = int(os.getenv("TENANT_ENGINE_REAP_INTERVAL_SECONDS", "60"))
+    # One budget for the sync (psycopg2) and async (asyncpg) tenant pools together
+    TENANT_MAX_TOTAL_CONNECTIONS: int = int(os.getenv("TENANT_MAX_TOTAL_CONNECTIONS", "200"))
+    TENANT_POOL_SIZE: int = int(os.getenv("TENANT_POOL_SIZE", "2"))
+    TENANT_MAX_OVERFLOW: int = int(os.getenv("TENANT_MAX_OVERFLOW", "3"))
+    TENANT_POOL_TIMEOUT: int = int(os.getenv("TENANT_POOL_TIMEOUT", "10"))
+    TENANT_POOL_RECYCLE: int = int(os.getenv("TENANT_POOL_RECYCLE", "1800"))
+    TENANT_POOL_OVERRIDES: str = os.getenv("TENANT_POOL_OVERRIDES", "")  # "big_db=10:5,other_db=4:2"
+
+    # Tenancy mode: "database" (one physical DB per company) or "schema"
+    # (one shared tenant DB, one schema per company, single shared pool)
+    TENANCY_MODE: str = os.getenv("TENANCY_MODE", "database").lower()
+    TENANT_SHARED_DB_NAME: str = os.getenv("TENANT_SHARED_DB_NAME", "tenants")
+    TENANT_SHARED_POOL_SIZE: int = int(os.getenv("TENANT_SHARED_POOL_SIZE", "10"))
+    TENANT_SHARED_MAX_OVERFLOW: int = int(os.getenv("TENANT_SHARED_MAX_OVERFLOW", "10"))
+
     # Cookies
     REFRESH_COOKIE_NAME: str = os.getenv("REFRESH_COOKIE_NAME", "refresh_token")
     COOKIE_SECURE: bool = os.getenv("COOKIE_SECURE", "false").lower() == "true"
     COOKIE_SAMESITE: str = os.getenv("COOKIE_SAMESITE", "lax")
 
+    # Observability
+    # Prometheus /metrics: off unless enabled, and only served with a bearer token for scrapers
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "false").lower() in ("1", "true", "yes")
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+    # Per-request SQL stats (query count / DB time / slowest statement), exposed as a
+    # Server-Timing header; N+1 detector warns when one statement repeats this often (0 = off)
+    SQL_INSTRUMENTATION: bool = os.getenv("SQL_INSTRUMENTATION", "true").lower() in ("1", "true", "yes")
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() in ("1", "true", "yes")
+    SQL_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "0"))
+    # On-demand request profiler: master admins send `X-Profile: 1` (or ?__profile=1);
+    # PROFILE_SAMPLE_RATE additionally captures a random fraction of all requests
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "true").lower() in ("1", "true", "yes")
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+    PROFILE_MAX_CONCURRENT: int = int(os.getenv("PROFILE_MAX_CONCURRENT", "2"))
+    PROFILE_STORE_SIZE: int = int(os.getenv("PROFILE_STORE_SIZE", "100"))
+    PROFILE_TTL_SECONDS: int = int(os.getenv("PROFILE_TTL_SECONDS", "3600"))
+
 settings = Settings()
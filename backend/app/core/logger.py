@@ -1,6 +1,13 @@
+import atexit
+import contextvars
+import json
 import logging
-from logging.handlers import RotatingFileHandler
 import os
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
 
 # Set up logs directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -10,15 +17,121 @@ os.makedirs(LOG_DIR, exist_ok=True)
 # Define log file path
 LOG_FILE = os.path.join(LOG_DIR, "app.log")
 
+# "json" (one object per line) or "text" (the classic pipe-separated format)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# Per-request context, set by the request middleware and stamped on every record
+request_context: contextvars.ContextVar[Dict[str, object]] = contextvars.ContextVar("request_context", default={})
+
+# Attributes every LogRecord has; anything else came in via `extra=` and goes into the JSON
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+def _parse_sample_rates(raw: str) -> Dict[str, float]:
+    """Parse "/api/clients=0.1,/api/auth/refresh=0.05" (path prefix -> keep ratio)."""
+    rates: Dict[str, float] = {}
+    for item in (raw or "").split(","):
+        prefix, sep, rate = item.strip().partition("=")
+        if not sep:
+            continue
+        try:
+            rates[prefix.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+LOG_SAMPLE_DEFAULT = float(os.getenv("LOG_SAMPLE_DEFAULT", "1.0"))
+LOG_SAMPLE_RATES = _parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
+
+def should_sample(path: str) -> bool:
+    """Decide once per request whether its info-level records are kept (longest prefix wins)."""
+    rate = LOG_SAMPLE_DEFAULT
+    best = -1
+    for prefix, prefix_rate in LOG_SAMPLE_RATES.items():
+        if path.startswith(prefix) and len(prefix) > best:
+            rate, best = prefix_rate, len(prefix)
+    return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Runs on the caller's thread: stamps req_id / tenant / route onto the record
+    and drops info/debug records of unsampled requests (warnings and errors always pass).
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        ctx = request_context.get()
+        if record.levelno < logging.WARNING and not ctx.get("sampled", True):
+            return False
+        for key in ("req_id", "tenant", "route"):
+            if not hasattr(record, key):
+                setattr(record, key, ctx.get(key))
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        doc = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and value is not None:
+                doc[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            doc["exc"] = record.exc_text
+        return json.dumps(doc, default=str, ensure_ascii=False)
+
+
+class _ContextQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve %-args and tracebacks on the caller's thread (objects may change
+        # afterwards), but leave JSON/text formatting to the background writer.
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
 # Configure logger
 logger = logging.getLogger("joslasync")
-logger.setLevel(logging.INFO)
+logger.setLevel(LOG_LEVEL)
+
+_listener: Optional[QueueListener] = None
+
+
+def stop_log_listener() -> None:
+    """Flush queued records and stop the background writer (shutdown / atexit)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 # Avoid duplicate handlers
 if not logger.handlers:
-    handler = RotatingFileHandler(
-        LOG_FILE, maxBytes=5_000_000, backupCount=5
-    )
-    formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=5_000_000, backupCount=5)
+    if LOG_FORMAT == "json":
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(req_id)s | %(message)s"))
+
+    # Request threads only enqueue; file I/O and rollover happen on the listener thread
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    queue_handler = _ContextQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+    logger.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_log_listener)
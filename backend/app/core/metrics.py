@@ -0,0 +1,270 @@
+# app/core/metrics.py
+"""
+Minimal Prometheus exposition (text format 0.0.4), no client library needed.
+
+Request-path metrics (counters / gauges / histograms) are updated inline and
+are cheap: one dict lookup + lock per observation. Pool and thread-pool state
+is read from the engine registries by collectors at scrape time only.
+"""
+import sys
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]  # (suffix, labels, value)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _fmt_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield "", dict(zip(self.labelnames, key)), value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield "", dict(zip(self.labelnames, key)), value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+                    break
+            else:
+                row[len(self.buckets)] += 1
+            row[-1] += value
+
+    def samples(self) -> Iterable[Sample]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        for key, row in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), row[:-1]):
+                cumulative += count
+                yield "_bucket", {**labels, "le": _fmt_value(bound)}, cumulative
+            yield "_count", labels, cumulative
+            yield "_sum", labels, row[-1]
+
+
+# A collector returns [(name, kind, help, [(labels, value), ...]), ...] at scrape time
+Collector = Callable[[], List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Collector] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Collector) -> Collector:
+        self._collectors.append(collector)
+        return collector
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for m in self._metrics:
+            lines.append(f"# HELP {m.name} {m.documentation}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            for suffix, labels, value in m.samples():
+                lines.append(f"{m.name}{suffix}{_fmt_labels(labels)} {_fmt_value(value)}")
+        for collector in self._collectors:
+            try:
+                families = collector()
+            except Exception:
+                continue  # a broken collector must never break the scrape
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_fmt_labels(labels)} {_fmt_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# -------- Request path --------
+REQUEST_LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and tenant.",
+    ("method", "route", "tenant"),
+))
+REQUESTS = registry.register(Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template, tenant and status code.",
+    ("method", "route", "tenant", "status"),
+))
+IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served.",
+    ("method",),
+))
+
+# -------- Pools / hashing --------
+POOL_WAIT = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection, per tenant engine.",
+    ("tenant", "driver"),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0),
+))
+PASSWORD_HASH_TIME = registry.register(Histogram(
+    "password_hash_seconds",
+    "bcrypt hash/verify time including hashing-pool queueing.",
+    ("op",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+))
+
+
+def _registry_families(stats: Dict, driver: str) -> List:
+    gauges = {
+        "checked_out": "Connections currently checked out.",
+        "checked_in": "Idle connections held by the pool.",
+        "overflow": "Connections opened beyond pool_size.",
+        "pool_size": "Configured pool_size.",
+        "max_overflow": "Configured max_overflow.",
+    }
+    families = []
+    for key, documentation in gauges.items():
+        # QueuePool.overflow() starts at -pool_size; report only real overflow
+        samples = [
+            ({"tenant": tenant, "driver": driver}, float(max(row.get(key, 0), 0)))
+            for tenant, row in stats.get("tenants", {}).items()
+        ]
+        families.append((f"db_pool_{key}", "gauge", documentation, samples))
+    families.append((
+        "db_engine_cache_engines", "gauge", "Tenant engines currently cached.",
+        [({"driver": driver}, float(stats.get("engines", 0)))],
+    ))
+    families.append((
+        "db_engine_cache_reserved_connections", "gauge", "Worst-case connections reserved by cached engines.",
+        [({"driver": driver}, float(stats.get("reserved_connections", 0)))],
+    ))
+    families.append((
+        "db_engine_cache_evictions_total", "counter", "Tenant engines evicted from the cache.",
+        [({"driver": driver}, float(stats.get("evictions", 0)))],
+    ))
+    return families
+
+
+def _collect_tenant_pools() -> List:
+    from app.db.database import get_tenant_engine_stats, master_engine
+
+    families = _registry_families(get_tenant_engine_stats(), "sync")
+    pool = master_engine.pool
+    master = {"checked_out": "checkedout", "checked_in": "checkedin", "overflow": "overflow", "pool_size": "size"}
+    for name, kind, doc, samples in families:
+        method = master.get(name[len("db_pool_"):])
+        if method and hasattr(pool, method):
+            samples.append(({"tenant": "master", "driver": "sync"}, float(max(getattr(pool, method)(), 0))))
+    # Only report async engines if the async path has been used in this process
+    if "app.db.async_database" in sys.modules:
+        async_stats = sys.modules["app.db.async_database"].get_async_tenant_engine_stats()
+        for (name, kind, doc, samples), (_, _, _, extra) in zip(families, _registry_families(async_stats, "async")):
+            samples.extend(extra)
+    return families
+
+
+def _collect_thread_pool() -> List:
+    # AnyIO's default limiter bounds sync endpoints/dependencies and run_in_threadpool
+    from anyio import to_thread
+
+    limiter = to_thread.current_default_thread_limiter()
+    return [
+        ("threadpool_borrowed_tokens", "gauge", "AnyIO worker threads in use.", [({}, float(limiter.borrowed_tokens))]),
+        ("threadpool_total_tokens", "gauge", "AnyIO worker thread limit.", [({}, float(limiter.total_tokens))]),
+        ("threadpool_waiting_tasks", "gauge", "Tasks waiting for an AnyIO worker thread.",
+         [({}, float(limiter.statistics().tasks_waiting))]),
+    ]
+
+
+registry.add_collector(_collect_tenant_pools)
+registry.add_collector(_collect_thread_pool)
+
+
+def render_metrics() -> str:
+    return registry.render()
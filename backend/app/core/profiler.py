@@ -0,0 +1,190 @@
+# app/core/profiler.py
+"""
+On-demand sampling profiler for single requests.
+
+A daemon thread snapshots sys._current_frames() every PROFILE_INTERVAL_MS
+while the request runs and folds the stacks into "collapsed" format
+(`frame;frame;frame count` per line), which flamegraph.pl, speedscope and
+inferno read directly.
+
+- wall: every sample of the event-loop thread and of busy AnyIO workers
+- cpu:  the same samples minus stacks parked in a known wait (select, locks,
+        queue gets), i.e. an approximation of on-CPU time
+
+The loop thread is shared, so under concurrency a profile also contains other
+requests' frames; request-local work dominates for the slow requests this is for.
+
+Finished profiles are stored under a server-generated id, returned in the
+X-Profile-Id response header. X-Request-ID is client-supplied, so it is only
+recorded on the profile for correlation and never used as the key.
+"""
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.utils.cache import TTLCache
+
+# Leaf functions that mean "this thread is waiting, not computing"
+_IDLE_LEAVES = {"select", "poll", "wait", "acquire", "sleep", "_wait_for_tstate_lock"}
+
+
+@dataclass
+class Profile:
+    request_id: str
+    method: str
+    path: str
+    interval_ms: float
+    started_at: float = field(default_factory=time.time)
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    samples: int = 0
+    wall: Counter = field(default_factory=Counter)
+    cpu: Counter = field(default_factory=Counter)
+    trigger: str = "header"
+    profile_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    def collapsed(self, mode: str = "wall") -> str:
+        stacks = self.cpu if mode == "cpu" else self.wall
+        return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common()) + "\n"
+
+    def summary(self) -> Dict:
+        return {
+            "profile_id": self.profile_id,
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "trigger": self.trigger,
+            "interval_ms": self.interval_ms,
+            "wall_ms": round(self.wall_ms, 2),
+            "process_cpu_ms": round(self.cpu_ms, 2),
+            "samples": self.samples,
+            "distinct_stacks": len(self.wall),
+        }
+
+
+def _fold(frame) -> List[str]:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.reverse()
+    return names
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, profile: Profile, thread_ids: Set[int]):
+        super().__init__(name=f"profiler-{profile.profile_id[:8]}", daemon=True)
+        self.profile = profile
+        self.thread_ids = thread_ids
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        interval = self.profile.interval_ms / 1000
+        own = threading.get_ident()
+        while not self._stop_event.wait(interval):
+            frames = sys._current_frames()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            self.profile.samples += 1
+            for ident, frame in frames.items():
+                if ident == own or (ident not in self.thread_ids and not _is_worker(names, ident)):
+                    continue
+                stack = _fold(frame)
+                if not stack:
+                    continue
+                key = ";".join([names.get(ident, str(ident))] + stack)
+                leaf = stack[-1].split(" ", 1)[0]
+                if ident not in self.thread_ids and leaf in _IDLE_LEAVES:
+                    continue  # idle worker thread: not part of this request
+                self.profile.wall[key] += 1
+                if leaf not in _IDLE_LEAVES:
+                    self.profile.cpu[key] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join(timeout=1)
+
+
+def _is_worker(names: Dict[int, str], ident: int) -> bool:
+    # Sync endpoints/dependencies and run_in_threadpool land on AnyIO workers
+    return names.get(ident, "").startswith(("AnyIO worker", "ThreadPoolExecutor"))
+
+
+class RequestProfiler:
+    """Starts/stops samplers, caps concurrent profiles, and keeps finished ones by profile_id."""
+
+    def __init__(self, max_concurrent: int, store_size: int, ttl_seconds: float):
+        self._slots = threading.BoundedSemaphore(max(max_concurrent, 1))
+        self.store = TTLCache(maxsize=store_size, ttl_seconds=ttl_seconds)
+
+    def wants_profile(self, request, claims: Optional[dict]) -> Optional[str]:
+        """'header'/'query' for an explicit admin request, 'sampled' for background capture, else None."""
+        if not settings.PROFILING_ENABLED:
+            return None
+        flag = request.headers.get("X-Profile") or request.query_params.get("__profile")
+        if flag and flag not in ("0", "false"):
+            if claims and claims.get("role") == "master":
+                return "header" if request.headers.get("X-Profile") else "query"
+            logger.warning("⚠️ Profile requested without admin claims: %s %s", request.method, request.url.path)
+            return None
+        if settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE:
+            return "sampled"
+        return None
+
+    def start(self, request_id: str, method: str, path: str, trigger: str) -> Optional["_Running"]:
+        if not self._slots.acquire(blocking=False):
+            return None  # already at the concurrency cap: serve the request unprofiled
+        profile = Profile(
+            request_id=request_id,
+            method=method,
+            path=path,
+            interval_ms=settings.PROFILE_INTERVAL_MS,
+            trigger=trigger,
+        )
+        sampler = _Sampler(profile, {threading.get_ident()})
+        running = _Running(self, profile, sampler)
+        sampler.start()
+        return running
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return self.store.get(profile_id)
+
+
+class _Running:
+    def __init__(self, owner: RequestProfiler, profile: Profile, sampler: _Sampler):
+        self.owner = owner
+        self.profile = profile
+        self.sampler = sampler
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    def stop(self) -> Profile:
+        try:
+            self.sampler.stop()
+            self.profile.wall_ms = (time.perf_counter() - self._wall) * 1000
+            self.profile.cpu_ms = (time.process_time() - self._cpu) * 1000
+            self.owner.store.set(self.profile.profile_id, self.profile)
+            logger.info(
+                "🔬 Profile captured for %s %s (%d samples)",
+                self.profile.method,
+                self.profile.path,
+                self.profile.samples,
+                extra={"profile": self.profile.summary()},
+            )
+        finally:
+            self.owner._slots.release()
+        return self.profile
+
+
+request_profiler = RequestProfiler(
+    max_concurrent=settings.PROFILE_MAX_CONCURRENT,
+    store_size=settings.PROFILE_STORE_SIZE,
+    ttl_seconds=settings.PROFILE_TTL_SECONDS,
+)
@@ -3,15 +3,10 @@ from app.db.models.user import User
 from app.schemas.auth import UserCreate
 from app.core.logger import logger
 from app.core.config import settings
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.utils.security import hash_password, verify_password  # single CryptContext lives in utils.security
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return hash_password(password)
 
 def get_user_by_username(db: Session, username: str):
     return db.query(User).filter(User.username == username).first()
@@ -28,7 +23,6 @@ def create_user(db: Session, user: UserCreate):
     )
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
     logger.info(f"User registered: {db_user.username}")
     return db_user
 
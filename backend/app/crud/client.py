@@ -1,51 +1,242 @@
-from typing import Optional, Tuple, List
+from decimal import Decimal
+from typing import Dict, Optional, Sequence, Tuple, List
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func, or_
+from sqlalchemy import Row, Select, select, func, or_, case, insert, update, delete, tuple_, literal, text
 from uuid import UUID
 
 from app.db.models.tenant.client import Client
-from app.schemas.client import ClientCreate, ClientUpdate
+from app.db.tenant_schema import has_trigram
+from app.schemas.client import ClientCreate, ClientOut, ClientUpdate
+from app.utils.pagination import Cursor
 
+# List pages select exactly ClientOut's columns, as Row tuples: no ORM objects to hydrate/track
+LIST_FIELDS: Tuple[str, ...] = tuple(ClientOut.model_fields)
+_LIST_COLUMNS = tuple(getattr(Client, f) for f in LIST_FIELDS)
+
+def _columns(fields: Optional[Sequence[str]], required: Sequence[str] = ("id",)) -> tuple:
+    """ClientOut columns limited to a (validated) sparse fieldset; None = all of them."""
+    if not fields:
+        return _LIST_COLUMNS
+    wanted = set(fields).union(required)
+    return tuple(getattr(Client, f) for f in LIST_FIELDS if f in wanted)
+
+# Below this many characters trigram matching is mostly noise; substring match only
+FUZZY_MIN_CHARS = 3
+
+# -------- Statement builders (shared by the sync and async paths) --------
+def _substring_match(term: str):
+    like = f"%{term}%"
+    return or_(Client.name.ilike(like), Client.email.ilike(like), Client.company.ilike(like))
+
+def _search_clause(term: str, fuzzy: bool):
+    # Postgres: ILIKE and `%>` (word_similarity above pg_trgm.word_similarity_threshold)
+    # are both served by the gin_trgm_ops indexes, so neither needs a sequential scan.
+    if not fuzzy or len(term) < FUZZY_MIN_CHARS:
+        return _substring_match(term)
+    return or_(
+        _substring_match(term),
+        Client.name.op("%>")(term),
+        Client.email.op("%>")(term),
+        Client.company.op("%>")(term),
+    )
+
+def _relevance_order(term: str) -> tuple:
+    # Literal substring hits first, then closest trigram match
+    similarity = func.greatest(
+        func.word_similarity(term, Client.name),
+        func.word_similarity(term, Client.email),
+        func.word_similarity(term, func.coalesce(Client.company, "")),
+    )
+    return case((_substring_match(term), 1), else_=0).desc(), similarity.desc()
+
+def _is_fuzzy(db) -> bool:
+    """
+    Trigram search needs Postgres with pg_trgm (installed, best-effort, by tenant
+    schema v4); without it `%>` doesn't exist and search stays substring-only.
+    """
+    return db.get_bind().dialect.name == "postgresql" and has_trigram(db.info.get("tenant"))
+
+def _filtered_stmt(q: Optional[str], status: Optional[str], fuzzy: bool = False) -> Select:
+    stmt = select(Client)
+    if q and q.strip():
+        stmt = stmt.where(_search_clause(q.strip(), fuzzy))
+    if status:
+        stmt = stmt.where(Client.status == status)
+    return stmt
+
+def _list_stmt(
+    q: Optional[str], status: Optional[str], page: int, page_size: int, cursor: Optional[Cursor], fuzzy: bool,
+    fields: Optional[Sequence[str]] = None,
+) -> Select:
+    ranked = fuzzy and q and q.strip()
+    ranking = _relevance_order(q.strip()) if ranked else ()
+    # (created_at, id) is the keyset: selected whatever the fieldset, for the page cursors
+    stmt = _filtered_stmt(q, status, fuzzy).with_only_columns(*_columns(fields, ("id", "created_at")))
+    return _page_stmt(stmt, page, page_size, cursor, ranking)
+
+def _count_stmt(stmt: Select) -> Select:
+    return select(func.count()).select_from(stmt.subquery())
+
+# Planner's row estimate (kept current by autovacuum/ANALYZE); -1 = never analyzed.
+# 'clients' resolves through the session's search_path, i.e. the tenant's table.
+_ESTIMATE_SQL = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass('clients')")
+
+def _estimate_from(value) -> Optional[int]:
+    return int(value) if value is not None and value >= 0 else None
+
+def _page_stmt(
+    stmt: Select, page: int, page_size: int, cursor: Optional[Cursor] = None, ranking: tuple = (),
+) -> Select:
+    # One extra row tells us whether another page exists in the direction of travel.
+    # With a cursor the (created_at, id) row comparison seeks on idx_clients_created_at_id
+    # instead of scanning and discarding OFFSET rows. Ranked (search) results are paged
+    # by offset only: their order isn't (created_at, id).
+    newest_first = (Client.created_at.desc(), Client.id.desc())
+    if cursor is None:
+        return stmt.order_by(*ranking, *newest_first).offset((page - 1) * page_size).limit(page_size + 1)
+    key = tuple_(Client.created_at, Client.id)
+    bound = tuple_(literal(cursor.created_at, Client.created_at.type), literal(cursor.id, Client.id.type))
+    if cursor.direction == "prev":
+        return stmt.where(key > bound).order_by(Client.created_at.asc(), Client.id.asc()).limit(page_size + 1)
+    return stmt.where(key < bound).order_by(*newest_first).limit(page_size + 1)
+
+def _trim_page(rows: Sequence[Row], page_size: int, cursor: Optional[Cursor]) -> Tuple[List[Row], bool]:
+    has_more = len(rows) > page_size
+    rows = list(rows[:page_size])
+    if cursor is not None and cursor.direction == "prev":
+        rows.reverse()  # read oldest-first from the cursor; always return newest-first
+    return rows, has_more
+
+_KEYS_STMT = select(Client.id, Client.name, Client.email, Client.status)
+
+def _bulk_where(ids: Optional[Sequence[UUID]], q: Optional[str], status: Optional[str]):
+    if ids is not None:
+        return Client.id.in_(ids)
+    # Never fuzzy: a trigram near-match ("Smyth" for "smith") must not be updated or deleted
+    return _filtered_stmt(q, status, fuzzy=False).whereclause
+
+def _bulk_update_stmt(where, values: Dict):
+    # updated_at comes from the column's onupdate; RETURNING hands back what the typeahead index keys on
+    return (
+        update(Client).where(where).values(**values)
+        .returning(Client.id, Client.name, Client.email, Client.status)
+        .execution_options(synchronize_session=False)
+    )
+
+def _bulk_delete_stmt(where):
+    return delete(Client).where(where).returning(Client.id).execution_options(synchronize_session=False)
+
+def export_clients_stmt(db, q: Optional[str], status: Optional[str], columns: Sequence[str]) -> Select:
+    """Plain column tuples (no ORM identity map) in list order, for streaming exports."""
+    stmt = _filtered_stmt(q, status, _is_fuzzy(db))
+    return stmt.with_only_columns(*(getattr(Client, c) for c in columns)).order_by(
+        Client.created_at.desc(), Client.id.desc()
+    )
+
+# -------- Sync (the benchmarks' thread-pool baseline; routes use the async path) --------
 def list_clients(
     db: Session,
     q: Optional[str],
     status: Optional[str],
     page: int,
     page_size: int,
-) -> Tuple[List[Client], int]:
-    stmt = select(Client)
-    if q:
-        like = f"%{q.strip()}%"
-        stmt = stmt.where(
-            or_(Client.name.ilike(like), Client.email.ilike(like), Client.company.ilike(like))
-        )
-    if status:
-        stmt = stmt.where(Client.status == status)
+    cursor: Optional[Cursor] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[Row], bool]:
+    result = db.execute(_list_stmt(q, status, page, page_size, cursor, _is_fuzzy(db), fields))
+    return _trim_page(result.all(), page_size, cursor)
+
+def count_clients(db: Session, q: Optional[str], status: Optional[str]) -> int:
+    return db.scalar(_count_stmt(_filtered_stmt(q, status, _is_fuzzy(db)))) or 0
+
+# -------- Async --------
+async def list_clients_async(
+    db: AsyncSession,
+    q: Optional[str],
+    status: Optional[str],
+    page: int,
+    page_size: int,
+    cursor: Optional[Cursor] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[List[Row], bool]:
+    result = await db.execute(_list_stmt(q, status, page, page_size, cursor, _is_fuzzy(db), fields))
+    return _trim_page(result.all(), page_size, cursor)
+
+async def count_clients_async(db: AsyncSession, q: Optional[str], status: Optional[str]) -> int:
+    return (await db.scalar(_count_stmt(_filtered_stmt(q, status, _is_fuzzy(db))))) or 0
+
+async def estimate_client_rows_async(db: AsyncSession) -> Optional[int]:
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    return _estimate_from(await db.scalar(_ESTIMATE_SQL))
 
-    total = db.scalar(select(func.count()).select_from(stmt.subquery())) or 0
-    stmt = stmt.order_by(Client.created_at.desc()).offset((page - 1) * page_size).limit(page_size)
-    rows = db.execute(stmt).scalars().all()
-    return rows, total
+async def list_client_keys_async(db: AsyncSession) -> List[Tuple]:
+    return (await db.execute(_KEYS_STMT)).all()
 
-def get_client(db: Session, client_id: UUID) -> Optional[Client]:
-    return db.get(Client, client_id)
+async def get_client_async(db: AsyncSession, client_id: UUID) -> Optional[Client]:
+    return await db.get(Client, client_id)
 
-def create_client(db: Session, payload: ClientCreate, created_by: str) -> Client:
+async def get_client_fields_async(db: AsyncSession, client_id: UUID, fields: Sequence[str]) -> Optional[Row]:
+    return (await db.execute(select(*_columns(fields)).where(Client.id == client_id))).first()
+
+async def create_client_async(db: AsyncSession, payload: ClientCreate, created_by: str) -> Client:
     obj = Client(**payload.model_dump(exclude_unset=True), created_by=created_by)
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    await db.commit()
     return obj
 
-def update_client(db: Session, db_obj: Client, payload: ClientUpdate) -> Client:
+async def update_client_async(db: AsyncSession, db_obj: Client, payload: ClientUpdate) -> Client:
     data = payload.model_dump(exclude_unset=True)
     for k, v in data.items():
         setattr(db_obj, k, v)
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    await db.commit()
     return db_obj
 
-def delete_client(db: Session, db_obj: Client) -> None:
-    db.delete(db_obj)
-    db.commit()
+async def delete_client_async(db: AsyncSession, db_obj: Client) -> None:
+    await db.delete(db_obj)
+    await db.commit()
+
+async def bulk_update_clients_async(
+    db: AsyncSession, ids: Optional[Sequence[UUID]], q: Optional[str], status: Optional[str], values: Dict,
+) -> List[Tuple]:
+    rows = (await db.execute(_bulk_update_stmt(_bulk_where(ids, q, status), values))).all()
+    await db.commit()
+    return rows
+
+async def bulk_delete_clients_async(
+    db: AsyncSession, ids: Optional[Sequence[UUID]], q: Optional[str], status: Optional[str],
+) -> List[UUID]:
+    deleted = (await db.scalars(_bulk_delete_stmt(_bulk_where(ids, q, status)))).all()
+    await db.commit()
+    return list(deleted)
+
+# -------- Bulk --------
+# Columns written by bulk loads; status/created_at/updated_at come from server defaults
+BULK_COLUMNS: Tuple[str, ...] = ("id", *ClientCreate.model_fields, "created_by")
+
+def _copy_value(value):
+    # asyncpg's binary COPY encodes NUMERIC from Decimal, not float
+    return Decimal(str(value)) if isinstance(value, float) else value
+
+async def bulk_insert_clients_async(db: AsyncSession, rows: Sequence[Dict]) -> int:
+    """
+    Load already-validated rows (dicts keyed by BULK_COLUMNS) in the session's
+    current transaction; the caller commits. asyncpg uses COPY, anything else
+    a multi-row INSERT.
+    """
+    if not rows:
+        return 0
+    conn = await db.connection()
+    if conn.dialect.driver == "asyncpg":
+        raw = await conn.get_raw_connection()
+        # Unqualified table name: resolves through the tenant search_path set for this transaction
+        await raw.driver_connection.copy_records_to_table(
+            Client.__tablename__,
+            records=[tuple(_copy_value(row.get(c)) for c in BULK_COLUMNS) for row in rows],
+            columns=BULK_COLUMNS,
+        )
+    else:
+        await db.execute(insert(Client), list(rows))
+    return len(rows)
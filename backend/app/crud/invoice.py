@@ -1,3 +1,5 @@
+from typing import Optional, Sequence
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 from app.db.models.invoice import Invoice
 from app.schemas.invoice import InvoiceCreate
@@ -6,7 +8,6 @@ def create_invoice(db: Session, invoice_data: InvoiceCreate):
     db_invoice = Invoice(**invoice_data.dict())
     db.add(db_invoice)
     db.commit()
-    db.refresh(db_invoice)
     return db_invoice
 
 def get_invoice(db: Session, invoice_id: int):
@@ -14,3 +15,10 @@ def get_invoice(db: Session, invoice_id: int):
 
 def get_all_invoices(db: Session, skip: int = 0, limit: int = 100):
     return db.query(Invoice).offset(skip).limit(limit).all()
+
+def export_invoices_stmt(columns: Sequence[str], status: Optional[str] = None) -> Select:
+    """Plain column tuples, newest invoice first, for streaming exports."""
+    stmt = select(*(getattr(Invoice, c) for c in columns))
+    if status:
+        stmt = stmt.where(Invoice.status == status)
+    return stmt.order_by(Invoice.invoice_date.desc(), Invoice.id.desc())
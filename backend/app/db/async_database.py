@@ -0,0 +1,138 @@
+# app/db/async_database.py
+"""
+Async (SQLAlchemy asyncio + asyncpg) counterpart of the tenant helpers in
+app.db.database. Same registry semantics (LRU / idle TTL), one connection
+budget shared with the sync registry, same tenancy modes; used by async route
+handlers so a request waiting on Postgres doesn't occupy an AnyIO worker thread.
+"""
+import asyncio
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import (
+    _apply_tenant_search_path,
+    _tenant_pool_overrides,
+    _tenant_pool_sizing,
+    _tenant_url,
+    engine_pool_kwargs,
+    tenant_connection_budget,
+    is_schema_tenancy,
+    tenant_schema_for,
+)
+from app.db.engine_registry import TenantEngineRegistry
+from app.db.query_stats import instrument_engine
+from app.db.timed_pool import TimedAsyncQueuePool, label_pool
+
+
+class TenantSyncSession(Session):
+    """Sync session class behind tenant AsyncSessions (carries the search_path hook)."""
+
+
+# Schema tenancy: each transaction gets the tenant's search_path (no-op otherwise)
+event.listen(TenantSyncSession, "after_begin", _apply_tenant_search_path)
+
+
+# Loop the async engines run on. The shared budget lets a sync-registry lookup on a
+# worker thread evict an idle async engine; its dispose() is handed back to this loop.
+_engine_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _create_async_tenant_engine(db_name: str, pool_size: int, max_overflow: int):
+    global _engine_loop
+    try:
+        _engine_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    engine = create_async_engine(
+        _tenant_url(db_name).set(drivername="postgresql+asyncpg"),
+        **engine_pool_kwargs(
+            poolclass=TimedAsyncQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.TENANT_POOL_TIMEOUT,
+            pool_recycle=settings.TENANT_POOL_RECYCLE,
+        ),
+    )
+    instrument_engine(label_pool(engine.sync_engine, db_name))
+    return engine
+
+
+# Keep references so pending dispose tasks aren't garbage-collected mid-flight
+_dispose_tasks: Set[asyncio.Task] = set()
+
+
+def _dispose_async_tenant_engine(engine) -> None:
+    for name, factory in list(_async_sessionmakers.items()):
+        if factory.kw.get("bind") is engine:
+            _async_sessionmakers.pop(name, None)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        if _engine_loop is not None and _engine_loop.is_running():
+            asyncio.run_coroutine_threadsafe(engine.dispose(), _engine_loop)
+            return
+        # No loop (e.g. interpreter teardown): drop pooled connections without awaiting
+        engine.sync_engine.dispose(close=False)
+        return
+    task = loop.create_task(engine.dispose())
+    _dispose_tasks.add(task)
+    task.add_done_callback(_dispose_tasks.discard)
+
+
+_async_sessionmakers: Dict[str, async_sessionmaker] = {}
+
+async_tenant_engines = TenantEngineRegistry(
+    create=_create_async_tenant_engine,
+    dispose=_dispose_async_tenant_engine,
+    max_engines=settings.TENANT_ENGINE_CACHE_SIZE,
+    idle_ttl_seconds=settings.TENANT_ENGINE_IDLE_TTL_SECONDS,
+    reap_interval_seconds=settings.TENANT_ENGINE_REAP_INTERVAL_SECONDS,
+    budget=tenant_connection_budget,
+    pool_size=_tenant_pool_sizing()[0],
+    max_overflow=_tenant_pool_sizing()[1],
+    overrides=_tenant_pool_overrides(),
+)
+
+
+def get_async_engine_for_db(db_name: str):
+    """AsyncEngine per tenant DB name (shared engine in schema tenancy)."""
+    if is_schema_tenancy():
+        return async_tenant_engines.get(settings.TENANT_SHARED_DB_NAME)
+    return async_tenant_engines.get(db_name)
+
+
+def get_async_tenant_engine_stats() -> Dict[str, Any]:
+    return async_tenant_engines.stats()
+
+
+def get_async_tenant_session(db_name: str) -> async_sessionmaker:
+    """Cached async_sessionmaker per tenant; mirrors get_tenant_session."""
+    engine = get_async_engine_for_db(db_name)
+    factory = _async_sessionmakers.get(db_name)
+    if factory is None or factory.kw.get("bind") is not engine:
+        factory = async_sessionmaker(
+            bind=engine,
+            autoflush=False,
+            expire_on_commit=False,
+            sync_session_class=TenantSyncSession,
+            info={"tenant": db_name, "tenant_schema": tenant_schema_for(db_name)},
+        )
+        _async_sessionmakers[db_name] = factory
+    return factory
+
+
+async def release_connection_async(db: AsyncSession) -> None:
+    """Async twin of release_connection: end the transaction, return the connection."""
+    if db.in_transaction():
+        await db.commit()
+
+
+async def dispose_all_async() -> None:
+    """Shutdown hook: close every async tenant pool."""
+    async_tenant_engines.dispose_all()
+    if _dispose_tasks:
+        await asyncio.gather(*list(_dispose_tasks), return_exceptions=True)
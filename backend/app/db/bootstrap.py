@@ -0,0 +1,25 @@
+# app/db/bootstrap.py
+"""
+Deploy-time schema bootstrap. The serverless profile runs no DDL on cold
+start, so run this once per deploy (or from a migration job):
+
+    python -m app.db.bootstrap                 # master schema only
+    python -m app.db.bootstrap acme_db beta_db # + bring these tenants to the current version
+"""
+import sys
+
+from app.core.logger import logger
+from app.db.database import create_master_schema, ensure_tenant_tables
+
+
+def main(argv=None) -> None:
+    tenants = list(sys.argv[1:] if argv is None else argv)
+    create_master_schema()
+    logger.info("✅ Master schema ensured (bootstrap)")
+    for db_name in tenants:
+        ensure_tenant_tables(db_name)
+    print(f"master schema ok; tenants bootstrapped: {len(tenants)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,17 @@
 # app/db/database.py
-from typing import Generator
-from functools import lru_cache
+from typing import Any, Dict, Generator, Optional
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import URL
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 from app.core.logger import logger
+from app.db.engine_registry import ConnectionBudget, TenantEngineRegistry, parse_pool_overrides
+from app.db.query_stats import instrument_engine
+from app.db.timed_pool import TimedQueuePool, label_pool
 
 # =======================
 # Bases
@@ -24,9 +27,21 @@ Base = BaseTenant  # convention: default Base -> tenant models
 # =======================
 # Master DB (single)
 # =======================
+def engine_pool_kwargs(**pooled) -> Dict[str, Any]:
+    """
+    Pool arguments for create_engine / create_async_engine.
+    Serverless: NullPool — a frozen Lambda container must not hold idle
+    connections; pooling is left to RDS Proxy / pgbouncer in front of Postgres.
+    """
+    if settings.SERVERLESS:
+        return {"poolclass": NullPool}
+    return {"pool_pre_ping": True, **pooled}
+
 DATABASE_URL = settings.DATABASE_URL  # Prefer postgresql+psycopg2://...
-master_engine = create_engine(DATABASE_URL, future=True, pool_pre_ping=True)
-MasterSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=master_engine)
+master_engine = label_pool(create_engine(DATABASE_URL, future=True, **engine_pool_kwargs(poolclass=TimedQueuePool)), "master")
+instrument_engine(master_engine)
+# expire_on_commit=False: rows written in a request stay readable for the response without a reload
+MasterSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=master_engine)
 
 def get_db() -> Generator[Session, None, None]:
     db = MasterSessionLocal()
@@ -35,38 +50,184 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+def create_master_schema() -> None:
+    """
+    Create missing master tables. Runs at app startup, except in the serverless
+    profile where it is a deploy step instead (python -m app.db.bootstrap).
+    """
+    from app.db.models.master import company_profile as _company_profile  # noqa: F401
+    from app.db.models import user as _user  # noqa: F401
+
+    BaseMaster.metadata.create_all(bind=master_engine)
+
 # =======================
 # Tenant DB helpers
 # =======================
 def _tenant_url(db_name: str) -> URL:
     """
-    Build a tenant DB URL from settings.
-    Falls back to MASTER_USERNAME / MASTER_PASSWORD if DB_USER / DB_PASSWORD are not set.
+    Tenant DB URL: DATABASE_URL with only the database name swapped, so tenants
+    live on the same server, with the same credentials, as the master DB
+    (the one create_company_database issued CREATE DATABASE on).
     """
-    return URL.create(
-        "postgresql+psycopg2",
-        username=getattr(settings, "DB_USER", settings.MASTER_USERNAME),
-        password=getattr(settings, "DB_PASSWORD", settings.MASTER_PASSWORD),
-        host=getattr(settings, "DB_HOST", "localhost"),
-        port=getattr(settings, "DB_PORT", 5432),
-        database=db_name,
+    return make_url(DATABASE_URL).set(database=db_name)
+
+def _create_tenant_engine(db_name: str, pool_size: int, max_overflow: int):
+    engine = create_engine(
+        _tenant_url(db_name),
+        future=True,
+        **engine_pool_kwargs(
+            poolclass=TimedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.TENANT_POOL_TIMEOUT,
+            pool_recycle=settings.TENANT_POOL_RECYCLE,
+        ),
     )
+    return instrument_engine(label_pool(engine, db_name))
+
+
+def _dispose_tenant_engine(engine) -> None:
+    # Drop cached sessionmakers bound to this engine before closing its pool
+    for name, factory in list(_tenant_sessionmakers.items()):
+        if factory.kw.get("bind") is engine:
+            _tenant_sessionmakers.pop(name, None)
+    engine.dispose()
+
+
+# One sessionmaker per tenant, rebuilt only if the registry swaps the engine
+_tenant_sessionmakers: Dict[str, sessionmaker] = {}
+
+def is_schema_tenancy() -> bool:
+    """True when tenants are schemas inside one shared DB (TENANCY_MODE=schema)."""
+    return settings.TENANCY_MODE == "schema"
+
+def _tenant_pool_sizing() -> tuple:
+    # NullPool (serverless) opens one connection per concurrent checkout; Lambda runs one request at a time
+    if settings.SERVERLESS:
+        return 1, 0
+    return settings.TENANT_POOL_SIZE, settings.TENANT_MAX_OVERFLOW
+
+def _tenant_pool_overrides() -> Dict[str, tuple]:
+    if settings.SERVERLESS:
+        return {}
+    overrides = parse_pool_overrides(settings.TENANT_POOL_OVERRIDES)
+    if is_schema_tenancy():
+        overrides.setdefault(
+            settings.TENANT_SHARED_DB_NAME,
+            (settings.TENANT_SHARED_POOL_SIZE, settings.TENANT_SHARED_MAX_OVERFLOW),
+        )
+    return overrides
+
+# Shared with the async registry (app.db.async_database): a tenant served on both
+# paths holds two pools, and both count against TENANT_MAX_TOTAL_CONNECTIONS
+tenant_connection_budget = ConnectionBudget(settings.TENANT_MAX_TOTAL_CONNECTIONS)
+
+tenant_engines = TenantEngineRegistry(
+    create=_create_tenant_engine,
+    dispose=_dispose_tenant_engine,
+    max_engines=settings.TENANT_ENGINE_CACHE_SIZE,
+    idle_ttl_seconds=settings.TENANT_ENGINE_IDLE_TTL_SECONDS,
+    reap_interval_seconds=settings.TENANT_ENGINE_REAP_INTERVAL_SECONDS,
+    budget=tenant_connection_budget,
+    pool_size=_tenant_pool_sizing()[0],
+    max_overflow=_tenant_pool_sizing()[1],
+    overrides=_tenant_pool_overrides(),
+)
 
-@lru_cache(maxsize=256)
 def get_engine_for_db(db_name: str):
-    """Cached SQLAlchemy engine per tenant DB name."""
-    return create_engine(_tenant_url(db_name), future=True, pool_pre_ping=True)
+    """
+    SQLAlchemy engine per tenant DB name, served from the bounded registry.
+    Engines evicted by LRU / idle TTL are disposed so their pools close.
+    In schema tenancy every tenant shares the engine of TENANT_SHARED_DB_NAME.
+    """
+    if is_schema_tenancy():
+        return tenant_engines.get(settings.TENANT_SHARED_DB_NAME)
+    return tenant_engines.get(db_name)
+
+def tenant_schema_for(db_name: str) -> Optional[str]:
+    """Schema holding this tenant's tables (schema tenancy), else None."""
+    return db_name if is_schema_tenancy() else None
 
-def get_tenant_session(db_name: str):
-    """Preferred sessionmaker for a tenant database (by name)."""
+def set_tenant_search_path(conn, schema: Optional[str]) -> None:
+    """
+    Point the current transaction at a tenant schema. SET LOCAL reverts on
+    commit/rollback, so a pooled connection never carries one tenant's
+    search_path into another tenant's checkout.
+    """
+    if not schema:
+        return
+    quoted = conn.dialect.identifier_preparer.quote(schema)
+    conn.exec_driver_sql(f"SET LOCAL search_path TO {quoted}, public")
+
+def _apply_tenant_search_path(session: Session, transaction, connection) -> None:
+    set_tenant_search_path(connection, session.info.get("tenant_schema"))
+
+def get_tenant_engine_stats() -> Dict[str, Any]:
+    """Per-tenant pool stats + global connection budget usage."""
+    return tenant_engines.stats()
+
+def get_tenant_session(db_name: str) -> sessionmaker:
+    """
+    Preferred sessionmaker for a tenant database (by name), cached per tenant.
+    Sessions check out a pooled connection only on their first statement and
+    return it when the transaction ends (see release_connection).
+    expire_on_commit=False keeps loaded rows readable after the connection is gone.
+    """
     engine = get_engine_for_db(db_name)
-    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    factory = _tenant_sessionmakers.get(db_name)
+    if factory is None or factory.kw.get("bind") is not engine:
+        schema = tenant_schema_for(db_name)
+        factory = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+            bind=engine,
+            info={"tenant": db_name, "tenant_schema": schema},
+        )
+        if schema:
+            # Each transaction (i.e. each connection checkout) gets the tenant's search_path
+            event.listen(factory, "after_begin", _apply_tenant_search_path)
+        _tenant_sessionmakers[db_name] = factory
+    return factory
+
+def release_connection(db: Session) -> None:
+    """
+    End the session's current transaction so its connection goes back to the
+    pool now, instead of when the request dependency closes (which happens
+    after the response has been serialized).
+    """
+    if db.in_transaction():
+        db.commit()
+
+def create_tenant_schema(db_name: str, if_not_exists: bool = True):
+    """
+    Schema tenancy: create the shared tenant DB on first use, then the
+    tenant's schema inside it.
+    """
+    shared = settings.TENANT_SHARED_DB_NAME
+    with master_engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT")
+        exists = conn.execute(text("SELECT 1 FROM pg_database WHERE datname = :n"), {"n": shared}).scalar()
+        if not exists:
+            conn.execute(text(f'CREATE DATABASE "{shared}"'))
+            logger.info(f"🆕 Created shared tenant database {shared}")
+
+    engine = get_engine_for_db(db_name)
+    with engine.begin() as conn:
+        quoted = conn.dialect.identifier_preparer.quote(db_name)
+        clause = "IF NOT EXISTS " if if_not_exists else ""
+        conn.exec_driver_sql(f"CREATE SCHEMA {clause}{quoted}")
+    logger.info(f"🆕 Ensured tenant schema {db_name} in {shared}")
 
 def create_tenant_database_if_missing(db_name: str):
     """
     Create the tenant DB (by name) using the master connection.
     Safe to call during registration; caller may ignore 'already exists'.
     """
+    if is_schema_tenancy():
+        create_tenant_schema(db_name)
+        return
+
     qname = f'"{db_name}"'
     with master_engine.connect() as conn:
         conn.execution_options(isolation_level="AUTOCOMMIT")
@@ -79,18 +240,27 @@ def create_tenant_database_if_missing(db_name: str):
 
 def ensure_tenant_tables(db_name: str):
     """
-    Ensure all tenant tables exist in the given tenant DB.
+    Bootstrap the tenant DB: create missing tables, apply pending migrations
+    and stamp the schema version (see app.db.tenant_schema).
+    Request paths should call ensure_tenant_schema(db_name) instead, which
+    only lands here when the stamped version is missing or stale.
     IMPORTANT: import all tenant models before calling, so BaseTenant.metadata is populated.
     """
+    from app.db.tenant_schema import bootstrap_tenant_schema, mark_tenant_schema_ready, read_has_trigram
+
     # Import required tenant models that exist in the repo
     from app.db.models.tenant import client as _client  # noqa: F401
     from app.db.models.tenant import company_profile as _company_profile  # noqa: F401
     from app.db.models.tenant import company_settings as _company_settings  # noqa: F401
-    # ⛔️ Do NOT import invoice here unless you actually have it.
+    from app.db.models.tenant import schema_version as _schema_version  # noqa: F401
+    from app.db.models import invoice as _invoice  # noqa: F401  (tenant table since schema v2)
 
     engine = get_engine_for_db(db_name)
-    BaseTenant.metadata.create_all(bind=engine)
-    logger.info(f"✅ Ensured tenant tables for DB '{db_name}'")
+    version = bootstrap_tenant_schema(engine, BaseTenant.metadata, schema=tenant_schema_for(db_name))
+    with engine.connect() as conn:
+        trigram = read_has_trigram(conn)
+    mark_tenant_schema_ready(db_name, trigram)
+    logger.info(f"✅ Ensured tenant tables for DB '{db_name}' (schema v{version})")
 
 # =======================
 # Back-compat (URL-based)
@@ -1,16 +1,17 @@
 # app/db/deps.py
-from typing import Dict, Generator, Optional
+from typing import AsyncGenerator, Dict, Generator, Optional
 
 import jwt
 from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.config import settings
 from app.core.logger import logger
-from app.db.database import ensure_tenant_tables, get_tenant_session
-
-ALGORITHM = settings.JWT_ALGORITHM
-SECRET_KEY = settings.JWT_SECRET
+from app.db.database import get_tenant_session
+from app.db.async_database import get_async_tenant_session
+from app.db.tenant_schema import ensure_tenant_schema, is_tenant_schema_ready
+from app.utils.security import verify_access_token_cached
 
 
 def _get_bearer_token(request: Request) -> str:
@@ -23,15 +24,36 @@ def _get_bearer_token(request: Request) -> str:
     return auth_header.split(" ", 1)[1]
 
 
+def _token_expired() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
+
+
+def _token_invalid() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
 def get_token_claims(request: Request) -> Dict:
-    """Decode the access token and return raw claims."""
+    """
+    Return raw access-token claims.
+    The request middleware already verified the token and left the outcome in
+    request.state; only fall back to verifying here when it didn't run.
+    """
+    claims = getattr(request.state, "claims", None)
+    if claims is not None:
+        return claims
+    token_error = getattr(request.state, "token_error", None)
+    if token_error == "expired":
+        raise _token_expired()
+    if token_error == "invalid":
+        raise _token_invalid()
+
     token = _get_bearer_token(request)
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        return verify_access_token_cached(token)
     except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
+        raise _token_expired()
     except jwt.PyJWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+        raise _token_invalid()
 
 
 def get_current_user(claims: Dict = Depends(get_token_claims)) -> Dict:
@@ -47,29 +69,76 @@ def get_current_user(claims: Dict = Depends(get_token_claims)) -> Dict:
     }
 
 
+def get_master_user(user: Dict = Depends(get_current_user)) -> Dict:
+    """Admin-only endpoints: the master account (role=master in the access token)."""
+    if user.get("role") != "master":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return user
+
+
+def _tenant_db_name(claims: Dict) -> str:
+    db_name: Optional[str] = claims.get("db") or claims.get("db_name")
+    if not db_name:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No tenant database in token")
+    return db_name
+
+
 def get_company_db(claims: Dict = Depends(get_token_claims)) -> Generator[Session, None, None]:
     """
     Open a tenant-scoped DB session using db_name from JWT claims.
-    Ensures tenant tables exist (best-effort, idempotent).
+    Ensures the tenant schema is current (checked once per tenant per process).
     """
-    db_name: Optional[str] = claims.get("db") or claims.get("db_name")
-    if not db_name:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No tenant database in token")
+    db_name = _tenant_db_name(claims)
 
-    # Best-effort bootstrap: don't crash request on hiccups
+    # Best-effort bootstrap: don't crash request on hiccups (retried next request)
     try:
-        ensure_tenant_tables(db_name)
+        ensure_tenant_schema(db_name)
     except Exception as e:
-        logger.warning(f"⚠️ ensure_tenant_tables warning for '{db_name}': {repr(e)}")
+        logger.warning(f"⚠️ ensure_tenant_schema warning for '{db_name}': {repr(e)}")
 
     SessionLocal = get_tenant_session(db_name)
     logger.info(f"🏷️  Tenant DB selected: {db_name}")
 
+    # Cheap: no pool connection is checked out until the first statement runs
     db = SessionLocal()
     try:
         yield db
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception:
+        db.rollback()
         logger.exception(f"❌ Tenant DB error [{db_name}]")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="DB Connection failed")
     finally:
         db.close()
+
+
+async def get_company_db_async(claims: Dict = Depends(get_token_claims)) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async twin of get_company_db: tenant-scoped AsyncSession (asyncpg).
+    The schema check only leaves the event loop the first time a tenant is seen.
+    """
+    db_name = _tenant_db_name(claims)
+
+    if not is_tenant_schema_ready(db_name):
+        try:
+            await run_in_threadpool(ensure_tenant_schema, db_name)
+        except Exception as e:
+            logger.warning(f"⚠️ ensure_tenant_schema warning for '{db_name}': {repr(e)}")
+
+    SessionLocal = get_async_tenant_session(db_name)
+    logger.info(f"🏷️  Tenant DB selected (async): {db_name}")
+
+    db = SessionLocal()
+    try:
+        yield db
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception:
+        await db.rollback()
+        logger.exception(f"❌ Tenant DB error [{db_name}]")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="DB Connection failed")
+    finally:
+        await db.close()
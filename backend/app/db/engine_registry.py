@@ -0,0 +1,298 @@
+# app/db/engine_registry.py
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from app.core.logger import logger
+
+
+class TenantConnectionBudgetExceeded(RuntimeError):
+    """Raised when a new tenant engine would push the process over its connection budget."""
+
+
+def parse_pool_overrides(raw: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Parse "db_a=10:5,db_b=3:0" into {"db_a": (10, 5), "db_b": (3, 0)}.
+    Malformed entries are skipped (logged) so a typo can't take the app down.
+    """
+    overrides: Dict[str, Tuple[int, int]] = {}
+    for item in (raw or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            name, sizing = item.split("=", 1)
+            size, overflow = sizing.split(":", 1)
+            overrides[name.strip()] = (int(size), int(overflow))
+        except ValueError:
+            logger.warning(f"⚠️ Ignoring malformed tenant pool override: '{item}'")
+    return overrides
+
+
+class ConnectionBudget:
+    """
+    Connection cap shared by several registries (the sync and async tenant
+    engines): together they never reserve more than `max_total_connections`,
+    and a registry that needs room may evict another's idle engine.
+    """
+
+    def __init__(self, max_total_connections: int):
+        self.max_total_connections = max_total_connections
+        # One lock for every registry on the budget, so cross-registry eviction can't deadlock
+        self.lock = threading.RLock()
+        self._registries: List["TenantEngineRegistry"] = []
+
+    def join(self, registry: "TenantEngineRegistry") -> None:
+        with self.lock:
+            self._registries.append(registry)
+
+    def reserved(self) -> int:
+        with self.lock:
+            return sum(r._reserved() for r in self._registries)
+
+    def pick_victim(self) -> Optional[Tuple["TenantEngineRegistry", str]]:
+        # Least recently used idle engine across every registry on the budget
+        with self.lock:
+            candidates = [
+                (e.last_used, registry, name)
+                for registry in self._registries
+                for name, e in registry._entries.items()
+                if e.checked_out() == 0
+            ]
+        if not candidates:
+            return None
+        _, registry, name = min(candidates, key=lambda c: c[0])
+        return registry, name
+
+
+@dataclass
+class _Entry:
+    engine: Any
+    pool_size: int
+    max_overflow: int
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    hits: int = 0
+
+    @property
+    def reserved(self) -> int:
+        # Worst case a QueuePool can open: pool_size + max_overflow
+        return self.pool_size + max(self.max_overflow, 0)
+
+    def checked_out(self) -> int:
+        pool = getattr(self.engine, "pool", None)
+        try:
+            return int(pool.checkedout())
+        except Exception:
+            return 0
+
+
+class TenantEngineRegistry:
+    """
+    Bounded, thread-safe registry of tenant engines.
+
+    - LRU + idle-TTL eviction; evicted engines are disposed (pool closed).
+      Idle engines are reaped at most every `reap_interval_seconds` from get(),
+      and by whoever calls reap_idle() (the app's background reaper).
+    - Process-wide connection budget: sum(pool_size + max_overflow) of all
+      live engines never exceeds `max_total_connections`. Pass a shared
+      `budget` instead to cap several registries together.
+    - Per-tenant pool sizing via `overrides` ({db_name: (pool_size, max_overflow)}).
+    """
+
+    def __init__(
+        self,
+        create: Callable[[str, int, int], Any],
+        dispose: Callable[[Any], None],
+        *,
+        max_engines: int,
+        idle_ttl_seconds: float,
+        max_total_connections: Optional[int] = None,
+        budget: Optional[ConnectionBudget] = None,
+        pool_size: int,
+        max_overflow: int,
+        overrides: Optional[Mapping[str, Tuple[int, int]]] = None,
+        reap_interval_seconds: float = 60.0,
+    ):
+        self._create = create
+        self._dispose = dispose
+        self.max_engines = max_engines
+        self.idle_ttl_seconds = idle_ttl_seconds
+        if budget is None:
+            if max_total_connections is None:
+                raise TypeError("TenantEngineRegistry needs max_total_connections or a shared budget")
+            budget = ConnectionBudget(max_total_connections)
+        self.budget = budget
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.overrides: Dict[str, Tuple[int, int]] = dict(overrides or {})
+        self.reap_interval_seconds = reap_interval_seconds
+        self._next_reap = time.monotonic() + reap_interval_seconds
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = budget.lock
+        self.evictions = 0
+        budget.join(self)
+
+    @property
+    def max_total_connections(self) -> int:
+        return self.budget.max_total_connections
+
+    # -------- Public API --------
+    def get(self, db_name: str):
+        """Return the engine for `db_name`, creating it (and evicting others) if needed."""
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(db_name)
+            if entry is not None:
+                entry.last_used = now
+                entry.hits += 1
+                self._entries.move_to_end(db_name)
+                if now >= self._next_reap:
+                    self._evict_idle(now)  # this entry was just touched, so it survives
+                return entry.engine
+
+            self._evict_idle(now)
+            pool_size, max_overflow = self.sizing_for(db_name)
+            self._make_room(pool_size + max(max_overflow, 0))
+
+            engine = self._create(db_name, pool_size, max_overflow)
+            self._entries[db_name] = _Entry(
+                engine=engine, pool_size=pool_size, max_overflow=max_overflow, created_at=now, last_used=now, hits=1,
+            )
+            logger.info(
+                f"🔌 Tenant engine created for '{db_name}' "
+                f"(pool={pool_size}+{max_overflow}, reserved={self.budget.reserved()}/{self.max_total_connections})"
+            )
+            return engine
+
+    def sizing_for(self, db_name: str) -> Tuple[int, int]:
+        return self.overrides.get(db_name, (self.pool_size, self.max_overflow))
+
+    def evict(self, db_name: str) -> bool:
+        """Dispose and forget a single tenant engine (e.g. after the tenant is dropped)."""
+        with self._lock:
+            entry = self._entries.pop(db_name, None)
+        if entry is None:
+            return False
+        self._dispose_entry(db_name, entry, reason="explicit")
+        return True
+
+    def dispose_all(self) -> None:
+        with self._lock:
+            entries = list(self._entries.items())
+            self._entries.clear()
+        for db_name, entry in entries:
+            self._dispose_entry(db_name, entry, reason="shutdown")
+
+    def reap_idle(self) -> int:
+        """Evict engines idle longer than the TTL; returns how many were evicted."""
+        with self._lock:
+            return self._evict_idle(time.monotonic())
+
+    def reserved_connections(self) -> int:
+        with self._lock:
+            return self._reserved()
+
+    def __contains__(self, db_name: str) -> bool:
+        with self._lock:
+            return db_name in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def engines(self) -> List[Tuple[str, Any]]:
+        with self._lock:
+            return [(name, e.engine) for name, e in self._entries.items()]
+
+    def stats(self) -> Dict[str, Any]:
+        """Registry-wide and per-tenant pool stats (safe to expose to admins/metrics)."""
+        now = time.monotonic()
+        with self._lock:
+            tenants = {}
+            for name, e in self._entries.items():
+                pool = getattr(e.engine, "pool", None)
+                tenants[name] = {
+                    "pool_size": e.pool_size,
+                    "max_overflow": e.max_overflow,
+                    "checked_out": e.checked_out(),
+                    "checked_in": _pool_call(pool, "checkedin"),
+                    "overflow": _pool_call(pool, "overflow"),
+                    "hits": e.hits,
+                    "age_seconds": round(now - e.created_at, 1),
+                    "idle_seconds": round(now - e.last_used, 1),
+                }
+            return {
+                "engines": len(self._entries),
+                "max_engines": self.max_engines,
+                "reserved_connections": self._reserved(),
+                "budget_reserved_connections": self.budget.reserved(),
+                "max_total_connections": self.max_total_connections,
+                "evictions": self.evictions,
+                "tenants": tenants,
+            }
+
+    # -------- Internals (call with lock held) --------
+    def _reserved(self) -> int:
+        return sum(e.reserved for e in self._entries.values())
+
+    def _evict_idle(self, now: float) -> int:
+        self._next_reap = now + self.reap_interval_seconds
+        if not self.idle_ttl_seconds or self.idle_ttl_seconds <= 0:
+            return 0
+        expired = [
+            name
+            for name, e in self._entries.items()
+            if now - e.last_used > self.idle_ttl_seconds and e.checked_out() == 0
+        ]
+        for name in expired:
+            self._dispose_entry(name, self._entries.pop(name), reason="idle")
+        return len(expired)
+
+    def _make_room(self, needed: int) -> None:
+        if needed > self.max_total_connections:
+            raise TenantConnectionBudgetExceeded(
+                f"Tenant pool needs {needed} connections but the process budget is {self.max_total_connections}"
+            )
+
+        while True:
+            if len(self._entries) >= self.max_engines:
+                # The engine cap is per registry: make room among our own engines
+                owner, victim = self, self._pick_victim()
+            elif self.budget.reserved() + needed > self.max_total_connections:
+                # The connection budget may be shared: any registry's idle engine will do
+                owner, victim = self.budget.pick_victim() or (self, None)
+            else:
+                return
+            if victim is None:
+                raise TenantConnectionBudgetExceeded(
+                    "All tenant engines are busy; connection budget exhausted "
+                    f"({self.budget.reserved()}/{self.max_total_connections})"
+                )
+            owner._dispose_entry(victim, owner._entries.pop(victim), reason="lru")
+
+    def _pick_victim(self) -> Optional[str]:
+        # Least recently used first; prefer engines with nothing checked out so
+        # in-flight requests don't lose their pool underneath them.
+        for name, e in self._entries.items():
+            if e.checked_out() == 0:
+                return name
+        return None
+
+    def _dispose_entry(self, db_name: str, entry: _Entry, reason: str) -> None:
+        self.evictions += 1
+        try:
+            self._dispose(entry.engine)
+            logger.info(f"♻️ Tenant engine disposed for '{db_name}' ({reason})")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed disposing tenant engine '{db_name}': {repr(e)}")
+
+
+def _pool_call(pool, name: str) -> int:
+    try:
+        return int(getattr(pool, name)())
+    except Exception:
+        return 0
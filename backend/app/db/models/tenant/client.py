@@ -20,6 +20,9 @@ class TimestampMixin:
 
 class Client(BaseTenant, TimestampMixin):  # 👈 inherit BaseTenant directly
     __tablename__ = "clients"
+    # created_at/updated_at/status are server-side: fetch them with INSERT/UPDATE ... RETURNING
+    # instead of expiring them (which would cost a refresh SELECT, or a lazy load in async)
+    __mapper_args__ = {"eager_defaults": True}
     __table_args__ = (
         CheckConstraint(
             "status IN ('Active','Deactivated','Blacklisted')",
@@ -29,6 +32,9 @@ class Client(BaseTenant, TimestampMixin):  # 👈 inherit BaseTenant directly
         Index("idx_clients_email", "email"),
         Index("idx_clients_status", "status"),
         Index("idx_clients_joined_date", "joined_date"),
+        Index("idx_clients_created_at_id", "created_at", "id"),  # keyset pagination
+        # Search uses gin_trgm_ops indexes on name/email/company; they need pg_trgm,
+        # so they're created by tenant schema migration v4 rather than create_all.
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
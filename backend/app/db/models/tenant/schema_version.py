@@ -0,0 +1,10 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer
+from app.db.database import BaseTenant
+
+class TenantSchemaVersion(BaseTenant):  # 👈 single-row bookkeeping table per tenant DB
+    __tablename__ = "tenant_schema_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+    applied_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -4,6 +4,7 @@ from app.db.database import BaseMaster as Base
 
 class User(Base):
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}  # created_at comes back via INSERT ... RETURNING
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, nullable=False)
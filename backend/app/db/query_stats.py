@@ -0,0 +1,105 @@
+# app/db/query_stats.py
+"""
+Per-request SQL instrumentation.
+
+Engine events (master + every tenant engine, sync and async) add each
+statement's time to the QueryStats of the current request, found through a
+contextvar set by the request middleware. Outside a request nothing is recorded.
+Optionally flags statements repeated within one request (N+1 patterns).
+"""
+import contextvars
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+_current: contextvars.ContextVar[Optional["QueryStats"]] = contextvars.ContextVar("query_stats", default=None)
+
+_SQL_PREVIEW_CHARS = 300
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_sql: Optional[str] = None
+    track_repeats: bool = False
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_sql = statement
+        if self.track_repeats:
+            self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least `threshold` times (most repeated first)."""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_ms:.1f};desc="{self.count} queries"'
+
+    def log_fields(self) -> Dict[str, Any]:
+        fields: Dict[str, Any] = {"db_queries": self.count, "db_ms": round(self.total_ms, 2)}
+        if self.slowest_sql:
+            fields["db_slowest_ms"] = round(self.slowest_ms, 2)
+            fields["db_slowest_sql"] = sql_preview(self.slowest_sql)
+        return fields
+
+
+def sql_preview(statement: str) -> str:
+    flat = " ".join(statement.split())
+    return flat if len(flat) <= _SQL_PREVIEW_CHARS else flat[:_SQL_PREVIEW_CHARS] + "…"
+
+
+def start_request_stats() -> contextvars.Token:
+    """Begin collecting for the current request (call from the middleware)."""
+    return _current.set(QueryStats(track_repeats=settings.SQL_N_PLUS_ONE_THRESHOLD > 0))
+
+
+def finish_request_stats(token: contextvars.Token) -> Optional[QueryStats]:
+    stats = _current.get()
+    _current.reset(token)
+    return stats
+
+
+def current_request_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    started = conn.info.get("query_started")
+    if started:
+        stats.record(statement, (time.perf_counter() - started.pop()) * 1000)
+
+
+def _handle_error(exception_context):
+    # Keep the per-connection stack balanced when a statement fails
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def instrument_engine(engine):
+    """Attach the timing hooks to a sync Engine (pass async_engine.sync_engine for async)."""
+    if settings.SQL_INSTRUMENTATION and not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
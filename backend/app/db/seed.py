@@ -0,0 +1,262 @@
+# app/db/seed.py
+"""
+Synthetic data for scale testing: companies (master profile + users), tenant
+DBs bootstrapped with the real provisioning helpers, CompanySettings seeded
+the way registration does it, then bulk-inserted clients and invoices.
+
+Tenants are seeded in parallel worker processes; rows go in with executemany
+batches (SQLAlchemy insertmanyvalues), not one ORM flush per row.
+
+    python -m app.db.seed --tenants 10 --clients 50000 --invoices 20000 --users 5 --workers 4
+    python -m app.db.seed --tenants 1 --clients 200000 --prefix bigco      # one very large tenant
+
+Re-running with the same --prefix skips tenants that already exist.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List
+
+from sqlalchemy import insert
+
+from app.core.logger import logger
+
+_FIRST = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+          "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Carlos", "Priya",
+          "Wei", "Fatima", "Olga", "Kenji", "Amara", "Luca", "Sofia", "Mateo", "Aisha", "Noah"]
+_LAST = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+         "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+         "Lee", "Patel", "Nguyen", "Kim", "Chen", "Singh", "Kowalski", "Rossi", "Muller", "Okafor"]
+_COMPANY_WORDS = ["Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Wonka", "Cyberdyne", "Soylent",
+                  "Hooli", "Vandelay", "Pied Piper", "Tyrell", "Gringotts", "Oscorp", "Aperture", "Monarch"]
+_COMPANY_SUFFIX = ["LLC", "Inc", "Corp", "Group", "Partners", "Holdings", "Co"]
+_CITIES = [("Austin", "TX", "78701"), ("Denver", "CO", "80202"), ("Seattle", "WA", "98101"),
+           ("Chicago", "IL", "60601"), ("Boston", "MA", "02108"), ("Miami", "FL", "33101"),
+           ("Phoenix", "AZ", "85001"), ("Portland", "OR", "97201"), ("Atlanta", "GA", "30301")]
+_SERVICES = ["Consulting", "Design work", "Maintenance", "Software license", "Support hours", "Hosting",
+             "Training session", "Hardware", "Installation", "Audit", "Delivery", "Materials"]
+# Roughly production-like skew
+_CLIENT_STATUS_WEIGHTS = (("Active", 85), ("Deactivated", 12), ("Blacklisted", 3))
+_INVOICE_STATUS_WEIGHTS = (("Paid", 60), ("Outstanding", 30), ("Overdue", 8), ("Draft", 2))
+
+
+def _weighted(rng: random.Random, pairs) -> str:
+    values, weights = zip(*pairs)
+    return rng.choices(values, weights)[0]
+
+
+def _batches(rows: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    batch: List[Dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _client_rows(rng: random.Random, count: int, created_by: str) -> Iterator[Dict]:
+    now = datetime.now(timezone.utc)
+    for i in range(count):
+        first, last = rng.choice(_FIRST), rng.choice(_LAST)
+        city, state, postal = rng.choice(_CITIES)
+        # Spread created_at over ~3 years so keyset/ordering behaves like real data
+        created = now - timedelta(seconds=rng.randint(0, 3 * 365 * 24 * 3600))
+        yield {
+            "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+            "name": f"{first} {last}",
+            "email": f"{first}.{last}.{i}@example.com".lower(),
+            "phone": f"555{rng.randint(1000000, 9999999)}",
+            "company": f"{rng.choice(_COMPANY_WORDS)} {rng.choice(_COMPANY_SUFFIX)}" if rng.random() < 0.8 else None,
+            "notes": None if rng.random() < 0.7 else f"Prefers contact by {rng.choice(['email', 'phone'])}.",
+            "joined_date": (created - timedelta(days=rng.randint(0, 30))).date(),
+            "address_line1": f"{rng.randint(1, 9999)} {rng.choice(_LAST)} St",
+            "city": city,
+            "state": state,
+            "postal_code": postal,
+            "country": "US",
+            "default_currency": "USD",
+            "default_tax_rate": rng.choice([0, 5, 7.5, 8.25, 10]),
+            "payment_terms": rng.choice(["Net 15", "Net 30", "Net 45", "Due on receipt"]),
+            "status": _weighted(rng, _CLIENT_STATUS_WEIGHTS),
+            "created_by": created_by,
+            "created_at": created,
+            "updated_at": created,
+        }
+
+
+def _invoice_rows(rng: random.Random, count: int) -> Iterator[Dict]:
+    today = date.today()
+    for _ in range(count):
+        items = [
+            {
+                "description": rng.choice(_SERVICES),
+                "quantity": rng.randint(1, 20),
+                "price": round(rng.uniform(10, 2500), 2),
+            }
+            for _ in range(rng.randint(1, 8))
+        ]
+        subtotal = sum(i["quantity"] * i["price"] for i in items)
+        discount = round(subtotal * rng.choice([0, 0, 0, 0.05, 0.1]), 2)
+        tax = round((subtotal - discount) * rng.choice([0, 0.05, 0.075, 0.0825]), 2)
+        yield {
+            "client_name": f"{rng.choice(_FIRST)} {rng.choice(_LAST)}",
+            "invoice_title": f"{rng.choice(_SERVICES)} — {rng.choice(['Q1', 'Q2', 'Q3', 'Q4'])}",
+            "invoice_date": today - timedelta(days=rng.randint(0, 3 * 365)),
+            "status": _weighted(rng, _INVOICE_STATUS_WEIGHTS),
+            "line_items": items,
+            "discount": discount,
+            "tax": tax,
+            "total": round(subtotal - discount + tax, 2),
+            "notes": None if rng.random() < 0.8 else "Thank you for your business.",
+        }
+
+
+def seed_tenant(index: int, opts: Dict) -> Dict:
+    """Create one company end to end; runs inside a worker process."""
+    from app.db.database import MasterSessionLocal, ensure_tenant_tables, get_tenant_session
+    from app.db.models.invoice import Invoice
+    from app.db.models.master.company_profile import CompanyProfile as MasterCompanyProfile
+    from app.db.models.tenant.client import Client
+    from app.db.models.tenant.company_profile import CompanyProfile as TenantCompanyProfile
+    from app.db.models.user import User
+    from app.services.company_settings_service import get_or_create_settings
+    from app.utils.db_utils import create_company_database
+
+    rng = random.Random(f"{opts['seed']}:{index}")
+    company_name = f"{opts['prefix']} {index:04d}"
+    # Same naming rule as CompanyProfileService.register
+    db_name = company_name.lower().replace(" ", "_") + "_db"
+    admin_username = f"{opts['prefix']}_{index:04d}_admin".lower()
+    started = time.perf_counter()
+
+    # 1) Master records (company + users)
+    with MasterSessionLocal() as master:
+        if master.query(MasterCompanyProfile).filter_by(db_name=db_name).first():
+            return {"db_name": db_name, "skipped": True}
+        create_company_database(db_name)
+        company = MasterCompanyProfile(company_name=company_name, db_name=db_name)
+        master.add(company)
+        master.flush()
+        master.execute(
+            insert(User),
+            [
+                {
+                    "username": admin_username if u == 0 else f"{admin_username[:-6]}_user{u}",
+                    "email": f"{admin_username if u == 0 else admin_username[:-6] + '_user' + str(u)}@example.com",
+                    "hashed_password": opts["password_hash"],
+                    "is_active": True,
+                    "role": "admin" if u == 0 else "user",
+                    "company_id": company.id,
+                }
+                for u in range(max(opts["users"], 1))
+            ],
+        )
+        master.commit()
+
+    # 2) Tenant schema + profile + settings (same helpers as registration)
+    ensure_tenant_tables(db_name)
+    city, state, postal = rng.choice(_CITIES)
+    with get_tenant_session(db_name)() as tenant_db:
+        tenant_db.add(
+            TenantCompanyProfile(
+                company_name=company_name,
+                company_email=f"billing@{db_name}.example.com",
+                company_mobile=f"555{rng.randint(1000000, 9999999)}",
+                address1=f"{rng.randint(1, 999)} Main St",
+                address2="",
+                city=city,
+                state=state,
+                zip_code=postal,
+                tax_rate=str(rng.choice([0, 5, 7.5, 8.25])),
+                status="Active",
+                db_name=db_name,
+            )
+        )
+        tenant_db.commit()
+        get_or_create_settings(tenant_db)
+
+        # 3) Bulk rows
+        for batch in _batches(_client_rows(rng, opts["clients"], admin_username), opts["batch_size"]):
+            tenant_db.execute(insert(Client), batch)
+            tenant_db.commit()
+        for batch in _batches(_invoice_rows(rng, opts["invoices"]), opts["batch_size"]):
+            tenant_db.execute(insert(Invoice), batch)
+            tenant_db.commit()
+
+    elapsed = time.perf_counter() - started
+    logger.info("🌱 Seeded tenant %s in %.1fs", db_name, elapsed)
+    return {
+        "db_name": db_name,
+        "admin_username": admin_username,
+        "clients": opts["clients"],
+        "invoices": opts["invoices"],
+        "users": max(opts["users"], 1),
+        "seconds": round(elapsed, 2),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenants", type=int, default=3)
+    parser.add_argument("--clients", type=int, default=20000, help="clients per tenant")
+    parser.add_argument("--invoices", type=int, default=5000, help="invoices per tenant")
+    parser.add_argument("--users", type=int, default=3, help="users per tenant (first one is the admin)")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="tenants seeded in parallel")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--prefix", default="Seed", help="company name prefix (re-runs skip existing tenants)")
+    parser.add_argument("--password", default="seed-password", help="password for every seeded user")
+    parser.add_argument("--seed", default="joslasync", help="RNG seed for reproducible data")
+    args = parser.parse_args(argv)
+
+    from app.db.database import create_master_schema
+    from app.utils.security import hash_password
+
+    create_master_schema()
+    opts = {
+        "clients": args.clients,
+        "invoices": args.invoices,
+        "users": args.users,
+        "batch_size": args.batch_size,
+        "prefix": args.prefix,
+        "seed": args.seed,
+        # bcrypt once: every seeded user shares the hash, which is still a valid login
+        "password_hash": hash_password(args.password),
+    }
+
+    started = time.perf_counter()
+    results: List[Dict] = []
+    # spawn: children build their own engines instead of inheriting pooled sockets
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max(args.workers, 1), mp_context=ctx) as pool:
+        futures = [pool.submit(seed_tenant, i, opts) for i in range(args.tenants)]
+        for future in as_completed(futures):
+            results.append(future.result())
+    elapsed = time.perf_counter() - started
+
+    seeded = [r for r in results if not r.get("skipped")]
+    rows = sum(r["clients"] + r["invoices"] for r in seeded)
+    print(json.dumps(
+        {
+            "tenants_seeded": len(seeded),
+            "tenants_skipped": len(results) - len(seeded),
+            "rows": rows,
+            "seconds": round(elapsed, 2),
+            "rows_per_second": round(rows / elapsed, 1) if elapsed else None,
+            "login": {"password": args.password, "admins": sorted(r["admin_username"] for r in seeded)},
+            "tenants": sorted(results, key=lambda r: r["db_name"]),
+        },
+        indent=2,
+        default=str,
+    ))
+
+
+if __name__ == "__main__":
+    main()
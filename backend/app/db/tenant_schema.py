@@ -0,0 +1,180 @@
+# app/db/tenant_schema.py
+"""
+Tenant schema-version registry.
+
+Each tenant DB (or tenant schema, in schema tenancy) carries a one-row
+`tenant_schema_version` table. The first
+request for a tenant in this process reads it; if it is missing or older than
+TENANT_SCHEMA_VERSION the tenant is bootstrapped (create_all + migrations) and
+re-stamped. Either way the tenant is then remembered as ready, so the request
+hot path is a set lookup — no DDL, no catalog queries.
+"""
+import threading
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.core.logger import logger
+
+# Bump when tenant models change; add the idempotent DDL needed to bring an
+# existing tenant up to that version (create_all only adds missing tables).
+TENANT_SCHEMA_VERSION = 4
+
+TENANT_MIGRATIONS: Dict[int, List[str]] = {
+    1: [],
+    2: [],  # invoices table (added by create_all)
+    3: [
+        # Backs keyset pagination on the client list (scanned backwards for newest-first)
+        "CREATE INDEX IF NOT EXISTS idx_clients_created_at_id ON clients (created_at, id)",
+    ],
+    4: [],  # trigram search: see TENANT_OPTIONAL_MIGRATIONS
+}
+
+# Best-effort DDL, run in a savepoint after the version's required DDL: a failure
+# (e.g. CREATE EXTENSION denied to a non-owner role, or pg_trgm not allow-listed on
+# managed Postgres) is logged and skipped, and the tenant is still stamped. Client
+# search checks has_trigram() and stays on plain ILIKE where the extension is missing.
+TENANT_OPTIONAL_MIGRATIONS: Dict[int, List[str]] = {
+    4: [
+        # Trigram indexes for client search (ILIKE '%q%' and word-similarity typo matching).
+        # The extension is per database; pin it to public so every tenant schema sees it.
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public",
+        "CREATE INDEX IF NOT EXISTS idx_clients_name_trgm ON clients USING gin (name gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_clients_email_trgm ON clients USING gin (email gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_clients_company_trgm ON clients USING gin (company gin_trgm_ops)",
+    ],
+}
+
+_SCHEMA_ROW_ID = 1
+
+_ready: Set[str] = set()
+_trigram: Set[str] = set()  # ready tenants whose database has pg_trgm
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def read_schema_version(conn: Connection) -> Optional[int]:
+    """Return the stamped version, or None when the tenant was never bootstrapped."""
+    try:
+        with conn.begin_nested():
+            return conn.execute(
+                text("SELECT version FROM tenant_schema_version WHERE id = :id"),
+                {"id": _SCHEMA_ROW_ID},
+            ).scalar()
+    except DBAPIError:
+        # Table missing (pre-registry tenant or brand-new DB)
+        return None
+
+
+def read_has_trigram(conn: Connection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(conn.execute(text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")).scalar())
+
+
+def _apply_optional(conn: Connection, version: int, statements: List[str]) -> None:
+    try:
+        with conn.begin_nested():
+            for ddl in statements:
+                conn.execute(text(ddl))
+    except DBAPIError as e:
+        logger.warning(f"⚠️ Optional tenant migration v{version} skipped: {e.orig!r}")
+
+
+def bootstrap_tenant_schema(engine: Engine, metadata, schema: Optional[str] = None) -> int:
+    """
+    Create missing tables, apply pending migrations and stamp the version,
+    all in one transaction. A transaction-scoped advisory lock keeps several
+    workers from bootstrapping the same tenant at once.
+    `schema` is set in schema tenancy; tables then live in that schema.
+    """
+    from app.db.database import set_tenant_search_path
+
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+                {"key": f"tenant_schema_version:{schema or ''}"},
+            )
+        set_tenant_search_path(conn, schema)
+        current = read_schema_version(conn) or 0
+        if current >= TENANT_SCHEMA_VERSION:
+            return current
+
+        # Explicit translate map so create_all's existence checks target the tenant schema
+        ddl_conn = conn.execution_options(schema_translate_map={None: schema}) if schema else conn
+        metadata.create_all(bind=ddl_conn)
+        for version in sorted(v for v in TENANT_MIGRATIONS if current < v <= TENANT_SCHEMA_VERSION):
+            for ddl in TENANT_MIGRATIONS[version]:
+                conn.execute(text(ddl))
+            if TENANT_OPTIONAL_MIGRATIONS.get(version):
+                _apply_optional(conn, version, TENANT_OPTIONAL_MIGRATIONS[version])
+
+        updated = conn.execute(
+            text("UPDATE tenant_schema_version SET version = :v, applied_at = CURRENT_TIMESTAMP WHERE id = :id"),
+            {"v": TENANT_SCHEMA_VERSION, "id": _SCHEMA_ROW_ID},
+        ).rowcount
+        if not updated:
+            conn.execute(
+                text("INSERT INTO tenant_schema_version (id, version, applied_at) VALUES (:id, :v, CURRENT_TIMESTAMP)"),
+                {"v": TENANT_SCHEMA_VERSION, "id": _SCHEMA_ROW_ID},
+            )
+        logger.info(f"🧱 Tenant schema bootstrapped v{current} -> v{TENANT_SCHEMA_VERSION}")
+        return TENANT_SCHEMA_VERSION
+
+
+def is_tenant_schema_ready(db_name: str) -> bool:
+    return db_name in _ready
+
+
+def mark_tenant_schema_ready(db_name: str, trigram: bool = False) -> None:
+    if trigram:
+        _trigram.add(db_name)
+    else:
+        _trigram.discard(db_name)
+    _ready.add(db_name)
+
+
+def has_trigram(db_name: Optional[str]) -> bool:
+    """pg_trgm is installed for this (ready) tenant; decided once per tenant per process."""
+    return db_name in _trigram
+
+
+def forget_tenant_schema(db_name: str) -> None:
+    """Force the next request for this tenant to re-check its schema version."""
+    _ready.discard(db_name)
+    _trigram.discard(db_name)
+
+
+def ensure_tenant_schema(db_name: str) -> None:
+    """
+    Hot-path guard used by tenant-scoped dependencies.
+    Only the first call per tenant per process touches the database.
+    """
+    if db_name in _ready:
+        return
+
+    from app.db.database import (
+        ensure_tenant_tables,
+        get_engine_for_db,
+        set_tenant_search_path,
+        tenant_schema_for,
+    )
+
+    with _locks_guard:
+        lock = _locks.setdefault(db_name, threading.Lock())
+
+    with lock:
+        if db_name in _ready:
+            return
+        with get_engine_for_db(db_name).connect() as conn:
+            set_tenant_search_path(conn, tenant_schema_for(db_name))
+            version = read_schema_version(conn)
+            trigram = read_has_trigram(conn)
+        if version is None or version < TENANT_SCHEMA_VERSION:
+            logger.info(f"🧱 Tenant '{db_name}' schema version {version} < {TENANT_SCHEMA_VERSION}; bootstrapping")
+            ensure_tenant_tables(db_name)  # marks the tenant ready
+            return
+        mark_tenant_schema_ready(db_name, trigram)
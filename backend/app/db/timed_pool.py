@@ -0,0 +1,46 @@
+# app/db/timed_pool.py
+"""
+QueuePool variants that record how long a checkout waited for a connection
+(db_pool_checkout_wait_seconds). SQLAlchemy has no "checkout started" event,
+so the timing wraps the pool's internal _do_get.
+"""
+import time
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.metrics import POOL_WAIT
+
+
+class _TimedPoolMixin:
+    metrics_label = "unknown"
+    metrics_driver = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - started, tenant=self.metrics_label, driver=self.metrics_driver)
+
+    def recreate(self):
+        # engine.dispose() swaps in a recreated pool; keep its labels
+        pool = super().recreate()
+        pool.metrics_label = self.metrics_label
+        pool.metrics_driver = self.metrics_driver
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    metrics_driver = "async"
+
+
+def label_pool(engine, label: str):
+    """Tag an engine's pool with the tenant it serves (no-op for untimed pools)."""
+    pool = getattr(engine, "pool", None)
+    if isinstance(pool, _TimedPoolMixin):
+        pool.metrics_label = label
+    return engine
@@ -1,12 +1,15 @@
 # app/main.py
 from __future__ import annotations
 
+import asyncio
+import time
 import uuid
 import jwt
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
 # Optional proxy headers (older Starlette may not have this module)
@@ -17,11 +20,14 @@ except Exception:  # ModuleNotFoundError on older Starlette
     ProxyHeadersMiddleware = None  # type: ignore
     _HAS_PROXY_HEADERS = False
 
-from app.api.routes import api_router
-from app.core.logger import logger
+from app.core.logger import logger, request_context, should_sample
 from app.core.config import settings
-from app.db.database import master_engine, BaseMaster
-from app.db.models.master.company_profile import CompanyProfile  # noqa: F401
+from app.core.profiler import request_profiler
+from app.core.metrics import IN_FLIGHT, REQUEST_LATENCY, REQUESTS, render_metrics
+from app.db.database import create_master_schema, tenant_engines
+from app.db.query_stats import finish_request_stats, sql_preview, start_request_stats
+from app.utils.route_utils import route_template
+from app.utils.security import shutdown_hash_pool, verify_access_token_cached
 
 
 def build_app() -> FastAPI:
@@ -57,8 +63,9 @@ def build_app() -> FastAPI:
             "Accept",
             "X-Requested-With",
             "X-Request-ID",
+            "X-Profile",
         ],
-        expose_headers=["X-Request-ID"],
+        expose_headers=["X-Request-ID", "X-Profile-Id"],
         max_age=600,
     )
 
@@ -88,28 +95,122 @@ def build_app() -> FastAPI:
     async def request_id_and_tenant_logger(request: Request, call_next):
         req_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
         db_name = "unknown"
+        # Verify the bearer token once per request; deps.get_token_claims reuses the result
+        request.state.claims = None
+        request.state.token_error = None
         auth = request.headers.get("Authorization")
         if auth and auth.startswith("Bearer "):
             try:
-                payload = jwt.decode(
-                    auth.split(" ", 1)[1],
-                    settings.JWT_SECRET,
-                    algorithms=[settings.JWT_ALGORITHM],
-                )
+                payload = verify_access_token_cached(auth.split(" ", 1)[1])
+                request.state.claims = payload
                 db_name = payload.get("db_name") or payload.get("db") or "unknown"
+            except jwt.ExpiredSignatureError:
+                request.state.token_error = "expired"
             except jwt.PyJWTError:
-                pass
-        logger.info(f"➡️  {request.method} {request.url.path} | db={db_name} | req_id={req_id}")
-        response = await call_next(request)
+                request.state.token_error = "invalid"
+        ctx_token = request_context.set(
+            {
+                "req_id": req_id,
+                "tenant": db_name,
+                "route": request.url.path,
+                "sampled": should_sample(request.url.path),
+            }
+        )
+        stats_token = start_request_stats()
+        started = time.perf_counter()
+        status_code = 500
+        response = None
+        IN_FLIGHT.inc(method=request.method)
+        trigger = request_profiler.wants_profile(request, request.state.claims)
+        profiling = request_profiler.start(req_id, request.method, request.url.path, trigger) if trigger else None
+        try:
+            logger.info("➡️  %s %s | db=%s | req_id=%s", request.method, request.url.path, db_name, req_id)
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            if profiling is not None:
+                profiling.stop()
+                if response is not None:
+                    response.headers["X-Profile-Id"] = profiling.profile.profile_id
+            elapsed = time.perf_counter() - started
+            template = route_template(request.scope) or "unmatched"
+            query_stats = finish_request_stats(stats_token)
+            IN_FLIGHT.dec(method=request.method)
+            REQUEST_LATENCY.observe(elapsed, method=request.method, route=template, tenant=db_name)
+            REQUESTS.inc(method=request.method, route=template, tenant=db_name, status=status_code)
+            logger.info(
+                "⬅️  %s %s | %s | %.1fms | %d queries",
+                request.method,
+                request.url.path,
+                status_code,
+                elapsed * 1000,
+                query_stats.count,
+                extra={
+                    "status": status_code,
+                    "duration_ms": round(elapsed * 1000, 2),
+                    "route_template": template,
+                    **query_stats.log_fields(),
+                },
+            )
+            if settings.SQL_N_PLUS_ONE_THRESHOLD > 0:
+                for statement, times in query_stats.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD):
+                    logger.warning(
+                        "🔁 Possible N+1: statement ran %d times in %s %s",
+                        times,
+                        request.method,
+                        template,
+                        extra={"repeated_sql": sql_preview(statement), "repeat_count": times},
+                    )
+            if response is not None and settings.SERVER_TIMING_ENABLED:
+                response.headers.append(
+                    "Server-Timing", f"{query_stats.server_timing()}, app;dur={elapsed * 1000:.1f}"
+                )
+            request_context.reset(ctx_token)
         response.headers["X-Request-ID"] = req_id
         return response
 
     # ---------- Ensure master schema ----------
     @app.on_event("startup")
     def ensure_master_schema():
-        BaseMaster.metadata.create_all(bind=master_engine)
+        if settings.SERVERLESS:
+            # No DDL on cold start; run `python -m app.db.bootstrap` at deploy time
+            return
+        create_master_schema()
         logger.info("✅ Master DB connected and base models ensured.")
 
+    # ---------- Reap idle tenant pools ----------
+    async def reap_idle_engines():
+        from app.db.async_database import async_tenant_engines
+
+        while True:
+            await asyncio.sleep(settings.TENANT_ENGINE_REAP_INTERVAL_SECONDS)
+            try:
+                # Closing sync pools blocks on sockets; async disposal is scheduled on the loop
+                await run_in_threadpool(tenant_engines.reap_idle)
+                async_tenant_engines.reap_idle()
+            except Exception:
+                logger.exception("⚠️ Idle tenant engine reaping failed")
+
+    @app.on_event("startup")
+    async def start_engine_reaper():
+        # Serverless: no background work between invocations; lookups reap instead
+        if settings.SERVERLESS or settings.TENANT_ENGINE_REAP_INTERVAL_SECONDS <= 0:
+            return
+        app.state.engine_reaper = asyncio.create_task(reap_idle_engines())
+
+    # ---------- Release tenant pools ----------
+    @app.on_event("shutdown")
+    async def dispose_tenant_engines():
+        from app.db.async_database import dispose_all_async
+
+        reaper = getattr(app.state, "engine_reaper", None)
+        if reaper is not None:
+            reaper.cancel()
+        tenant_engines.dispose_all()
+        await dispose_all_async()
+        logger.info("🔌 Tenant engines disposed.")
+        shutdown_hash_pool()
+
     # ---------- Error handler ----------
     @app.exception_handler(Exception)
     async def all_exceptions(request: Request, exc: Exception):
@@ -122,7 +223,28 @@ def build_app() -> FastAPI:
     def root():
         return {"message": "Joslasync backend is live"}
 
-    app.include_router(api_router)
+    # ---------- Prometheus metrics ----------
+    # Label values include every tenant's db_name: never served without a scrape token
+    if settings.METRICS_ENABLED and not settings.METRICS_TOKEN:
+        logger.warning("⚠️ METRICS_ENABLED but METRICS_TOKEN is empty; /metrics is not served")
+    elif settings.METRICS_ENABLED:
+
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics(request: Request):
+            if request.headers.get("Authorization") != f"Bearer {settings.METRICS_TOKEN}":
+                return PlainTextResponse("Unauthorized", status_code=401)
+            return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+    # ---------- API routers ----------
+    if settings.SERVERLESS:
+        # Import each router (and its schemas/models) on the first request that needs it
+        from app.api.routes import build_lazy_routes
+
+        app.router.routes.extend(build_lazy_routes())
+    else:
+        from app.api.routes import api_router
+
+        app.include_router(api_router)
     return app
 
 
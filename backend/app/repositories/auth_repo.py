@@ -1,8 +1,9 @@
 # app/repositories/auth_repo.py
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Tuple
 from app.core.logger import logger
 from app.db.models.user import User
+from app.db.models.master.company_profile import CompanyProfile as MasterCompanyProfile
 from app.schemas.auth import UserCreate
 
 class AuthRepository:
@@ -10,6 +11,17 @@ class AuthRepository:
         logger.debug(f"🔎 Fetch user by username: {username}")
         return db.query(User).filter(User.username == username).first()
 
+    def get_user_with_company(self, db: Session, username: str) -> Tuple[Optional[User], Optional[MasterCompanyProfile]]:
+        """User and its master company in one round trip (LEFT JOIN on company_id)."""
+        logger.debug(f"🔎 Fetch user + company by username: {username}")
+        row = (
+            db.query(User, MasterCompanyProfile)
+            .outerjoin(MasterCompanyProfile, MasterCompanyProfile.id == User.company_id)
+            .filter(User.username == username)
+            .first()
+        )
+        return (row[0], row[1]) if row else (None, None)
+
     def create_user(self, db: Session, user: UserCreate, hashed_password: str) -> User:
         logger.debug(f"📝 Create user: {user.username}")
         db_user = User(
@@ -21,6 +33,10 @@ class AuthRepository:
         )
         db.add(db_user)
         db.commit()
-        db.refresh(db_user)
         logger.debug(f"✅ User persisted: {db_user.id}")
         return db_user
+
+    def update_password_hash(self, db: Session, user: User, hashed_password: str) -> None:
+        logger.debug(f"🔐 Rehash password for user: {user.username}")
+        user.hashed_password = hashed_password
+        db.commit()
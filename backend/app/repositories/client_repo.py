@@ -1,25 +1,58 @@
 from uuid import UUID
-from sqlalchemy.orm import Session
-from typing import Optional, Tuple, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional, Sequence, Tuple, List
+from sqlalchemy import Row, Select
 
 from app.schemas.client import ClientCreate, ClientUpdate
 from app.db.models.tenant.client import Client
 from app.crud import client as crud_client
+from app.utils.pagination import Cursor
 
-class ClientRepository:
-    def list(self, db: Session, q: Optional[str], status: Optional[str], page: int, page_size: int):
-        return crud_client.list_clients(db, q, status, page, page_size)
+class AsyncClientRepository:
+    async def list(
+        self, db: AsyncSession, q: Optional[str], status: Optional[str], page: int, page_size: int,
+        cursor: Optional[Cursor] = None, fields: Optional[Sequence[str]] = None,
+    ):
+        return await crud_client.list_clients_async(db, q, status, page, page_size, cursor, fields)
 
-    def get(self, db: Session, client_id: UUID) -> Optional[Client]:
-        return crud_client.get_client(db, client_id)
+    async def count(self, db: AsyncSession, q: Optional[str], status: Optional[str]) -> int:
+        return await crud_client.count_clients_async(db, q, status)
 
-    def create(self, db: Session, payload: ClientCreate, created_by: str) -> Client:
-        return crud_client.create_client(db, payload, created_by)
+    async def estimate_total(self, db: AsyncSession) -> Optional[int]:
+        return await crud_client.estimate_client_rows_async(db)
 
-    def update(self, db: Session, db_obj: Client, payload: ClientUpdate) -> Client:
-        return crud_client.update_client(db, db_obj, payload)
+    async def keys(self, db: AsyncSession) -> List[Tuple]:
+        return await crud_client.list_client_keys_async(db)
 
-    def delete(self, db: Session, db_obj: Client) -> None:
-        crud_client.delete_client(db, db_obj)
+    async def get(self, db: AsyncSession, client_id: UUID) -> Optional[Client]:
+        return await crud_client.get_client_async(db, client_id)
 
-client_repo = ClientRepository()
+    async def get_fields(self, db: AsyncSession, client_id: UUID, fields: Sequence[str]) -> Optional[Row]:
+        return await crud_client.get_client_fields_async(db, client_id, fields)
+
+    async def create(self, db: AsyncSession, payload: ClientCreate, created_by: str) -> Client:
+        return await crud_client.create_client_async(db, payload, created_by)
+
+    async def update(self, db: AsyncSession, db_obj: Client, payload: ClientUpdate) -> Client:
+        return await crud_client.update_client_async(db, db_obj, payload)
+
+    async def delete(self, db: AsyncSession, db_obj: Client) -> None:
+        await crud_client.delete_client_async(db, db_obj)
+
+    async def bulk_update(
+        self, db: AsyncSession, ids: Optional[Sequence[UUID]], q: Optional[str], status: Optional[str], values: Dict,
+    ) -> List[Tuple]:
+        return await crud_client.bulk_update_clients_async(db, ids, q, status, values)
+
+    async def bulk_delete(
+        self, db: AsyncSession, ids: Optional[Sequence[UUID]], q: Optional[str], status: Optional[str],
+    ) -> List[UUID]:
+        return await crud_client.bulk_delete_clients_async(db, ids, q, status)
+
+    async def bulk_insert(self, db: AsyncSession, rows: List[dict]) -> int:
+        return await crud_client.bulk_insert_clients_async(db, rows)
+
+    def export_stmt(self, db: AsyncSession, q: Optional[str], status: Optional[str], columns: Sequence[str]) -> Select:
+        return crud_client.export_clients_stmt(db, q, status, columns)
+
+async_client_repo = AsyncClientRepository()
@@ -1,5 +1,7 @@
 # app/repositories/company_profile_repo.py
 from typing import Optional, Mapping, Any
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.logger import logger
@@ -23,7 +25,6 @@ class CompanyProfileRepository:
         master_profile = MasterCompanyProfile(company_name=company_name, db_name=db_name)
         db.add(master_profile)
         db.commit()
-        db.refresh(master_profile)
         logger.debug(f"✅ Master profile created: id={master_profile.id}, db_name={db_name}")
         return master_profile
 
@@ -36,19 +37,18 @@ class CompanyProfileRepository:
         return db.query(MasterCompanyProfile).filter(MasterCompanyProfile.company_name == company_name).first()
 
     # -------- Tenant DB --------
-    def get_tenant_profile(self, db: Session) -> Optional[TenantCompanyProfile]:
-        return db.query(TenantCompanyProfile).first()
+    async def get_tenant_profile_async(self, db: AsyncSession) -> Optional[TenantCompanyProfile]:
+        return await db.scalar(select(TenantCompanyProfile).limit(1))
 
     def create_tenant_profile(self, db: Session, model: TenantCompanyProfile) -> TenantCompanyProfile:
         db.add(model)
         db.commit()
-        db.refresh(model)
         logger.debug("✅ Tenant profile created")
         return model
 
-    def update_tenant_profile(
+    async def update_tenant_profile_async(
         self,
-        db: Session,
+        db: AsyncSession,
         existing: TenantCompanyProfile,
         fields: Mapping[str, Any],
     ) -> TenantCompanyProfile:
@@ -62,7 +62,6 @@ class CompanyProfileRepository:
                 continue
             if hasattr(existing, k):
                 setattr(existing, k, v)
-        db.commit()
-        db.refresh(existing)
+        await db.commit()
         logger.debug("📝 Tenant profile updated")
         return existing
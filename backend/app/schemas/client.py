@@ -1,7 +1,7 @@
 # app/schemas/client.py
 from typing import Optional, List, Literal
 from datetime import date, datetime
-from pydantic import BaseModel, Field, EmailStr, constr
+from pydantic import BaseModel, Field, EmailStr, constr, model_validator
 from uuid import UUID
 from app.constants.client import CLIENT_STATUSES
 
@@ -62,11 +62,58 @@ class ClientOut(ClientBase):
     class Config:
         from_attributes = True
 
+class ClientSuggestion(BaseModel):
+    id: UUID
+    name: str
+    email: str
+    status: StatusType
+
 class PageMeta(BaseModel):
     page: int
     page_size: int
-    total: int
+    # None on cursor pages (keep the total from the first page); may be up to
+    # CLIENT_COUNT_CACHE_TTL_SECONDS stale, or a planner estimate when total_estimated
+    total: Optional[int] = None
+    total_estimated: bool = False
+    # Opaque keyset cursors; pass back as ?cursor= (None when there is no such page)
+    next: Optional[str] = None
+    prev: Optional[str] = None
 
 class ClientListOut(BaseModel):
     data: List[ClientOut]
     meta: PageMeta
+
+class ClientFilter(BaseModel):
+    # GET /clients ?q= / ?status=, minus the typo-tolerant matches: q is a plain substring match
+    q: Optional[str] = None
+    status: Optional[str] = None
+
+# NOT NULL columns: a bulk update may change them but not set them to null
+_REQUIRED_CHANGES = ("name", "email", "phone", "status")
+
+
+class ClientBulkRequest(BaseModel):
+    """Exactly one of ids / filter selects the clients; changes is required for "update"."""
+    action: Literal["update", "delete"]
+    ids: Optional[List[UUID]] = Field(None, min_length=1)
+    filter: Optional[ClientFilter] = None
+    changes: Optional[ClientUpdate] = None
+
+    @model_validator(mode="after")
+    def _check_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("give either ids or filter")
+        if self.filter is not None and not ((self.filter.q or "").strip() or self.filter.status):
+            raise ValueError("filter needs q and/or status")
+        if self.action == "update" and not (self.changes and self.changes.model_fields_set):
+            raise ValueError("update needs at least one field in changes")
+        if self.changes is not None:
+            nulled = [f for f in _REQUIRED_CHANGES if f in self.changes.model_fields_set and getattr(self.changes, f) is None]
+            if nulled:
+                raise ValueError(f"changes cannot clear required fields: {', '.join(nulled)}")
+        return self
+
+class ClientBulkResult(BaseModel):
+    action: str
+    affected: int
+    ids: List[UUID]
@@ -1,6 +1,7 @@
 # app/schemas/company_settings.py
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, EmailStr, Field, validator
 
@@ -53,8 +54,8 @@ class CompanySettingsBase(BaseModel):
 
 class CompanySettingsOut(CompanySettingsBase):
     id: int
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
     class Config:
         orm_mode = True
@@ -2,18 +2,19 @@
 from datetime import datetime
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
 from app.core.logger import logger
 from app.schemas.auth import UserCreate, UserRead, LoginInput, LoginResponse
 from app.repositories.auth_repo import AuthRepository
-from app.repositories.company_profile_repo import CompanyProfileRepository
+from app.services.company_directory import CompanyEntry, company_directory
 from app.validators.auth_validator import (
     ensure_unique_username,
-    validate_credentials,
+    validate_credentials_async,
     require_refresh_cookie,
 )
 from app.utils.security import (
-    hash_password,
+    hash_password_async,
     build_token_payload,
     create_access_token,
     create_refresh_token,
@@ -27,22 +28,22 @@ from app.core.config import settings
 class AuthService:
     def __init__(self):
         self.auth_repo = AuthRepository()
-        self.company_repo = CompanyProfileRepository()
 
     # -------------------------
     # Registration
     # -------------------------
-    def register_user(self, user: UserCreate, db: Session) -> UserRead:
-        ensure_unique_username(db, user.username, self.auth_repo)
-        hashed = hash_password(user.password)
-        created = self.auth_repo.create_user(db, user, hashed)
+    async def register_user(self, user: UserCreate, db: Session) -> UserRead:
+        # Blocking master-DB calls go to the thread pool, bcrypt to the hashing pool
+        await run_in_threadpool(ensure_unique_username, db, user.username, self.auth_repo)
+        hashed = await hash_password_async(user.password)
+        created = await run_in_threadpool(self.auth_repo.create_user, db, user, hashed)
         logger.info(f"✅ User created in DB: {created.username}")
         return UserRead.model_validate(created)
 
     # -------------------------
     # Login
     # -------------------------
-    def login(self, payload: LoginInput, db: Session) -> tuple[LoginResponse, str]:
+    async def login(self, payload: LoginInput, db: Session) -> tuple[LoginResponse, str]:
         username = payload.username
         password = payload.password
 
@@ -76,31 +77,37 @@ class AuthService:
             )
             return resp, refresh
 
-        # DB user
-        user = self.auth_repo.get_user_by_username(db, username)
+        # DB user (blocking master-DB calls go to the thread pool, bcrypt to the hashing pool)
+        user, profile = await run_in_threadpool(self.auth_repo.get_user_with_company, db, username)
         if not user:
             logger.warning(f"❌ Invalid login attempt — user not found: {username}")
-        validate_credentials(user, password)
+        new_hash = await validate_credentials_async(user, password)
+        if new_hash:
+            # Stored hash used an outdated bcrypt cost factor: upgrade it transparently
+            await run_in_threadpool(self.auth_repo.update_password_hash, db, user, new_hash)
+            logger.info(f"🔐 Password rehashed with current cost factor for user: {username}")
 
         if not user.company_id:
             logger.error(f"❌ User not linked to a company: {username}")
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User not linked to a company")
 
-        company = self.company_repo.get_by_id(db, user.company_id)
-        if not company:
+        if not profile:
             logger.error(f"❌ Company profile not found for user: {username}")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company profile not found")
 
-        # Derive a slug if your master record doesn’t store it explicitly
-        company_slug = getattr(company, "slug", None) or company.company_name.lower().replace(" ", "_")
+        company = company_directory.put(profile)
+        resp, refresh = self._issue_tokens(user, company)
+        logger.info(f"✅ Tokens issued for user: {username} | db={company.db_name}")
+        return resp, refresh
 
+    def _issue_tokens(self, user, company: CompanyEntry) -> tuple[LoginResponse, str]:
         # Canonical claims (identity + tenant)
         claims = build_token_payload(
             user_id=str(user.id),
             username=user.username,
             role=getattr(user, "role", "user"),
             company_id=str(user.company_id),
-            company_slug=company_slug,
+            company_slug=company.slug,
             db_name=company.db_name,
             extra={"email": user.email},
         )
@@ -108,7 +115,6 @@ class AuthService:
         access = create_access_token(claims)
         refresh = create_refresh_token(claims)
 
-        logger.info(f"✅ Tokens issued for user: {username} | db={company.db_name}")
         resp = LoginResponse(
             access_token=access,
             refresh_token=refresh,
@@ -167,36 +173,23 @@ class AuthService:
             )
             return resp, new_refresh
 
-        # DB user refresh
-        user = self.auth_repo.get_user_by_username(db, username)
+        # DB user refresh: with the company already in the directory this is a
+        # single indexed user lookup; otherwise user + company come back joined.
+        company = company_directory.get(payload.get("company_id"))
+        if company is not None:
+            user = self.auth_repo.get_user_by_username(db, username)
+            if user is not None and user.company_id != company.id:
+                company = company_directory.lookup(db, user.company_id)
+        else:
+            user, profile = self.auth_repo.get_user_with_company(db, username)
+            company = company_directory.put(profile) if profile else None
         if not user:
             logger.warning(f"❌ Refresh failed — user not found: {username}")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-        company = self.company_repo.get_by_id(db, user.company_id) if user.company_id else None
         if not company:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company profile not found")
 
-        company_slug = getattr(company, "slug", None) or company.company_name.lower().replace(" ", "_")
-
-        # Rebuild claims (keeps tenant context)
-        claims = build_token_payload(
-            user_id=str(user.id),
-            username=user.username,
-            role=getattr(user, "role", "user"),
-            company_id=str(user.company_id),
-            company_slug=company_slug,
-            db_name=company.db_name,
-            extra={"email": user.email},
-        )
-
-        access = create_access_token(claims)
-        new_refresh = create_refresh_token(claims)
-
+        resp, new_refresh = self._issue_tokens(user, company)
         logger.info(f"🔁 Token refreshed for user: {username}")
-        resp = LoginResponse(
-            access_token=access,
-            refresh_token=new_refresh,
-            user=UserRead.model_validate(user),
-        )
         return resp, new_refresh
@@ -0,0 +1,49 @@
+# app/services/client_counts.py
+"""
+Total-count cache for the client list, keyed by (tenant, search, status).
+
+A filtered count(*) costs as much as the page query itself, and the UI asks
+for the same total on every page turn. Totals are cached for
+CLIENT_COUNT_CACHE_TTL_SECONDS and a tenant's entries are dropped whenever a
+client is created, updated or deleted in this process; other workers catch
+up within the TTL.
+"""
+from typing import Hashable, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+# (total, estimated)
+CountEntry = Tuple[int, bool]
+
+
+def _key(tenant: str, q: Optional[str], status: Optional[str]) -> Hashable:
+    return tenant, (q or "").strip().lower(), status or ""
+
+
+class ClientCountCache:
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+
+    def get(self, tenant: Optional[str], q: Optional[str], status: Optional[str]) -> Optional[CountEntry]:
+        if not tenant:
+            return None
+        return self._cache.get(_key(tenant, q, status))
+
+    def put(self, tenant: Optional[str], q: Optional[str], status: Optional[str], total: int, estimated: bool) -> None:
+        if tenant:
+            self._cache.set(_key(tenant, q, status), (total, estimated))
+
+    def invalidate(self, tenant: Optional[str]) -> int:
+        if not tenant:
+            return 0
+        return self._cache.invalidate_where(lambda k: k[0] == tenant)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+client_counts = ClientCountCache(
+    maxsize=settings.CLIENT_COUNT_CACHE_SIZE,
+    ttl_seconds=settings.CLIENT_COUNT_CACHE_TTL_SECONDS,
+)
@@ -1,59 +1,203 @@
 from uuid import UUID
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
+from app.core.config import settings
 from app.core.logger import logger
-from app.schemas.client import ClientCreate, ClientUpdate
+from app.schemas.client import ClientBulkRequest, ClientBulkResult, ClientCreate, ClientUpdate, PageMeta
 from app.validators.client_validator import validate_status
-from app.repositories.client_repo import client_repo
+from app.repositories.client_repo import async_client_repo
 from app.db.models.tenant.client import Client
+from app.services.client_counts import client_counts
+from app.services.client_suggest import ClientKey, client_suggestions
+from app.services.export_service import CLIENT_EXPORT_COLUMNS, stream_export
+from app.utils.pagination import Cursor, PageCursors, decode_cursor, page_cursors
 
-class ClientService:
-    def list(self, db: Session, q: Optional[str], status: Optional[str], page: int, page_size: int):
-        # Normalize and validate status for consistent querying
-        if status is not None:
-            status = status.strip().title()
-            validate_status(status)
-
-        logger.info(f"🔎 client_service.list | q={q} status={status} page={page} size={page_size}")
-        rows, total = client_repo.list(db, q, status, page, page_size)
-        logger.info(f"📊 client_service.list | total={total} returned={len(rows)}")
-        return rows, total
-
-    def get(self, db: Session, client_id: UUID) -> Client:
-        logger.info(f"🔎 client_service.get | id={client_id}")
-        obj = client_repo.get(db, client_id)
+def _normalize_status(status: Optional[str]) -> Optional[str]:
+    # Normalize and validate status for consistent querying / persisting
+    if status is None:
+        return None
+    normalized = status.strip().title()
+    validate_status(normalized)
+    return normalized
+
+def _is_search(q: Optional[str]) -> bool:
+    return bool(q and q.strip())
+
+def _parse_cursor(cursor: Optional[str], q: Optional[str]) -> Optional[Cursor]:
+    if not cursor:
+        return None
+    from fastapi import HTTPException, status as st
+    if _is_search(q):
+        # Search results are ranked by relevance, not (created_at, id): page them with ?page=
+        raise HTTPException(status_code=st.HTTP_400_BAD_REQUEST, detail="cursor cannot be combined with q")
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        logger.warning("⚠️ client_service.list | invalid cursor=%s", cursor[:64])
+        raise HTTPException(status_code=st.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def _use_estimate(estimate: Optional[int]) -> bool:
+    # Small tables count exactly; only large unfiltered lists take the planner's word for it
+    return estimate is not None and estimate >= settings.CLIENT_COUNT_ESTIMATE_MIN_ROWS
+
+def _page_meta(rows, has_more, position, page, page_size, total, estimated, searching) -> PageMeta:
+    cursors = PageCursors() if searching else page_cursors(rows, has_more, position, page)
+    return PageMeta(
+        page=page, page_size=page_size, total=total, total_estimated=estimated,
+        next=cursors.next, prev=cursors.prev,
+    )
+
+# Above this many rows a bulk write drops the tenant's typeahead index (rebuilt by one
+# narrow query on the next suggest) instead of patching it entry by entry
+_BULK_INDEX_PATCH_MAX = 500
+
+def _bulk_selection(req: ClientBulkRequest) -> Tuple[Optional[List[UUID]], Optional[str], Optional[str]]:
+    from fastapi import HTTPException, status as st
+    if req.ids is not None:
+        if len(req.ids) > settings.CLIENT_BULK_MAX_IDS:
+            raise HTTPException(
+                status_code=st.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"At most {settings.CLIENT_BULK_MAX_IDS} ids per request",
+            )
+        return list(dict.fromkeys(req.ids)), None, None
+    q = req.filter.q.strip() if req.filter.q and req.filter.q.strip() else None
+    return None, q, _normalize_status(req.filter.status)
+
+def _bulk_values(req: ClientBulkRequest) -> Dict:
+    values = req.changes.model_dump(exclude_unset=True)
+    if "status" in values:
+        values["status"] = _normalize_status(values["status"])
+    return values
+
+def _bulk_done(tenant: Optional[str], req: ClientBulkRequest, rows: Sequence) -> ClientBulkResult:
+    client_counts.invalidate(tenant)
+    if len(rows) > _BULK_INDEX_PATCH_MAX:
+        client_suggestions.invalidate(tenant)
+    elif req.action == "delete":
+        for client_id in rows:
+            client_suggestions.remove(tenant, client_id)
+    else:
+        for row in rows:
+            client_suggestions.upsert(tenant, row)
+    ids = list(rows) if req.action == "delete" else [row.id for row in rows]
+    logger.info("✅ client_service.bulk | tenant=%s action=%s affected=%s", tenant, req.action, len(ids))
+    return ClientBulkResult(action=req.action, affected=len(ids), ids=ids)
+
+def _not_found():
+    from fastapi import HTTPException, status as st
+    return HTTPException(status_code=st.HTTP_404_NOT_FOUND, detail="Client not found")
+
+class AsyncClientService:
+    """Client use cases on an AsyncSession (used by the async routes)."""
+
+    async def list(
+        self, db: AsyncSession, q: Optional[str], status: Optional[str], page: int, page_size: int,
+        cursor: Optional[str] = None, fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Row], PageMeta]:
+        status = _normalize_status(status)
+        position = _parse_cursor(cursor, q)
+
+        logger.info(
+            "🔎 client_service.list | q=%s status=%s page=%s size=%s cursor=%s",
+            q, status, page, page_size, position.direction if position else None,
+        )
+        rows, has_more = await async_client_repo.list(db, q, status, page, page_size, position, fields)
+        # Cursor pages don't need a total: the UI already has it from the first page
+        total, estimated = (None, False) if position else await self._total(db, q, status)
+        logger.info("📊 client_service.list | total=%s estimated=%s returned=%s", total, estimated, len(rows))
+        return rows, _page_meta(rows, has_more, position, page, page_size, total, estimated, _is_search(q))
+
+    async def _total(self, db: AsyncSession, q: Optional[str], status: Optional[str]) -> Tuple[int, bool]:
+        tenant = db.info.get("tenant")
+        cached = client_counts.get(tenant, q, status)
+        if cached is not None:
+            return cached
+        estimate = await async_client_repo.estimate_total(db) if not q and not status else None
+        if _use_estimate(estimate):
+            total, estimated = estimate, True
+        else:
+            total, estimated = await async_client_repo.count(db, q, status), False
+        client_counts.put(tenant, q, status, total, estimated)
+        return total, estimated
+
+    async def suggest(self, db: AsyncSession, prefix: str, limit: int) -> List[ClientKey]:
+        tenant = db.info.get("tenant")
+        index = client_suggestions.get(tenant)
+        if index is None:
+            generation = client_suggestions.generation(tenant) if tenant else 0
+            index = client_suggestions.store(tenant, await async_client_repo.keys(db), generation)
+            logger.info("🗂️ client_service.suggest | built prefix index tenant=%s clients=%s", tenant, len(index))
+        return index.search(prefix, limit)
+
+    def export(self, db: AsyncSession, q: Optional[str], status: Optional[str], fmt: str) -> AsyncIterator[bytes]:
+        status = _normalize_status(status)  # validated now, before the response starts
+        logger.info("📤 client_service.export | q=%s status=%s format=%s", q, status, fmt)
+        columns = [c.name for c in CLIENT_EXPORT_COLUMNS]
+        stmt = async_client_repo.export_stmt(db, q, status, columns)
+        return stream_export(db, stmt, CLIENT_EXPORT_COLUMNS, fmt, sheet="Clients")
+
+    async def get(self, db: AsyncSession, client_id: UUID) -> Client:
+        logger.info("🔎 client_service.get | id=%s", client_id)
+        obj = await async_client_repo.get(db, client_id)
         if not obj:
-            logger.warning(f"⚠️ client_service.get | not_found id={client_id}")
-            from fastapi import HTTPException, status as st
-            raise HTTPException(status_code=st.HTTP_404_NOT_FOUND, detail="Client not found")
+            logger.warning("⚠️ client_service.get | not_found id=%s", client_id)
+            raise _not_found()
         return obj
 
-    def create(self, db: Session, payload: ClientCreate, created_by: str) -> Client:
-        logger.info(f"🆕 client_service.create | name={payload.name} email={payload.email} by={created_by}")
-        obj = client_repo.create(db, payload, created_by)
-        logger.info(f"✅ client_service.create | id={obj.id}")
+    async def get_fields(self, db: AsyncSession, client_id: UUID, fields: Sequence[str]) -> Row:
+        logger.info("🔎 client_service.get_fields | id=%s fields=%s", client_id, ",".join(fields))
+        row = await async_client_repo.get_fields(db, client_id, fields)
+        if row is None:
+            logger.warning("⚠️ client_service.get_fields | not_found id=%s", client_id)
+            raise _not_found()
+        return row
+
+    async def create(self, db: AsyncSession, payload: ClientCreate, created_by: str) -> Client:
+        logger.info("🆕 client_service.create | name=%s email=%s by=%s", payload.name, payload.email, created_by)
+        obj = await async_client_repo.create(db, payload, created_by)
+        tenant = db.info.get("tenant")
+        client_counts.invalidate(tenant)
+        client_suggestions.upsert(tenant, obj)
+        logger.info("✅ client_service.create | id=%s", obj.id)
         return obj
 
-    def update(self, db: Session, client_id: UUID, payload: ClientUpdate) -> Client:
-        logger.info(f"✏️ client_service.update | id={client_id}")
+    async def update(self, db: AsyncSession, client_id: UUID, payload: ClientUpdate) -> Client:
+        logger.info("✏️ client_service.update | id=%s", client_id)
 
-        # Normalize and validate status before persisting
         if payload.status is not None:
-            logger.info(f"✏️ client_service.update | validate status={payload.status}")
-            normalized = payload.status.strip().title()
-            validate_status(normalized)
-            payload.status = normalized
-
-        obj = self.get(db, client_id)
-        obj = client_repo.update(db, obj, payload)
-        logger.info(f"✅ client_service.update | id={obj.id}")
+            logger.info("✏️ client_service.update | validate status=%s", payload.status)
+            payload.status = _normalize_status(payload.status)
+
+        obj = await self.get(db, client_id)
+        obj = await async_client_repo.update(db, obj, payload)
+        tenant = db.info.get("tenant")
+        client_counts.invalidate(tenant)
+        client_suggestions.upsert(tenant, obj)
+        logger.info("✅ client_service.update | id=%s", obj.id)
         return obj
 
-    def delete(self, db: Session, client_id: UUID) -> None:
-        logger.info(f"🗑️ client_service.delete | id={client_id}")
-        obj = self.get(db, client_id)
-        client_repo.delete(db, obj)
-        logger.info(f"✅ client_service.delete | id={client_id}")
+    async def delete(self, db: AsyncSession, client_id: UUID) -> None:
+        logger.info("🗑️ client_service.delete | id=%s", client_id)
+        obj = await self.get(db, client_id)
+        await async_client_repo.delete(db, obj)
+        tenant = db.info.get("tenant")
+        client_counts.invalidate(tenant)
+        client_suggestions.remove(tenant, client_id)
+        logger.info("✅ client_service.delete | id=%s", client_id)
+
+    async def bulk(self, db: AsyncSession, req: ClientBulkRequest) -> ClientBulkResult:
+        """One set-based UPDATE/DELETE ... RETURNING over the selected clients, one transaction."""
+        ids, q, status = _bulk_selection(req)
+        logger.info(
+            "🧺 client_service.bulk | action=%s ids=%s q=%s status=%s",
+            req.action, len(ids) if ids is not None else None, q, status,
+        )
+        if req.action == "delete":
+            rows = await async_client_repo.bulk_delete(db, ids, q, status)
+        else:
+            rows = await async_client_repo.bulk_update(db, ids, q, status, _bulk_values(req))
+        return _bulk_done(db.info.get("tenant"), req, rows)
 
-client_service = ClientService()
+async_client_service = AsyncClientService()
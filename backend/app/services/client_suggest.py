@@ -0,0 +1,151 @@
+# app/services/client_suggest.py
+"""
+Per-tenant in-process prefix index for the client picker (/clients/suggest).
+
+Each tenant's index is three sorted arrays of (key, id): full names, name
+words and emails, all lower-cased. A lookup is a bisect plus a short walk, so
+once built a suggestion never touches the database. Indexes are built lazily
+from a narrow (id, name, email, status) query, kept current by client_service
+writes in this process, and rebuilt after CLIENT_SUGGEST_TTL_SECONDS to pick
+up writes made by other workers.
+"""
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+
+# (id, name, email, status)
+ClientKey = Tuple[UUID, str, str, str]
+
+
+def _words(name: str) -> List[str]:
+    words = name.lower().split()
+    return words[1:] if len(words) > 1 else []  # the first word is already covered by the full name
+
+
+class ClientPrefixIndex:
+    def __init__(self, rows: Iterable[ClientKey] = ()):
+        self._lock = threading.Lock()
+        self._clients: Dict[UUID, ClientKey] = {}
+        self._names: List[Tuple[str, UUID]] = []
+        self._words: List[Tuple[str, UUID]] = []
+        self._emails: List[Tuple[str, UUID]] = []
+        for row in rows:
+            self._add(row, sort=False)
+        self._names.sort()
+        self._words.sort()
+        self._emails.sort()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _entries(self, row: ClientKey):
+        client_id, name, email, _ = row
+        yield self._names, (name.lower(), client_id)
+        for word in _words(name):
+            yield self._words, (word, client_id)
+        yield self._emails, ((email or "").lower(), client_id)
+
+    def _add(self, row: ClientKey, sort: bool = True) -> None:
+        self._clients[row[0]] = row
+        for array, entry in self._entries(row):
+            if sort:
+                insort(array, entry)
+            else:
+                array.append(entry)
+
+    def _discard(self, client_id: UUID) -> None:
+        row = self._clients.pop(client_id, None)
+        if row is None:
+            return
+        for array, entry in self._entries(row):
+            i = bisect_left(array, entry)
+            if i < len(array) and array[i] == entry:
+                del array[i]
+
+    def upsert(self, row: ClientKey) -> None:
+        with self._lock:
+            self._discard(row[0])
+            self._add(row)
+
+    def remove(self, client_id: UUID) -> None:
+        with self._lock:
+            self._discard(client_id)
+
+    def search(self, prefix: str, limit: int) -> List[ClientKey]:
+        """Name-prefix matches first, then name-word matches, then email matches."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        found: List[ClientKey] = []
+        seen = set()
+        with self._lock:
+            for array in (self._names, self._words, self._emails):
+                i = bisect_left(array, (prefix,))
+                while i < len(array) and len(found) < limit:
+                    key, client_id = array[i]
+                    if not key.startswith(prefix):
+                        break
+                    if client_id not in seen:
+                        seen.add(client_id)
+                        found.append(self._clients[client_id])
+                    i += 1
+                if len(found) >= limit:
+                    break
+        return found
+
+
+class ClientSuggestRegistry:
+    """Tenant -> ClientPrefixIndex, LRU/TTL bounded."""
+
+    def __init__(self, max_tenants: int, ttl_seconds: float):
+        self._indexes = TTLCache(maxsize=max_tenants, ttl_seconds=ttl_seconds)
+        # Bumped on every write so a build that raced a write isn't stored stale
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, tenant: Optional[str]) -> Optional[ClientPrefixIndex]:
+        return self._indexes.get(tenant) if tenant else None
+
+    def generation(self, tenant: str) -> int:
+        with self._lock:
+            return self._generations.get(tenant, 0)
+
+    def store(self, tenant: Optional[str], rows: Iterable[ClientKey], generation: int) -> ClientPrefixIndex:
+        index = ClientPrefixIndex(rows)
+        if tenant and self.generation(tenant) == generation:
+            self._indexes.set(tenant, index)
+        return index
+
+    def _bump(self, tenant: str) -> Optional[ClientPrefixIndex]:
+        with self._lock:
+            self._generations[tenant] = self._generations.get(tenant, 0) + 1
+        return self._indexes.get(tenant)
+
+    def upsert(self, tenant: Optional[str], obj) -> None:
+        if not tenant:
+            return
+        index = self._bump(tenant)
+        if index is not None:
+            index.upsert((obj.id, obj.name, obj.email, obj.status))
+
+    def remove(self, tenant: Optional[str], client_id: UUID) -> None:
+        if not tenant:
+            return
+        index = self._bump(tenant)
+        if index is not None:
+            index.remove(client_id)
+
+    def invalidate(self, tenant: Optional[str]) -> None:
+        if tenant:
+            self._bump(tenant)
+            self._indexes.pop(tenant)
+
+
+client_suggestions = ClientSuggestRegistry(
+    max_tenants=settings.CLIENT_SUGGEST_MAX_TENANTS,
+    ttl_seconds=settings.CLIENT_SUGGEST_TTL_SECONDS,
+)
@@ -0,0 +1,92 @@
+# app/services/company_directory.py
+"""
+In-process directory of master company records: company id -> (db_name, slug).
+
+Login, refresh and /auth/me only need these two fields, so they're served
+from a TTL cache instead of a master-DB round trip. Entries are refreshed on
+every miss and dropped explicitly when a company profile is created or updated.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.repositories.company_profile_repo import CompanyProfileRepository
+from app.utils.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class CompanyEntry:
+    id: int
+    company_name: str
+    db_name: str
+    slug: str
+
+    @classmethod
+    def from_profile(cls, profile) -> "CompanyEntry":
+        # Derive a slug if the master record doesn’t store it explicitly
+        slug = getattr(profile, "slug", None) or profile.company_name.lower().replace(" ", "_")
+        return cls(id=profile.id, company_name=profile.company_name, db_name=profile.db_name, slug=slug)
+
+
+class CompanyDirectory:
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self._ids_by_db: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.repo = CompanyProfileRepository()
+
+    def get(self, company_id) -> Optional[CompanyEntry]:
+        """Cached entry only (no DB access)."""
+        if company_id in (None, ""):
+            return None
+        try:
+            return self._cache.get(int(company_id))
+        except (TypeError, ValueError):
+            return None
+
+    def put(self, profile) -> CompanyEntry:
+        entry = profile if isinstance(profile, CompanyEntry) else CompanyEntry.from_profile(profile)
+        self._cache.set(entry.id, entry)
+        with self._lock:
+            self._ids_by_db[entry.db_name] = entry.id
+        return entry
+
+    def lookup(self, db: Session, company_id) -> Optional[CompanyEntry]:
+        """Cached entry, falling back to the master DB on a miss."""
+        entry = self.get(company_id)
+        if entry is not None or company_id in (None, ""):
+            return entry
+        profile = self.repo.get_by_id(db, int(company_id))
+        if not profile:
+            return None
+        logger.debug(f"📇 Company directory miss: id={company_id} -> {profile.db_name}")
+        return self.put(profile)
+
+    def invalidate(self, company_id: Optional[int] = None, db_name: Optional[str] = None) -> None:
+        """Drop a company by id and/or tenant db_name (call after create/update)."""
+        with self._lock:
+            if db_name is not None:
+                mapped = self._ids_by_db.pop(db_name, None)
+                company_id = company_id if company_id is not None else mapped
+            if company_id is not None:
+                for name, cid in list(self._ids_by_db.items()):
+                    if cid == company_id:
+                        del self._ids_by_db[name]
+        if company_id is not None:
+            self._cache.pop(int(company_id))
+            logger.debug(f"📇 Company directory invalidated: id={company_id}")
+
+    def clear(self) -> None:
+        self._cache.clear()
+        with self._lock:
+            self._ids_by_db.clear()
+
+
+company_directory = CompanyDirectory(
+    maxsize=settings.COMPANY_DIRECTORY_SIZE,
+    ttl_seconds=settings.COMPANY_DIRECTORY_TTL_SECONDS,
+)
@@ -1,11 +1,13 @@
 # app/services/company_profile_service.py
 from typing import Optional, Dict, Any
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 
 from app.core.logger import logger
-from app.db.database import BaseTenant, get_tenant_session, ensure_tenant_tables
+from app.db.database import get_tenant_session, ensure_tenant_tables
 from app.db.models.user import User
 from app.db.models.tenant.company_profile import CompanyProfile as TenantCompanyProfile
 from app.schemas.company_profile import CompanyProfileOut
@@ -13,18 +15,19 @@ from app.validators.company_profile_validator import validate_fields
 from app.repositories.company_profile_repo import CompanyProfileRepository
 from app.utils.file_utils import save_logo_file
 from app.utils.db_utils import create_company_database
-from app.utils.security import hash_password
+from app.utils.security import hash_password_async
 
 # Ensure tenant tables are registered (module import to populate metadata)
 from app.db.models.tenant import company_settings as _company_settings  # noqa: F401
 from app.services.company_settings_service import get_or_create_settings
+from app.services.company_directory import company_directory
 
 
 class CompanyProfileService:
     def __init__(self):
         self.repo = CompanyProfileRepository()
 
-    def register(
+    async def register(
         self,
         master_db: Session,
         company_name: str,
@@ -42,13 +45,69 @@ class CompanyProfileService:
         admin_password: str,
         status: str,
     ) -> CompanyProfileOut:
+        # Blocking DB/file work runs on the thread pool, bcrypt on the hashing pool
+        await run_in_threadpool(
+            self._check_new_company,
+            master_db, company_name, company_email, company_mobile, city, zip_code, tax_rate, logo_file,
+        )
+        hashed_password = await hash_password_async(admin_password)
+        return await run_in_threadpool(
+            self._provision,
+            master_db=master_db,
+            company_name=company_name,
+            company_email=company_email,
+            company_mobile=company_mobile,
+            logo_file=logo_file,
+            address1=address1,
+            address2=address2,
+            city=city,
+            state=state,
+            zip_code=zip_code,
+            tax_rate=tax_rate,
+            admin_username=admin_username,
+            admin_email=admin_email,
+            hashed_password=hashed_password,
+            status=status,
+        )
+
+    def _check_new_company(
+        self,
+        master_db: Session,
+        company_name: str,
+        company_email: str,
+        company_mobile: str,
+        city: str,
+        zip_code: str,
+        tax_rate: float,
+        logo_file,
+    ) -> None:
         # 1) Guard: unique in master
         if self.repo.master_exists_by_name(master_db, company_name):
             logger.warning("Company already exists in master.")
             raise HTTPException(status_code=400, detail="Company already exists.")
 
-        # 2) Validate + save logo
+        # 2) Validate
         validate_fields(company_email, company_mobile, city, zip_code, tax_rate, logo_file)
+
+    def _provision(
+        self,
+        master_db: Session,
+        company_name: str,
+        company_email: str,
+        company_mobile: str,
+        logo_file,
+        address1: str,
+        address2: str,
+        city: str,
+        state: str,
+        zip_code: str,
+        tax_rate: float,
+        admin_username: str,
+        admin_email: str,
+        hashed_password: str,
+        status: str,
+    ) -> CompanyProfileOut:
+        # 2b) Save logo
         logo_url = save_logo_file(logo_file)
 
         # 3) Create tenant DB (physical)
@@ -61,9 +120,9 @@ class CompanyProfileService:
 
         # 4) Persist master record (links name -> db_name, returns master profile)
         master_profile = self.repo.create_master_profile(master_db, company_name, db_name)
+        company_directory.invalidate(company_id=master_profile.id, db_name=db_name)
 
         # 5) Create admin user (master scope)
-        hashed_password = hash_password(admin_password)
         admin_user = User(
             username=admin_username,
             email=admin_email,
@@ -86,9 +145,6 @@ class CompanyProfileService:
         tenant_db = TenantSessionLocal()
 
         try:
-            # Redundant safety: ensure metadata is bound (ok if tables already exist)
-            BaseTenant.metadata.create_all(bind=tenant_db.get_bind())
-
             # 7) Insert tenant profile row
             tenant_profile = self.repo.create_tenant_profile(
                 tenant_db,
@@ -122,9 +178,9 @@ class CompanyProfileService:
         finally:
             tenant_db.close()
 
-    def update(
+    async def update(
         self,
-        tenant_db: Session,
+        tenant_db: AsyncSession,
         company_name: Optional[str] = None,
         company_email: Optional[str] = None,
         company_mobile: Optional[str] = None,
@@ -137,7 +193,7 @@ class CompanyProfileService:
         tax_rate: Optional[float] = None,
         status: Optional[str] = None,
     ) -> CompanyProfileOut:
-        existing = self.repo.get_tenant_profile(tenant_db)
+        existing = await self.repo.get_tenant_profile_async(tenant_db)
         if not existing:
             logger.warning("No profile found to update.")
             raise HTTPException(status_code=404, detail="No profile exists. Use register endpoint.")
@@ -155,7 +211,7 @@ class CompanyProfileService:
 
         logo_url = existing.logo_url
         if logo_file is not None:
-            logo_url = save_logo_file(logo_file)
+            logo_url = await run_in_threadpool(save_logo_file, logo_file)
 
         fields: Dict[str, Any] = {
             **({"company_name": company_name} if company_name is not None else {}),
@@ -171,12 +227,13 @@ class CompanyProfileService:
             **({"status": status} if status is not None else {}),
         }
 
-        updated = self.repo.update_tenant_profile(tenant_db, existing, fields)
+        updated = await self.repo.update_tenant_profile_async(tenant_db, existing, fields)
+        company_directory.invalidate(db_name=updated.db_name)
         logger.info(f"Company profile updated for '{updated.company_name}'.")
         return CompanyProfileOut.model_validate(updated, from_attributes=True)
 
-    def get(self, tenant_db: Session) -> CompanyProfileOut:
-        profile = self.repo.get_tenant_profile(tenant_db)
+    async def get(self, tenant_db: AsyncSession) -> CompanyProfileOut:
+        profile = await self.repo.get_tenant_profile_async(tenant_db)
         if not profile:
             logger.warning("Company profile not found.")
             raise HTTPException(status_code=404, detail="Company profile not found.")
@@ -1,6 +1,10 @@
 # app/services/company_settings_service.py
 from __future__ import annotations
 
+from typing import Any, Dict, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db.models.tenant.company_settings import CompanySettings
@@ -50,17 +54,11 @@ For questions or concerns, contact us at: info@{legal_name.lower().replace(' ',
 """.strip()
 
 
-def get_or_create_settings(db: Session) -> CompanySettings:
-    # Return existing
-    settings = db.query(CompanySettings).first()
-    if settings:
-        return settings
-
+def _seed_settings(profile) -> CompanySettings:
     # Seed from tenant CompanyProfile
-    profile = db.query(CompanyProfile).first()
     legal_name = (profile.company_name if profile and profile.company_name else "Your Company")
 
-    settings = CompanySettings(
+    return CompanySettings(
         # Identity / branding
         legal_name=legal_name,
         addr1=(profile.address1 if profile else None),
@@ -94,9 +92,16 @@ def get_or_create_settings(db: Session) -> CompanySettings:
         show_watermark=False,
     )
 
+
+def get_or_create_settings(db: Session) -> CompanySettings:
+    # Return existing
+    settings = db.query(CompanySettings).first()
+    if settings:
+        return settings
+
+    settings = _seed_settings(db.query(CompanyProfile).first())
     db.add(settings)
     db.commit()
-    db.refresh(settings)
     return settings
 
 
@@ -104,8 +109,37 @@ def update_settings(db: Session, data: CompanySettingsUpdate) -> CompanySettings
     settings = get_or_create_settings(db)
     for field, value in data.dict(exclude_unset=True).items():
         setattr(settings, field, value)
-    settings.touch()
+    # updated_at is bumped by the column's onupdate
     db.add(settings)
     db.commit()
-    db.refresh(settings)
     return settings
+
+
+# -------- Async (AsyncSession) --------
+async def get_or_create_settings_async(db: AsyncSession) -> CompanySettings:
+    settings = await db.scalar(select(CompanySettings).limit(1))
+    if settings:
+        return settings
+
+    settings = _seed_settings(await db.scalar(select(CompanyProfile).limit(1)))
+    db.add(settings)
+    await db.commit()
+    return settings
+
+
+async def update_settings_async(db: AsyncSession, data: CompanySettingsUpdate) -> CompanySettings:
+    settings = await get_or_create_settings_async(db)
+    for field, value in data.dict(exclude_unset=True).items():
+        setattr(settings, field, value)
+    db.add(settings)
+    await db.commit()
+    return settings
+
+
+async def get_settings_fields_async(db: AsyncSession, fields: Sequence[str]) -> Dict[str, Any]:
+    """Sparse read: only the requested columns (e.g. skip the multi-KB terms_template)."""
+    row = (await db.execute(select(*(getattr(CompanySettings, f) for f in fields)).limit(1))).first()
+    if row is not None:
+        return row._asdict()
+    settings = await get_or_create_settings_async(db)  # first read seeds the row
+    return {f: getattr(settings, f) for f in fields}
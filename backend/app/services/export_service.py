@@ -0,0 +1,280 @@
+# app/services/export_service.py
+"""
+Streaming exports (CSV, NDJSON, XLSX) of tenant tables.
+
+Rows come off a server-side cursor (AsyncSession.stream + yield_per) as
+plain column tuples and each batch is encoded and yielded before the next
+is fetched, so memory is flat in the number of rows. CSV and XLSX follow the
+tenant's CompanySettings.date_format / number_format. NDJSON is for machines
+and stays ISO dates and plain numbers. Text cells that a spreadsheet would
+evaluate as a formula are neutralised: a leading apostrophe in CSV, the
+quotePrefix style in XLSX.
+"""
+import codecs
+import csv
+import io
+import json
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.crud.invoice import export_invoices_stmt
+from app.db.models.tenant.company_settings import CompanySettings
+from app.utils.xlsx_stream import FORMULA_PREFIXES, XlsxStreamWriter
+
+EXPORT_FORMATS = ("csv", "ndjson", "xlsx")
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    name: str
+    kind: str = "text"  # text | int | number | date | datetime | json
+
+
+CLIENT_EXPORT_COLUMNS = (
+    ExportColumn("id"),
+    ExportColumn("name"),
+    ExportColumn("email"),
+    ExportColumn("phone"),
+    ExportColumn("company"),
+    ExportColumn("status"),
+    ExportColumn("joined_date", "date"),
+    ExportColumn("address_line1"),
+    ExportColumn("address_line2"),
+    ExportColumn("city"),
+    ExportColumn("state"),
+    ExportColumn("postal_code"),
+    ExportColumn("country"),
+    ExportColumn("tax_id"),
+    ExportColumn("default_currency"),
+    ExportColumn("default_tax_rate", "number"),
+    ExportColumn("payment_terms"),
+    ExportColumn("discount_rate", "number"),
+    ExportColumn("notes"),
+    ExportColumn("created_by"),
+    ExportColumn("created_at", "datetime"),
+    ExportColumn("updated_at", "datetime"),
+)
+
+INVOICE_EXPORT_COLUMNS = (
+    ExportColumn("id", "int"),
+    ExportColumn("client_name"),
+    ExportColumn("invoice_title"),
+    ExportColumn("invoice_date", "date"),
+    ExportColumn("status"),
+    ExportColumn("line_items", "json"),
+    ExportColumn("discount", "number"),
+    ExportColumn("tax", "number"),
+    ExportColumn("total", "number"),
+    ExportColumn("notes"),
+)
+
+
+# -------- Tenant formats --------
+_DATE_TOKENS = re.compile(r"YYYY|YY|MMMM|MMM|MM|DD|M|D")
+_STRFTIME = {"YYYY": "%Y", "YY": "%y", "MMMM": "%B", "MMM": "%b", "MM": "%m", "DD": "%d", "M": "%m", "D": "%d"}
+_EXCEL_DATE = {"YYYY": "yyyy", "YY": "yy", "MMMM": "mmmm", "MMM": "mmm", "MM": "mm", "DD": "dd", "M": "m", "D": "d"}
+# "1,234.56" style samples: grouping separator (optional), decimal separator + places (optional)
+_NUMBER_SAMPLE = re.compile(r"^1(?P<group>[^0-9]?)234(?:(?P<dec>[^0-9])(?P<frac>[0-9]+))?$")
+
+
+def _convert_date_format(fmt: str, table: Dict[str, str], literal) -> str:
+    out, pos = [], 0
+    for m in _DATE_TOKENS.finditer(fmt):
+        out.append(literal(fmt[pos:m.start()]))
+        out.append(table[m.group()])
+        pos = m.end()
+    out.append(literal(fmt[pos:]))
+    return "".join(out)
+
+
+@dataclass(frozen=True)
+class TenantFormats:
+    strftime_date: str = "%m/%d/%Y"
+    excel_date: str = "mm/dd/yyyy"
+    group_sep: str = ","
+    decimal_sep: str = "."
+    decimals: int = 2
+
+    @classmethod
+    def from_settings(cls, date_format: Optional[str], number_format: Optional[str]) -> "TenantFormats":
+        kwargs: Dict[str, Any] = {}
+        if date_format and _DATE_TOKENS.search(date_format):
+            kwargs["strftime_date"] = _convert_date_format(date_format, _STRFTIME, lambda s: s.replace("%", "%%"))
+            kwargs["excel_date"] = _convert_date_format(
+                date_format, _EXCEL_DATE, lambda s: "".join(f"\\{c}" if c.isalpha() else c for c in s)
+            )
+        m = _NUMBER_SAMPLE.match((number_format or "").strip())
+        if m:
+            kwargs["group_sep"] = m.group("group") or ""
+            kwargs["decimal_sep"] = m.group("dec") or "."
+            kwargs["decimals"] = len(m.group("frac") or "")
+        return cls(**kwargs)
+
+    @property
+    def excel_number(self) -> str:
+        whole = "#,##0" if self.group_sep else "0"
+        return whole + ("." + "0" * self.decimals if self.decimals else "")
+
+    def date(self, value) -> str:
+        return value.strftime(self.strftime_date)
+
+    def datetime(self, value: datetime) -> str:
+        return value.strftime(self.strftime_date + " %H:%M")
+
+    def number(self, value) -> str:
+        text = f"{abs(float(value)):,.{self.decimals}f}"
+        text = text.replace(",", "\0").replace(".", self.decimal_sep).replace("\0", self.group_sep)
+        return "-" + text if value < 0 else text
+
+
+async def load_formats(db: AsyncSession) -> TenantFormats:
+    row = (await db.execute(select(CompanySettings.date_format, CompanySettings.number_format).limit(1))).first()
+    return TenantFormats.from_settings(*row) if row else TenantFormats()
+
+
+# -------- Encoders --------
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+class _CsvEncoder:
+    def __init__(self, columns: Sequence[ExportColumn], formats: TenantFormats, sheet: str):
+        self.columns = columns
+        self.formats = formats
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+
+    def _flush(self) -> bytes:
+        data = self._buf.getvalue().encode()
+        self._buf.seek(0)
+        self._buf.truncate()
+        return data
+
+    def _value(self, value, kind: str):
+        if value is None:
+            return ""
+        if kind == "date":
+            return self.formats.date(value)
+        if kind == "datetime":
+            return self.formats.datetime(value)
+        if kind == "number":
+            return self.formats.number(value)
+        if kind == "json":
+            return json.dumps(value, default=_json_default)
+        if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+            return "'" + value  # CSV injection: keep =HYPERLINK(...) etc. as text
+        return value
+
+    def begin(self) -> bytes:
+        self._writer.writerow([c.name for c in self.columns])
+        return codecs.BOM_UTF8 + self._flush()  # BOM so Excel opens it as UTF-8
+
+    def rows(self, batch) -> bytes:
+        kinds = [c.kind for c in self.columns]
+        self._writer.writerows([self._value(v, k) for v, k in zip(row, kinds)] for row in batch)
+        return self._flush()
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class _NdjsonEncoder:
+    def __init__(self, columns: Sequence[ExportColumn], formats: TenantFormats, sheet: str):
+        self.names = [c.name for c in columns]
+
+    def begin(self) -> bytes:
+        return b""
+
+    def rows(self, batch) -> bytes:
+        return "".join(
+            json.dumps(dict(zip(self.names, row)), default=_json_default) + "\n" for row in batch
+        ).encode()
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class _XlsxEncoder:
+    def __init__(self, columns: Sequence[ExportColumn], formats: TenantFormats, sheet: str):
+        self.json_idx = [i for i, c in enumerate(columns) if c.kind == "json"]
+        self.writer = XlsxStreamWriter(
+            [c.name for c in columns],
+            ["text" if c.kind == "json" else c.kind for c in columns],
+            sheet_name=sheet,
+            date_format=formats.excel_date,
+            datetime_format=formats.excel_date + " hh:mm",
+            number_format=formats.excel_number,
+        )
+
+    def begin(self) -> bytes:
+        return self.writer.begin()
+
+    def rows(self, batch) -> bytes:
+        if self.json_idx:
+            batch = [self._with_json(row) for row in batch]
+        return self.writer.write_rows(batch)
+
+    def _with_json(self, row) -> List[Any]:
+        row = list(row)
+        for i in self.json_idx:
+            if row[i] is not None:
+                row[i] = json.dumps(row[i], default=_json_default)
+        return row
+
+    def finish(self) -> bytes:
+        return self.writer.finish()
+
+
+_ENCODERS = {"csv": _CsvEncoder, "ndjson": _NdjsonEncoder, "xlsx": _XlsxEncoder}
+
+
+def export_filename(entity: str, fmt: str) -> str:
+    return f"{entity}-{date.today().isoformat()}.{fmt}"
+
+
+async def stream_export(
+    db: AsyncSession,
+    stmt: Select,
+    columns: Sequence[ExportColumn],
+    fmt: str,
+    sheet: str,
+) -> AsyncIterator[bytes]:
+    """Encode `stmt` (selecting exactly `columns`, in order) batch by batch."""
+    formats = await load_formats(db)
+    encoder = _ENCODERS[fmt](columns, formats, sheet)
+    yield encoder.begin()
+    rows = 0
+    # yield_per: server-side cursor on asyncpg, fetched in fixed-size partitions
+    result = await db.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+    async for batch in result.partitions():
+        rows += len(batch)
+        chunk = encoder.rows(batch)
+        if chunk:
+            yield chunk
+    tail = encoder.finish()
+    if tail:
+        yield tail
+    logger.info("📤 export | tenant=%s sheet=%s format=%s rows=%s", db.info.get("tenant"), sheet, fmt, rows)
+
+
+def export_invoices(db: AsyncSession, fmt: str, status: Optional[str] = None) -> AsyncIterator[bytes]:
+    stmt = export_invoices_stmt([c.name for c in INVOICE_EXPORT_COLUMNS], status)
+    return stream_export(db, stmt, INVOICE_EXPORT_COLUMNS, fmt, sheet="Invoices")
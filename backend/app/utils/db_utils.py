@@ -1,9 +1,14 @@
 # app/utils/db_utils.py
 import sqlalchemy
 from app.core.logger import logger
-from app.db.database import master_engine
+from app.db.database import master_engine, is_schema_tenancy, create_tenant_schema
 
 def create_company_database(db_name: str):
+    if is_schema_tenancy():
+        # Schema tenancy: a schema in the shared tenant DB (fails if it already exists, like CREATE DATABASE)
+        create_tenant_schema(db_name, if_not_exists=False)
+        return
+
     with master_engine.connect() as conn:
         conn.execution_options(isolation_level="AUTOCOMMIT").execute(
             sqlalchemy.text(f'CREATE DATABASE "{db_name}"')
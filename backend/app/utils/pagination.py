@@ -0,0 +1,66 @@
+# app/utils/pagination.py
+"""
+Opaque keyset cursors for (created_at, id)-ordered lists.
+
+A cursor is the sort key of a boundary row plus the direction to read from it,
+as url-safe base64 JSON. Clients must treat it as opaque; a tampered cursor
+only moves the window, it can't widen the query.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal, Optional
+from uuid import UUID
+
+Direction = Literal["next", "prev"]
+
+
+@dataclass(frozen=True)
+class Cursor:
+    created_at: datetime
+    id: UUID
+    direction: Direction = "next"
+
+
+@dataclass
+class PageCursors:
+    next: Optional[str] = None
+    prev: Optional[str] = None
+
+
+def encode_cursor(created_at: datetime, id: UUID, direction: Direction) -> str:
+    raw = json.dumps({"c": created_at.isoformat(), "i": str(id), "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Raises ValueError for anything that isn't a cursor we issued."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+        direction = data["d"]
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return Cursor(datetime.fromisoformat(data["c"]), UUID(data["i"]), direction)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError, ValueError) as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+def page_cursors(rows, has_more: bool, cursor: Optional[Cursor], page: int = 1) -> PageCursors:
+    """
+    Cursors for the page just read. `has_more` means another row exists in the
+    direction of travel (the query fetched page_size + 1).
+    """
+    if not rows:
+        return PageCursors()
+    if cursor is not None and cursor.direction == "prev":
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, cursor is not None or page > 1
+    first, last = rows[0], rows[-1]
+    return PageCursors(
+        next=encode_cursor(last.created_at, last.id, "next") if has_next else None,
+        prev=encode_cursor(first.created_at, first.id, "prev") if has_prev else None,
+    )
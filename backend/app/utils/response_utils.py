@@ -1,8 +1,20 @@
 # app/utils/response_utils.py
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict
+from uuid import UUID
+
 from fastapi import Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from app.core.config import settings
 from app.core.logger import logger
 
+try:
+    import orjson
+except ImportError:  # optional speedup; FastJSONResponse falls back to the stdlib encoder
+    orjson = None
+
 def set_refresh_cookie(response: Response, token: str) -> None:
     response.set_cookie(
         key=settings.REFRESH_COOKIE_NAME,
@@ -13,3 +25,51 @@ def set_refresh_cookie(response: Response, token: str) -> None:
         secure=settings.COOKIE_SECURE,
     )
     logger.debug("🍪 Refresh cookie set")
+
+
+def attachment_headers(filename: str) -> Dict[str, str]:
+    return {"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"}
+
+
+async def ndjson_lines(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for event in events:
+        yield (json.dumps(event, default=str) + "\n").encode()
+
+
+class UploadStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for endpoints that keep reading the request body while
+    they stream (e.g. import progress). The stock class, on ASGI servers older
+    than spec 2.4, runs a disconnect listener that would consume the request
+    body messages the endpoint is still reading.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _json_default(value: Any):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    For handlers that return plain, already-shaped data (dicts of DB values):
+    encodes with orjson, which handles UUID/datetime natively, in one C pass.
+    Returning a Response also means FastAPI skips response_model validation,
+    so only use it where the data is trusted to match the declared model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            # OPT_UTC_Z: UTC datetimes as "...Z", same as pydantic's encoding
+            return orjson.dumps(content, default=_json_default, option=orjson.OPT_UTC_Z)
+        return json.dumps(content, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode()
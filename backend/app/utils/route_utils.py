@@ -0,0 +1,21 @@
+# app/utils/route_utils.py
+from typing import Optional
+
+from starlette.types import Scope
+
+
+def route_template(scope: Scope) -> Optional[str]:
+    """
+    Matched path template (e.g. "/api/clients/{client_id}") once routing has run,
+    so metrics/log labels don't explode with ids. Returns None for unmatched paths.
+    """
+    # Newer FastAPI keeps included routes relative and records the full path here
+    ctx = scope.get("effective_route_context")
+    path = getattr(ctx, "path_format", None)
+    if path:
+        return path
+    if scope.get("route") is None:
+        return None
+    # Otherwise rebuild it from the concrete path and the extracted path params
+    by_value = {str(v): k for k, v in (scope.get("path_params") or {}).items()}
+    return "/".join("{%s}" % by_value[seg] if seg in by_value else seg for seg in scope["path"].split("/"))
@@ -1,26 +1,111 @@
 # app/utils/security.py
+import asyncio
+import hashlib
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 import jwt
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
 
 from app.core.config import settings
 from app.core.logger import logger
+from app.core.metrics import PASSWORD_HASH_TIME
+from app.utils.cache import TTLCache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=4)
+def get_pwd_context(rounds: Optional[int] = None):
+    """
+    bcrypt CryptContext pinned to one cost factor. Hashes made with any other
+    cost report needs_update, which drives rehash-on-login.
+    passlib (and its bcrypt backend) load on first use, keeping them off the cold-start path.
+    """
+    from passlib.context import CryptContext
+
+    rounds = rounds or settings.BCRYPT_ROUNDS
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
 
 
 # -------------------------
 # Password helpers
 # -------------------------
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str, rounds: Optional[int] = None) -> Tuple[bool, Optional[str]]:
+    """(matches, replacement hash when the stored one uses an outdated cost factor)."""
+    return get_pwd_context(rounds).verify_and_update(plain_password, hashed_password)
+
+
+def _hash_with_rounds(password: str, rounds: int) -> str:
+    return get_pwd_context(rounds).hash(password)
+
+
+# bcrypt is deliberately slow; run it on a bounded process pool so it neither
+# blocks the event loop nor holds AnyIO worker threads. PASSWORD_HASH_WORKERS=0
+# (default in serverless, where multiprocessing is unavailable) uses the thread pool.
+_hash_pool: Optional[Executor] = None
+_hash_pool_lock = threading.Lock()
+
+
+def _get_hash_pool() -> Optional[Executor]:
+    global _hash_pool
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    if _hash_pool is None:
+        with _hash_pool_lock:
+            if _hash_pool is None:
+                _hash_pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                logger.info(f"🔐 Password hashing pool started ({settings.PASSWORD_HASH_WORKERS} workers)")
+    return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=False, cancel_futures=True)
+            _hash_pool = None
+
+
+async def _run_hashing(op: str, fn, *args):
+    pool = _get_hash_pool()
+    started = time.perf_counter()
+    try:
+        if pool is None:
+            from fastapi.concurrency import run_in_threadpool
+
+            return await run_in_threadpool(fn, *args)
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+    finally:
+        PASSWORD_HASH_TIME.observe(time.perf_counter() - started, op=op)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing("hash", _hash_with_rounds, password, settings.BCRYPT_ROUNDS)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await _run_hashing("verify", verify_and_update_password, plain_password, hashed_password, settings.BCRYPT_ROUNDS)
 
 
 # -------------------------
@@ -103,6 +188,31 @@ def decode_access_token(token: str) -> dict:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid access token")
 
 
+# Verified access tokens: sha256(token) -> claims, expiring at the token's own `exp`
+_verified_tokens = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl_seconds=settings.TOKEN_CACHE_MAX_TTL_SECONDS)
+
+
+def verify_access_token_cached(token: str) -> dict:
+    """
+    Verify an access token, memoizing successful verifications so repeat calls
+    with the same token skip the HMAC and JSON parsing.
+    Raises jwt.ExpiredSignatureError / jwt.PyJWTError like jwt.decode; failures are never cached.
+    The returned dict is shared between callers — treat it as read-only.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    claims = _verified_tokens.get(key)
+    if claims is not None:
+        return claims
+
+    claims = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+    ttl = float(settings.TOKEN_CACHE_MAX_TTL_SECONDS)
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = min(ttl, exp - time.time())
+    _verified_tokens.set(key, claims, ttl=ttl)
+    return claims
+
+
 def decode_refresh_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.REFRESH_SECRET, algorithms=[settings.JWT_ALGORITHM])
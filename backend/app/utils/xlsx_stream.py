@@ -0,0 +1,214 @@
+# app/utils/xlsx_stream.py
+"""
+Minimal streaming XLSX writer (one worksheet, no dependencies).
+
+The workbook is a zip written to an in-memory sink that the caller drains
+after every call, so an export of any size holds only the rows of the current
+batch plus zlib's window. zipfile falls back to data descriptors on an
+unseekable sink, which is what lets the sheet be written before its size is
+known. Strings are stored inline (no shared-strings table to keep around);
+dates and numbers are real typed cells with the tenant's display formats.
+Text that a spreadsheet would read as a formula (leading = + - @) gets the
+quotePrefix style, Excel's "typed with a leading apostrophe" flag, so it stays
+text when the cell is edited or the sheet is re-saved as CSV.
+"""
+import re
+import zipfile
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, List, Sequence
+from xml.sax.saxutils import escape
+
+_EPOCH = datetime(1899, 12, 30)
+_INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# cellXfs indexes in _styles()
+STYLE_DEFAULT, STYLE_DATE, STYLE_DATETIME, STYLE_NUMBER, STYLE_HEADER, STYLE_QUOTED = range(6)
+
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    "</Types>"
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    "</Relationships>"
+)
+
+
+def _workbook(sheet_name: str) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{escape(sheet_name[:31], {chr(34): "&quot;"})}" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    )
+
+
+def _styles(date_format: str, datetime_format: str, number_format: str) -> str:
+    q = {'"': "&quot;"}
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<numFmts count="3">'
+        f'<numFmt numFmtId="164" formatCode="{escape(date_format, q)}"/>'
+        f'<numFmt numFmtId="165" formatCode="{escape(datetime_format, q)}"/>'
+        f'<numFmt numFmtId="166" formatCode="{escape(number_format, q)}"/>'
+        "</numFmts>"
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="6">'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="166" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0" quotePrefix="1"/>'
+        "</cellXfs>"
+        "</styleSheet>"
+    )
+
+
+class _Sink:
+    """Write-only, unseekable file object; drain() hands back what was written since last time."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._pos = 0
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+def _text_cell(value: str, style: int = STYLE_DEFAULT) -> str:
+    s = f' s="{style}"' if style else ""
+    return f'<c t="inlineStr"{s}><is><t xml:space="preserve">{escape(_INVALID_XML.sub("", value))}</t></is></c>'
+
+
+def _serial(value: Any) -> float:
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        delta = value - _EPOCH
+        return delta.days + delta.seconds / 86400 + delta.microseconds / 86_400_000_000
+    return float((value - _EPOCH.date()).days)
+
+
+class XlsxStreamWriter:
+    """
+    kinds per column: "text" | "int" | "number" | "date" | "datetime".
+    begin() / write_rows() / finish() each return the next bytes of the file.
+    """
+
+    def __init__(
+        self,
+        headers: Sequence[str],
+        kinds: Sequence[str],
+        sheet_name: str = "Sheet1",
+        date_format: str = "yyyy-mm-dd",
+        datetime_format: str = "yyyy-mm-dd hh:mm",
+        number_format: str = "#,##0.00",
+    ):
+        self.headers = list(headers)
+        self.kinds = list(kinds)
+        self._sink = _Sink()
+        self._zip = zipfile.ZipFile(self._sink, "w", compression=zipfile.ZIP_DEFLATED)
+        self._static_parts = {
+            "[Content_Types].xml": _CONTENT_TYPES,
+            "_rels/.rels": _ROOT_RELS,
+            "xl/workbook.xml": _workbook(sheet_name),
+            "xl/_rels/workbook.xml.rels": _WORKBOOK_RELS,
+            "xl/styles.xml": _styles(date_format, datetime_format, number_format),
+        }
+        self._sheet = None
+        self._row = 0
+
+    def begin(self) -> bytes:
+        for name, xml in self._static_parts.items():
+            self._zip.writestr(name, xml)
+        # force_zip64: the sheet's final size is unknown while streaming
+        self._sheet = self._zip.open("xl/worksheets/sheet1.xml", "w", force_zip64=True)
+        self._sheet.write(
+            b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            b'<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" state="frozen"/>'
+            b"</sheetView></sheetViews><sheetData>"
+        )
+        self._write([self.headers], header=True)
+        return self._sink.drain()
+
+    def _cell(self, value: Any, kind: str) -> str:
+        if value is None:
+            return "<c/>"
+        if kind == "date" and isinstance(value, (date, datetime)):
+            return f'<c s="{STYLE_DATE}"><v>{_serial(value)}</v></c>'
+        if kind == "datetime" and isinstance(value, datetime):
+            return f'<c s="{STYLE_DATETIME}"><v>{_serial(value)}</v></c>'
+        if kind in ("number", "int") and isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+            style = f' s="{STYLE_NUMBER}"' if kind == "number" else ""
+            return f"<c{style}><v>{value}</v></c>"
+        text = str(value)
+        return _text_cell(text, STYLE_QUOTED if text.startswith(FORMULA_PREFIXES) else STYLE_DEFAULT)
+
+    def _write(self, rows, header: bool = False) -> None:
+        out = []
+        for row in rows:
+            self._row += 1
+            if header:
+                cells = "".join(_text_cell(str(v), STYLE_HEADER) for v in row)
+            else:
+                cells = "".join(self._cell(v, k) for v, k in zip(row, self.kinds))
+            out.append(f'<row r="{self._row}">{cells}</row>')
+        self._sheet.write("".join(out).encode())
+
+    def write_rows(self, rows) -> bytes:
+        self._write(rows)
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._sheet.write(b"</sheetData></worksheet>")
+        self._sheet.close()
+        self._zip.close()
+        return self._sink.drain()
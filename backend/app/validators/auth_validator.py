@@ -1,7 +1,9 @@
 # app/validators/auth_validator.py
 from fastapi import HTTPException, status
 from app.core.logger import logger
-from app.utils.security import verify_password
+from typing import Optional
+
+from app.utils.security import verify_and_update_password_async, verify_password
 
 def ensure_unique_username(db, username: str, auth_repo) -> None:
     if auth_repo.get_user_by_username(db, username):
@@ -13,6 +15,18 @@ def validate_credentials(user, plain_password: str) -> None:
         logger.warning("❌ Invalid credentials")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+async def validate_credentials_async(user, plain_password: str) -> Optional[str]:
+    """
+    Async validate_credentials: bcrypt runs on the hashing pool, not the event loop.
+    Returns a replacement hash when the stored one uses an outdated cost factor.
+    """
+    if user:
+        ok, new_hash = await verify_and_update_password_async(plain_password, user.hashed_password)
+        if ok:
+            return new_hash
+    logger.warning("❌ Invalid credentials")
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
 def require_refresh_cookie(token_str: str) -> None:
     if not token_str:
         logger.warning("⚠️ No refresh token in cookies")
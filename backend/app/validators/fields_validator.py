@@ -0,0 +1,25 @@
+# app/validators/fields_validator.py
+from typing import Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from app.core.logger import logger
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str], always: Sequence[str] = ("id",)) -> Optional[Tuple[str, ...]]:
+    """
+    Sparse fieldset from `?fields=name,email`: the requested attributes plus
+    `always`, in schema (`allowed`) order. None (no/empty parameter) means
+    every field. Unknown names are a 422.
+    """
+    if fields is None:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    if not requested:
+        return None
+    unknown = sorted(requested.difference(allowed))
+    if unknown:
+        logger.warning(f"⚠️ Unknown fields requested: {unknown}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown fields {unknown}; allowed: {list(allowed)}",
+        )
+    requested.update(always)
+    return tuple(f for f in allowed if f in requested)
@@ -0,0 +1,111 @@
+# benchmarks/async_vs_sync.py
+"""
+Compare the sync (thread-pool) and async (asyncpg) tenant DB paths under the
+same concurrent load, running the client list queries (page + total count)
+through app.crud.client's sync and async functions.
+
+Usage (from backend/, with .env pointing at a reachable Postgres):
+    python -m benchmarks.async_vs_sync --tenant acme_db --concurrency 200 --requests 2000
+
+The sync path runs exactly like a sync FastAPI handler does: each call goes
+through AnyIO's default thread limiter (40 tokens unless --threads is given).
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+import anyio
+from anyio import to_thread
+
+from app.db.async_database import dispose_all_async, get_async_tenant_session
+from app.db.database import get_tenant_session, tenant_engines
+from app.db.tenant_schema import ensure_tenant_schema
+from app.crud import client as crud_client
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _summary(name: str, latencies: List[float], wall: float) -> Dict:
+    return {
+        "path": name,
+        "requests": len(latencies),
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+    }
+
+
+async def _drive(call: Callable[[], Awaitable[None]], total: int, concurrency: int) -> List[float]:
+    latencies: List[float] = []
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def run(tenant: str, total: int, concurrency: int, page_size: int, threads: int) -> List[Dict]:
+    ensure_tenant_schema(tenant)
+    if threads:
+        to_thread.current_default_thread_limiter().total_tokens = threads
+
+    SyncSession = get_tenant_session(tenant)
+    AsyncSessionLocal = get_async_tenant_session(tenant)
+
+    def sync_once():
+        with SyncSession() as db:
+            crud_client.list_clients(db, None, None, 1, page_size)
+            crud_client.count_clients(db, None, None)
+
+    async def sync_call():
+        await to_thread.run_sync(sync_once)
+
+    async def async_call():
+        async with AsyncSessionLocal() as db:
+            await crud_client.list_clients_async(db, None, None, 1, page_size)
+            await crud_client.count_clients_async(db, None, None)
+
+    results = []
+    for name, call in (("sync", sync_call), ("async", async_call)):
+        await _drive(call, min(concurrency, total), concurrency)  # warm pools
+        start = time.perf_counter()
+        latencies = await _drive(call, total, concurrency)
+        results.append(_summary(name, latencies, time.perf_counter() - start))
+
+    await dispose_all_async()
+    tenant_engines.dispose_all()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenant", required=True, help="tenant db_name (must already be provisioned)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=0, help="override AnyIO's thread limiter (default 40)")
+    args = parser.parse_args()
+
+    results = anyio.run(run, args.tenant, args.requests, args.concurrency, args.page_size, args.threads)
+    print(json.dumps({"benchmark": "async_vs_sync", "tenant": args.tenant, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# benchmarks/list_serialization.py
+"""
+CPU per GET /api/clients page: the previous ORM + pydantic path against the
+current column-tuple + FastJSONResponse path, on the same rows.
+
+  before : select(Client) -> ORM objects -> ClientOut.model_validate per row
+           -> ClientListOut -> FastAPI response_model validate + serialize_json
+  after  : crud list (ClientOut's columns as Row tuples) -> dicts
+           -> FastJSONResponse (orjson; stdlib json if orjson is missing)
+
+Runs in-process on an in-memory SQLite database, so it measures the
+application side only (DB round trip excluded, hydration included). Both
+bodies are decoded and compared before timing.
+
+Usage (from backend/):
+    python -m benchmarks.list_serialization --page-size 100 --iterations 2000
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Dict
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.routes.clients import router
+from app.crud import client as crud_client
+from app.db.models.tenant.client import Client
+from app.schemas.client import ClientListOut, ClientOut, PageMeta
+from app.utils.response_utils import FastJSONResponse, orjson
+
+
+def _seed(db, rows: int, seed: int) -> None:
+    rnd = random.Random(seed)
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    db.execute(insert(Client), [
+        {
+            "id": uuid.UUID(int=rnd.getrandbits(128)),
+            "name": f"Client {i}",
+            "email": f"client{i}@example.com",
+            "phone": f"+1555{i:07d}",
+            "company": f"Company {i % 97}",
+            "notes": "Prefers email" if i % 3 else None,
+            "joined_date": date(2023, 1, 1) + timedelta(days=i % 365),
+            "city": "Springfield",
+            "country": "US",
+            "default_currency": "USD",
+            "default_tax_rate": Decimal("7.25"),
+            "discount_rate": Decimal("2.50") if i % 5 == 0 else None,
+            "payment_terms": "Net 30",
+            "status": "Active",
+            "created_by": "bench",
+            "created_at": base + timedelta(minutes=i),
+            "updated_at": base + timedelta(minutes=i),
+        }
+        for i in range(rows)
+    ])
+    db.commit()
+
+
+def _list_route_field():
+    route = next(r for r in router.routes if r.path == "/clients" and "GET" in r.methods)
+    return route.response_field
+
+
+def _before(db, page_size: int, meta: PageMeta) -> bytes:
+    field = _list_route_field()
+    stmt = crud_client._page_stmt(crud_client._filtered_stmt(None, None), 1, page_size)
+    rows = db.execute(stmt).scalars().all()[:page_size]
+    content = ClientListOut(data=[ClientOut.model_validate(r) for r in rows], meta=meta)
+    value, errors = field.validate(content, {}, loc=("response",))
+    assert not errors
+    return field.serialize_json(value)
+
+
+def _after(db, page_size: int, meta: PageMeta) -> bytes:
+    rows, _ = crud_client.list_clients(db, None, None, 1, page_size)
+    return FastJSONResponse({"data": [r._asdict() for r in rows], "meta": meta.model_dump()}).body
+
+
+def _time(fn: Callable[[], bytes], iterations: int) -> Dict:
+    for _ in range(min(50, iterations)):
+        fn()
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    return {
+        "cpu_ms_per_request": round(cpu / iterations * 1000, 3),
+        "wall_ms_per_request": round(wall / iterations * 1000, 3),
+        "requests_per_cpu_second": round(iterations / cpu, 1) if cpu else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=1000, help="rows in the table")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Client.__table__.create(engine)
+    # expire_on_commit=False, as the tenant sessions are configured
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    _seed(db, max(args.rows, args.page_size), args.seed)
+    meta = PageMeta(page=1, page_size=args.page_size, total=args.rows)
+
+    def before() -> bytes:
+        out = _before(db, args.page_size, meta)
+        db.expunge_all()  # a fresh request session: no identity map carried over
+        return out
+
+    def after() -> bytes:
+        return _after(db, args.page_size, meta)
+
+    old_body, new_body = before(), after()
+    if json.loads(old_body) != json.loads(new_body):
+        raise SystemExit("response bodies differ")
+
+    results = {
+        "page_size": args.page_size,
+        "iterations": args.iterations,
+        "encoder": "orjson" if orjson is not None else "json",
+        "response_bytes": {"before": len(old_body), "after": len(new_body)},
+        "before": _time(before, args.iterations),
+        "after": _time(after, args.iterations),
+    }
+    results["cpu_speedup"] = round(
+        results["before"]["cpu_ms_per_request"] / results["after"]["cpu_ms_per_request"], 2
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+# benchmarks/load_test.py
+"""
+End-to-end load test: real app, real Postgres, mixed tenant traffic.
+
+1. Postgres: a throwaway local cluster (initdb/pg_ctl in a temp dir, no
+   container) unless --database-url points at an existing server the run may
+   create databases on.
+2. App: uvicorn subprocess running app.main:app against that server.
+3. Tenants: N companies provisioned through the real POST /api/company-profile flow.
+4. Traffic: fixed concurrency of virtual users, each logged in as a tenant
+   admin, picking operations from a weighted mix for --duration seconds.
+
+Emits JSON (throughput + p50/p95/p99 per endpoint, plus git commit) so runs
+can be diffed across commits.
+
+Usage (from backend/; needs httpx from requirements-dev.txt):
+    python -m benchmarks.load_test --tenants 5 --concurrency 32 --duration 60
+    python -m benchmarks.load_test --database-url postgresql+psycopg2://postgres:pw@localhost:5432/postgres
+    python -m benchmarks.load_test --mix "clients_list=50,settings_get=50" --output results/list.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MIX = {
+    "login": 5,
+    "refresh": 10,
+    "clients_list": 25,
+    "clients_search": 15,
+    "clients_create": 10,
+    "clients_update": 10,
+    "settings_get": 15,
+    "settings_put": 10,
+}
+
+# 1x1 transparent PNG for the company logo upload
+_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c63000100000500010d0a2db40000000049454e44ae426082"
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, int(round(pct * (len(ordered) - 1))))]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except Exception:
+        return None
+
+
+def parse_mix(raw: Optional[str]) -> Dict[str, int]:
+    if not raw:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in raw.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise SystemExit(f"unknown operation in --mix: {name!r} (choose from {', '.join(DEFAULT_MIX)})")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+# -------------------------
+# Postgres
+# -------------------------
+@contextmanager
+def local_postgres(pg_bin: Optional[str]) -> Iterator[str]:
+    """Throwaway cluster in a temp dir; yields a SQLAlchemy URL to its `postgres` DB."""
+    initdb = shutil.which("initdb", path=pg_bin) if pg_bin else shutil.which("initdb")
+    if not initdb:
+        raise SystemExit("initdb not found: install PostgreSQL server binaries, pass --pg-bin, or use --database-url")
+    bindir = os.path.dirname(initdb)
+    tmp = tempfile.mkdtemp(prefix="joslasync-pg-")
+    data = os.path.join(tmp, "data")
+    port = _free_port()
+    subprocess.run([initdb, "-D", data, "-U", "bench", "--auth=trust", "-E", "UTF8"], check=True, capture_output=True)
+    subprocess.run(
+        [
+            os.path.join(bindir, "pg_ctl"), "-D", data, "-l", os.path.join(tmp, "pg.log"), "-w", "start",
+            "-o", f"-p {port} -k {tmp} -c listen_addresses=127.0.0.1 -c max_connections=500 -c fsync=off",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    try:
+        yield f"postgresql+psycopg2://bench@127.0.0.1:{port}/postgres"
+    finally:
+        subprocess.run([os.path.join(bindir, "pg_ctl"), "-D", data, "-m", "immediate", "stop"], capture_output=True)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+# -------------------------
+# App server
+# -------------------------
+@contextmanager
+def app_server(database_url: str, workers: int, extra_env: Dict[str, str]) -> Iterator[str]:
+    port = _free_port()
+    env = dict(os.environ)
+    env.update(
+        DATABASE_URL=database_url,
+        JWT_SECRET=env.get("JWT_SECRET", "bench-secret"),
+        REFRESH_SECRET=env.get("REFRESH_SECRET", "bench-refresh-secret"),
+        MASTER_USERNAME=env.get("MASTER_USERNAME", "bench-master"),
+        MASTER_PASSWORD=env.get("MASTER_PASSWORD", uuid.uuid4().hex),
+        SERVERLESS="false",
+    )
+    env.update(extra_env)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_ready(base_url, proc)
+        yield base_url
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def _wait_ready(base_url: str, proc: subprocess.Popen, timeout: float = 60) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"app exited during startup (code {proc.returncode})")
+        try:
+            if httpx.get(base_url + "/", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise SystemExit("app did not become ready in time")
+
+
+# -------------------------
+# Tenants
+# -------------------------
+async def provision_tenants(client, count: int, run_id: str) -> List[Dict[str, str]]:
+    tenants = []
+    for i in range(count):
+        username = f"bench_{run_id}_{i}"
+        password = uuid.uuid4().hex
+        form = {
+            "company_name": f"Bench {run_id} {i}",
+            "company_email": f"{username}@example.com",
+            "company_mobile": "5551234567",
+            "address1": "1 Bench Street",
+            "address2": "Suite 1",
+            "city": "Springfield",
+            "state": "IL",
+            "zip_code": "62701",
+            "tax_rate": "7.5",
+            "admin_username": username,
+            "admin_email": f"admin.{username}@example.com",
+            "admin_password": password,
+        }
+        files = {"logoFile": (f"{username}.png", _PNG, "image/png")}
+        r = await client.post("/api/company-profile", data=form, files=files, timeout=120)
+        if r.status_code != 200:
+            raise SystemExit(f"provisioning tenant {i} failed: {r.status_code} {r.text[:300]}")
+        tenants.append({"username": username, "password": password, "db_name": r.json().get("db_name")})
+    return tenants
+
+
+# -------------------------
+# Virtual users
+# -------------------------
+class VirtualUser:
+    def __init__(self, client, tenant: Dict[str, str]):
+        self.client = client
+        self.tenant = tenant
+        self.access_token: Optional[str] = None
+        self.client_ids: List[str] = []
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+    def _keep_token(self, r) -> None:
+        if r.status_code == 200:
+            self.access_token = r.json()["access_token"]
+
+    async def login(self):
+        r = await self.client.post(
+            "/api/auth/login", json={"username": self.tenant["username"], "password": self.tenant["password"]}
+        )
+        self._keep_token(r)
+        return r
+
+    async def refresh(self):
+        r = await self.client.post("/api/auth/refresh")
+        self._keep_token(r)
+        return r
+
+    async def clients_list(self):
+        r = await self.client.get("/api/clients", params={"page": 1, "page_size": 20}, headers=self.headers)
+        if r.status_code == 200 and not self.client_ids:
+            self.client_ids = [row["id"] for row in r.json()["data"]]
+        return r
+
+    async def clients_search(self):
+        q = random.choice(["acme", "bench", "corp", "a", "test", "inc"])
+        return await self.client.get("/api/clients", params={"q": q, "page_size": 20}, headers=self.headers)
+
+    async def clients_create(self):
+        n = uuid.uuid4().hex[:10]
+        r = await self.client.post(
+            "/api/clients",
+            json={
+                "name": f"Bench Client {n}",
+                "email": f"client.{n}@example.com",
+                "phone": "5550001111",
+                "company": random.choice(["Acme Corp", "Bench Inc", "Test LLC"]),
+                "city": "Springfield",
+                "country": "US",
+            },
+            headers=self.headers,
+        )
+        if r.status_code in (200, 201):
+            self.client_ids.append(r.json()["id"])
+        return r
+
+    async def clients_update(self):
+        if not self.client_ids:
+            return await self.clients_create()
+        client_id = random.choice(self.client_ids)
+        return await self.client.put(
+            f"/api/clients/{client_id}",
+            json={"notes": f"updated {time.time():.0f}", "status": random.choice(["Active", "Deactivated"])},
+            headers=self.headers,
+        )
+
+    async def settings_get(self):
+        return await self.client.get("/api/company/settings", headers=self.headers)
+
+    async def settings_put(self):
+        return await self.client.put(
+            "/api/company/settings",
+            data={"footer_text_other": f"bench {uuid.uuid4().hex[:8]}", "show_watermark": random.choice(["true", "false"])},
+            headers=self.headers,
+        )
+
+
+async def run_traffic(base_url: str, tenants: List[Dict], mix: Dict[str, int], concurrency: int, duration: float) -> Dict:
+    import httpx
+
+    ops, weights = zip(*[(k, v) for k, v in mix.items() if v > 0])
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    status_codes: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency)
+
+    async def user_loop(idx: int, deadline: float):
+        async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+            user = VirtualUser(client, tenants[idx % len(tenants)])
+            r = await user.login()
+            if r.status_code != 200:
+                errors["login"] += 1
+                return
+            while time.monotonic() < deadline:
+                op = random.choices(ops, weights)[0]
+                started = time.perf_counter()
+                try:
+                    r = await getattr(user, op)()
+                    code = r.status_code
+                except httpx.HTTPError:
+                    code = 0
+                latencies[op].append((time.perf_counter() - started) * 1000)
+                status_codes[op][code] += 1
+                if not 200 <= code < 300:
+                    errors[op] += 1
+
+    started = time.perf_counter()
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(user_loop(i, deadline) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for op in ops:
+        samples = latencies.get(op) or []
+        endpoints[op] = {
+            "requests": len(samples),
+            "errors": errors.get(op, 0),
+            "rps": round(len(samples) / elapsed, 2),
+            "status_codes": {str(k): v for k, v in sorted(status_codes[op].items())},
+        }
+        if samples:
+            endpoints[op].update(
+                p50_ms=round(statistics.median(samples), 2),
+                p95_ms=round(_percentile(samples, 0.95), 2),
+                p99_ms=round(_percentile(samples, 0.99), 2),
+                max_ms=round(max(samples), 2),
+            )
+    total = sum(len(v) for v in latencies.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "errors": sum(errors.values()),
+        "rps": round(total / elapsed, 2),
+        "endpoints": endpoints,
+    }
+
+
+async def _provision_and_run(base_url: str, args, mix: Dict[str, int]) -> Dict:
+    import httpx
+
+    run_id = uuid.uuid4().hex[:6]
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        started = time.perf_counter()
+        tenants = await provision_tenants(client, args.tenants, run_id)
+        provision_s = time.perf_counter() - started
+    result = await run_traffic(base_url, tenants, mix, args.concurrency, args.duration)
+    result["provisioning"] = {"tenants": len(tenants), "seconds": round(provision_s, 2)}
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="existing Postgres (master DB URL); default: throwaway local cluster")
+    parser.add_argument("--pg-bin", help="directory holding initdb/pg_ctl")
+    parser.add_argument("--tenants", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="seconds of traffic")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--mix", help='weights, e.g. "login=5,clients_list=50" (default: %s)' % DEFAULT_MIX)
+    parser.add_argument("--env", action="append", default=[], help="extra KEY=VALUE for the app process")
+    parser.add_argument("--output", help="also write the JSON result here")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    extra_env = dict(item.split("=", 1) for item in args.env)
+
+    @contextmanager
+    def database() -> Iterator[str]:
+        if args.database_url:
+            yield args.database_url
+        else:
+            with local_postgres(args.pg_bin) as url:
+                yield url
+
+    with database() as url, app_server(url, args.workers, extra_env) as base_url:
+        result = asyncio.run(_provision_and_run(base_url, args, mix))
+
+    result = {
+        "benchmark": "load_test",
+        "commit": _git_commit(),
+        "config": {
+            "tenants": args.tenants,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "workers": args.workers,
+            "mix": mix,
+            "database": "external" if args.database_url else "local",
+        },
+        **result,
+    }
+    out = json.dumps(result, indent=2)
+    print(out)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as fh:
+            fh.write(out + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/login_throughput.py
+"""
+Login throughput benchmark (logins/sec and logins/sec per core).
+
+Two modes:
+  - HTTP (default): drive POST /api/auth/login on a running server with a
+    fixed number of concurrent clients.
+  - --hash-only: no server/DB; run bcrypt verification through the same
+    hashing pool the login path uses, to isolate the password-check cost.
+
+Usage (from backend/; HTTP mode needs httpx from requirements-dev.txt):
+    python -m benchmarks.login_throughput --url http://localhost:8000 --username alice --password secret
+    python -m benchmarks.login_throughput --hash-only --rounds 12 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, int(round(pct * (len(ordered) - 1))))]
+
+
+async def _drive(call: Callable[[], Awaitable[bool]], total: int, concurrency: int) -> Dict:
+    latencies: List[float] = []
+    failures = 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, failures
+        while remaining > 0:
+            remaining -= 1
+            t = time.perf_counter()
+            ok = await call()
+            latencies.append((time.perf_counter() - t) * 1000)
+            failures += 0 if ok else 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "failures": failures,
+        "elapsed_s": round(elapsed, 3),
+        "logins_per_s": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(_percentile(latencies, 0.95), 2),
+        "p99_ms": round(_percentile(latencies, 0.99), 2),
+    }
+
+
+async def run_http(args) -> Dict:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=30) as client:
+        body = {"username": args.username, "password": args.password}
+
+        async def call() -> bool:
+            r = await client.post("/api/auth/login", json=body)
+            return r.status_code == 200
+
+        return await _drive(call, args.requests, args.concurrency)
+
+
+async def run_hash_only(args) -> Dict:
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    from app.utils.security import hash_password, shutdown_hash_pool, verify_and_update_password_async
+
+    hashed = hash_password(args.password)
+
+    async def call() -> bool:
+        ok, _ = await verify_and_update_password_async(args.password, hashed)
+        return ok
+
+    try:
+        await call()  # spin up the pool outside the timed window
+        return await _drive(call, args.requests, args.concurrency)
+    finally:
+        shutdown_hash_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--username", default=os.getenv("BENCH_USERNAME", "bench"))
+    parser.add_argument("--password", default=os.getenv("BENCH_PASSWORD", "bench-password"))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--cores", type=int, default=os.cpu_count() or 1, help="cores available to the server")
+    parser.add_argument("--hash-only", action="store_true", help="benchmark bcrypt via the hashing pool, no server")
+    parser.add_argument("--rounds", type=int, default=int(os.getenv("BCRYPT_ROUNDS", "12")))
+    args = parser.parse_args()
+
+    result = asyncio.run(run_hash_only(args) if args.hash_only else run_http(args))
+    result.update(
+        benchmark="login_throughput",
+        mode="hash_only" if args.hash_only else "http",
+        concurrency=args.concurrency,
+        cores=args.cores,
+        logins_per_s_per_core=round(result["logins_per_s"] / max(args.cores, 1), 2),
+    )
+    if args.hash_only:
+        result["bcrypt_rounds"] = args.rounds
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
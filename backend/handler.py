@@ -1,4 +1,6 @@
 from mangum import Mangum
 from app.main import app
 
-handler = Mangum(app)
+# lifespan="off": Mangum would otherwise run the startup/shutdown hooks around every
+# invocation (master DDL on each call, tenant pools torn down after each call).
+handler = Mangum(app, lifespan="off")
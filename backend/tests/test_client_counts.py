@@ -0,0 +1,48 @@
+# tests/test_client_counts.py
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.repositories.client_repo import async_client_repo
+from app.schemas.client import ClientCreate
+from app.services.client_counts import ClientCountCache, client_counts
+from app.services.client_service import async_client_service
+
+
+def test_key_normalises_search_and_status():
+    cache = ClientCountCache(maxsize=10, ttl_seconds=60)
+    cache.put("acme_db", "  Smith ", "Active", 12, False)
+    assert cache.get("acme_db", "smith", "Active") == (12, False)
+    assert cache.get("acme_db", "smith", None) is None
+
+
+def test_invalidate_drops_only_that_tenant():
+    cache = ClientCountCache(maxsize=10, ttl_seconds=60)
+    cache.put("acme_db", None, None, 100, True)
+    cache.put("acme_db", "smith", None, 3, False)
+    cache.put("other_db", None, None, 7, False)
+    assert cache.invalidate("acme_db") == 2
+    assert cache.get("acme_db", None, None) is None
+    assert cache.get("other_db", None, None) == (7, False)
+
+
+def test_no_tenant_is_never_cached():
+    cache = ClientCountCache(maxsize=10, ttl_seconds=60)
+    cache.put(None, None, None, 5, False)
+    assert cache.get(None, None, None) is None
+    assert cache.invalidate(None) == 0
+
+
+def test_create_invalidates_the_tenant_totals(monkeypatch):
+    created = SimpleNamespace(id=uuid4(), name="Ada", email="ada@example.com", status="Active")
+
+    async def fake_create(db, payload, created_by):
+        return created
+
+    monkeypatch.setattr(async_client_repo, "create", fake_create)
+    client_counts.put("counts_db", None, None, 41, False)
+    db = SimpleNamespace(info={"tenant": "counts_db"})
+    payload = ClientCreate(name="Ada", email="ada@example.com", phone="555")
+
+    assert asyncio.run(async_client_service.create(db, payload, created_by="tester")) is created
+    assert client_counts.get("counts_db", None, None) is None
@@ -0,0 +1,106 @@
+# tests/test_client_crud.py
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.crud import client as crud
+from app.db.tenant_schema import forget_tenant_schema, mark_tenant_schema_ready
+
+
+def _sql(stmt) -> str:
+    # named paramstyle: operators come out as written (no pyformat %% escaping)
+    return str(stmt.compile(dialect=postgresql.dialect(paramstyle="named")))
+
+
+class _RecordingSession:
+    """Stands in for the AsyncSession: keeps the statement instead of running it."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return self
+
+    async def scalars(self, stmt):
+        return await self.execute(stmt)
+
+    def all(self):
+        return []
+
+    async def commit(self):
+        pass
+
+
+def _session(dialect: str, tenant: str):
+    return SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name=dialect)), info={"tenant": tenant})
+
+
+def test_fuzzy_needs_postgres_and_pg_trgm():
+    mark_tenant_schema_ready("trgm_db", trigram=True)
+    mark_tenant_schema_ready("plain_db")
+    try:
+        assert crud._is_fuzzy(_session("postgresql", "trgm_db"))
+        assert not crud._is_fuzzy(_session("postgresql", "plain_db"))
+        assert not crud._is_fuzzy(_session("sqlite", "trgm_db"))
+    finally:
+        forget_tenant_schema("trgm_db")
+        forget_tenant_schema("plain_db")
+
+
+def test_search_with_trigram_matches_and_ranks_near_matches():
+    sql = _sql(crud._list_stmt("smith", None, 1, 20, None, fuzzy=True))
+    assert sql.count("ILIKE") >= 3
+    assert "clients.name %> :" in sql and "clients.email %> :" in sql and "clients.company %> :" in sql
+    # literal hits first, then word_similarity, then the (created_at, id) tiebreak
+    order_by = sql.split("ORDER BY", 1)[1]
+    assert order_by.index("CASE WHEN") < order_by.index("greatest(word_similarity(") < order_by.index("clients.created_at DESC")
+
+
+def test_search_without_trigram_is_substring_only():
+    sql = _sql(crud._list_stmt("smith", None, 1, 20, None, fuzzy=False))
+    assert "ILIKE" in sql
+    assert "%>" not in sql and "word_similarity" not in sql
+    assert sql.split("ORDER BY", 1)[1].strip().startswith("clients.created_at DESC")
+
+
+def test_short_search_terms_skip_trigram_matching():
+    sql = _sql(crud._list_stmt("sm", None, 1, 20, None, fuzzy=True))
+    assert "ILIKE" in sql and "%>" not in sql
+
+
+def test_bulk_update_by_filter_is_substring_only():
+    sql = _sql(crud._bulk_update_stmt(crud._bulk_where(None, "smith", "Active"), {"status": "Inactive"}))
+    assert sql.startswith("UPDATE clients SET")
+    assert "ILIKE" in sql and "clients.status = " in sql
+    assert "%>" not in sql
+
+
+def test_bulk_delete_by_filter_is_substring_only():
+    sql = _sql(crud._bulk_delete_stmt(crud._bulk_where(None, "smith", None)))
+    assert sql.startswith("DELETE FROM clients WHERE")
+    assert "ILIKE" in sql and "RETURNING clients.id" in sql
+    assert "%>" not in sql
+
+
+def test_bulk_by_ids_ignores_the_filter():
+    sql = _sql(crud._bulk_delete_stmt(crud._bulk_where([uuid4()], "smith", "Active")))
+    assert "clients.id IN" in sql
+    assert "ILIKE" not in sql and "status" not in sql
+
+
+def test_bulk_writes_stay_substring_only_with_trigram_search(monkeypatch):
+    # Even where list/count search is fuzzy, a bulk write must not reach near-matches
+    monkeypatch.setattr(crud, "_is_fuzzy", lambda db: True)
+    db = _RecordingSession()
+
+    async def run():
+        await crud.bulk_update_clients_async(db, None, "smith", None, {"status": "Inactive"})
+        await crud.bulk_delete_clients_async(db, None, "smith", None)
+
+    asyncio.run(run())
+    assert len(db.statements) == 2
+    for stmt in db.statements:
+        assert "%>" not in _sql(stmt)
@@ -0,0 +1,66 @@
+# tests/test_client_import.py
+import asyncio
+
+from app.services.client_import import _csv_rows, _lines, _ndjson_rows, _validate_batch
+
+
+async def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def _parse(rows_fn, text: str, chunk_size: int = 7):
+    async def collect():
+        return [row async for row in rows_fn(_lines(_chunks(text.encode(), chunk_size)))]
+    return asyncio.run(collect())
+
+
+def test_csv_header_bom_crlf_and_empty_cells():
+    text = "﻿Name,E-mail,Phone,Notes\r\nAda,ada@example.com,555,\r\n\r\n"
+    assert _parse(_csv_rows, text.replace("E-mail", "email")) == [
+        (1, {"name": "Ada", "email": "ada@example.com", "phone": "555"}),
+    ]
+
+
+def test_csv_quoted_fields_span_lines():
+    text = 'name,notes\nAda,"line one\nline ""two"""\nAlan,x\n'
+    assert _parse(_csv_rows, text, chunk_size=3) == [
+        (1, {"name": "Ada", "notes": 'line one\nline "two"'}),
+        (2, {"name": "Alan", "notes": "x"}),
+    ]
+
+
+def test_csv_bare_quote_in_unquoted_cell():
+    text = 'name,notes\nAda,15" monitor\nAlan,x\n'
+    assert _parse(_csv_rows, text) == [
+        (1, {"name": "Ada", "notes": '15" monitor'}),
+        (2, {"name": "Alan", "notes": "x"}),
+    ]
+
+
+def test_csv_unterminated_quote_is_a_row_error():
+    rows = _parse(_csv_rows, 'name,notes\nAda,x\nAlan,"never closed\nmore\n')
+    assert rows[0] == (1, {"name": "Ada", "notes": "x"})
+    assert rows[1][0] == 2 and isinstance(rows[1][1], ValueError)
+
+
+def test_ndjson_rows():
+    text = '{"name": "Ada"}\n\nnot json\n[1, 2]\n{"name": "Alan"}'
+    rows = _parse(_ndjson_rows, text)
+    assert [r[0] for r in rows] == [1, 2, 3, 4]
+    assert rows[0][1] == {"name": "Ada"} and rows[3][1] == {"name": "Alan"}
+    assert str(rows[1][1]) == "invalid JSON"
+    assert str(rows[2][1]) == "expected a JSON object"
+
+
+def test_validate_batch_splits_valid_and_invalid():
+    valid, errors = _validate_batch([
+        (1, {"name": "Ada", "email": "ada@example.com", "phone": "555"}),
+        (2, {"name": "Alan", "email": "not-an-email", "phone": "555"}),
+        (3, ValueError("invalid JSON")),
+    ], created_by="importer")
+    assert len(valid) == 1
+    assert valid[0]["name"] == "Ada" and valid[0]["created_by"] == "importer" and valid[0]["id"]
+    assert [row for row, _ in errors] == [2, 3]
+    assert errors[0][1][0]["field"] == "email"
+    assert errors[1][1] == [{"field": None, "message": "invalid JSON"}]
@@ -0,0 +1,38 @@
+# tests/test_client_schemas.py
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.client import ClientBulkRequest
+
+
+def test_ids_selection():
+    req = ClientBulkRequest(action="delete", ids=[uuid4()])
+    assert req.filter is None
+
+
+def test_filter_selection():
+    req = ClientBulkRequest(action="update", filter={"status": "Inactive"}, changes={"status": "Active"})
+    assert req.changes.model_fields_set == {"status"}
+
+
+@pytest.mark.parametrize("body, message", [
+    ({"action": "delete"}, "either ids or filter"),
+    ({"action": "delete", "ids": [str(uuid4())], "filter": {"q": "a"}}, "either ids or filter"),
+    ({"action": "delete", "filter": {"q": "  "}}, "filter needs q and/or status"),
+    ({"action": "update", "ids": [str(uuid4())]}, "at least one field"),
+    ({"action": "update", "ids": [str(uuid4())], "changes": {}}, "at least one field"),
+    ({"action": "update", "ids": [str(uuid4())], "changes": {"name": None}}, "required fields: name"),
+    ({"action": "update", "ids": [str(uuid4())], "changes": {"email": None, "status": None}}, "email, status"),
+    ({"action": "delete", "ids": []}, "at least 1 item"),
+    ({"action": "archive", "ids": [str(uuid4())]}, "action"),
+])
+def test_rejected(body, message):
+    with pytest.raises(ValidationError, match=message):
+        ClientBulkRequest.model_validate(body)
+
+
+def test_nullable_changes_may_be_cleared():
+    req = ClientBulkRequest(action="update", ids=[uuid4()], changes={"notes": None, "company": None})
+    assert req.changes.model_dump(exclude_unset=True) == {"notes": None, "company": None}
@@ -0,0 +1,59 @@
+# tests/test_client_suggest.py
+from types import SimpleNamespace
+from uuid import UUID
+
+from app.services.client_suggest import ClientPrefixIndex, ClientSuggestRegistry
+
+ADA = (UUID(int=1), "Ada Lovelace", "ada@example.com", "Active")
+ALAN = (UUID(int=2), "Alan Turing", "turing@example.com", "Active")
+GRACE = (UUID(int=3), "Grace Hopper", "amazing.grace@example.com", "Inactive")
+
+
+def _ids(rows):
+    return [r[0].int for r in rows]
+
+
+def test_search_orders_name_then_word_then_email():
+    index = ClientPrefixIndex([GRACE, ALAN, ADA])
+    assert _ids(index.search("a", 10)) == [1, 2, 3]  # names, then GRACE by email
+    assert _ids(index.search("TUR", 10)) == [2]  # word match and email match, listed once
+    assert _ids(index.search("hop", 10)) == [3]
+    assert index.search("  ", 10) == []
+    assert _ids(index.search("a", 1)) == [1]
+
+
+def test_upsert_replaces_old_keys():
+    index = ClientPrefixIndex([ADA])
+    index.upsert((ADA[0], "Augusta King", "countess@example.com", "Active"))
+    assert index.search("ada", 10) == []
+    assert _ids(index.search("king", 10)) == [1]
+    assert len(index) == 1
+
+
+def test_remove():
+    index = ClientPrefixIndex([ADA, ALAN])
+    index.remove(ADA[0])
+    index.remove(UUID(int=99))  # unknown ids are ignored
+    assert _ids(index.search("a", 10)) == [2]
+    assert len(index) == 1
+
+
+def test_store_skips_a_build_that_raced_a_write():
+    registry = ClientSuggestRegistry(max_tenants=10, ttl_seconds=60)
+    generation = registry.generation("acme_db")
+    registry.remove("acme_db", ADA[0])  # a write lands while the index is being built
+    built = registry.store("acme_db", [ADA, ALAN], generation)
+    assert len(built) == 2  # the caller still gets its result
+    assert registry.get("acme_db") is None
+
+    index = registry.store("acme_db", [ALAN], registry.generation("acme_db"))
+    assert registry.get("acme_db") is index
+
+
+def test_registry_writes_patch_the_cached_index():
+    registry = ClientSuggestRegistry(max_tenants=10, ttl_seconds=60)
+    registry.store("acme_db", [ADA], registry.generation("acme_db"))
+    registry.upsert("acme_db", SimpleNamespace(id=ALAN[0], name=ALAN[1], email=ALAN[2], status=ALAN[3]))
+    assert _ids(registry.get("acme_db").search("al", 10)) == [2]
+    registry.invalidate("acme_db")
+    assert registry.get("acme_db") is None
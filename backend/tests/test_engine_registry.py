@@ -0,0 +1,96 @@
+# tests/test_engine_registry.py
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.db import engine_registry
+from app.db.engine_registry import ConnectionBudget, TenantConnectionBudgetExceeded, TenantEngineRegistry
+
+
+class FakeEngine:
+    def __init__(self, name):
+        self.name = name
+        self.busy = 0
+        self.pool = SimpleNamespace(checkedout=lambda: self.busy)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # _Entry timestamps default to the real clock, so start from it
+    now = SimpleNamespace(t=time.monotonic())
+    monkeypatch.setattr(engine_registry, "time", SimpleNamespace(monotonic=lambda: now.t))
+    return now
+
+
+def _registry(disposed, **kwargs):
+    options = dict(max_engines=10, idle_ttl_seconds=300, max_total_connections=100,
+                   pool_size=2, max_overflow=1, reap_interval_seconds=60)
+    options.update(kwargs)
+    return TenantEngineRegistry(lambda name, size, overflow: FakeEngine(name), disposed.append, **options)
+
+
+def test_lookups_reap_idle_engines_at_most_once_per_interval(clock):
+    disposed = []
+    registry = _registry(disposed)
+    registry.get("a_db")
+    registry.get("b_db")
+
+    clock.t += 301
+    registry.get("a_db")  # hit past the reap deadline: b_db is idle, a_db was just used
+    assert [e.name for e in disposed] == ["b_db"]
+    assert "a_db" in registry and "b_db" not in registry
+
+    registry.get("c_db")
+    clock.t += 301
+    registry.get("c_db")  # reaps a_db
+    clock.t += 30
+    registry.get("c_db")  # within the interval: no sweep
+    assert [e.name for e in disposed] == ["b_db", "a_db"]
+
+
+def test_reap_idle_keeps_busy_engines(clock):
+    disposed = []
+    registry = _registry(disposed)
+    busy = registry.get("busy_db")
+    registry.get("idle_db")
+    busy.busy = 1
+    clock.t += 301
+    assert registry.reap_idle() == 1
+    assert [e.name for e in disposed] == ["idle_db"]
+
+
+def test_budget_evicts_lru_then_refuses(clock):
+    disposed = []
+    registry = _registry(disposed, max_total_connections=6)
+    registry.get("a_db")
+    registry.get("b_db")
+    registry.get("a_db")
+    registry.get("c_db")  # 3 reserved each: b_db is least recently used
+    assert [e.name for e in disposed] == ["b_db"]
+
+    for engine in (registry.get("a_db"), registry.get("c_db")):
+        engine.busy = 1
+    with pytest.raises(TenantConnectionBudgetExceeded):
+        registry.get("d_db")
+
+
+def test_shared_budget_caps_and_evicts_across_registries(clock):
+    disposed_sync, disposed_async = [], []
+    budget = ConnectionBudget(6)
+    sync = _registry(disposed_sync, max_total_connections=None, budget=budget)
+    async_ = _registry(disposed_async, max_total_connections=None, budget=budget)
+    sync.get("a_db")
+    clock.t += 1
+    async_.get("a_db")
+    assert budget.reserved() == 6 and sync.stats()["budget_reserved_connections"] == 6
+
+    clock.t += 1
+    async_.get("b_db")  # the sync a_db engine is the least recently used idle one
+    assert [e.name for e in disposed_sync] == ["a_db"] and not disposed_async
+    assert budget.reserved() == 6
+
+    for engine in (async_.get("a_db"), async_.get("b_db")):
+        engine.busy = 1
+    with pytest.raises(TenantConnectionBudgetExceeded):
+        sync.get("c_db")
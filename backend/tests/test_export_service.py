@@ -0,0 +1,73 @@
+# tests/test_export_service.py
+import csv
+import io
+import zipfile
+from datetime import date
+from decimal import Decimal
+
+from app.services.export_service import ExportColumn, TenantFormats, _CsvEncoder, _XlsxEncoder
+
+COLUMNS = (ExportColumn("name"), ExportColumn("total", "number"), ExportColumn("joined_date", "date"))
+ROWS = [
+    ("=HYPERLINK(\"http://evil\")", Decimal("-1234.5"), date(2024, 3, 9)),
+    ("+1555", Decimal("0"), None),
+    ("@SUM(A1)", None, None),
+    ("-2+3", None, None),
+    ("Acme", None, None),
+]
+
+
+def _csv(rows, formats=TenantFormats()):
+    enc = _CsvEncoder(COLUMNS, formats, "Clients")
+    data = enc.begin() + enc.rows(rows) + enc.finish()
+    return list(csv.reader(io.StringIO(data.decode("utf-8-sig"))))
+
+
+def test_csv_guards_formula_text():
+    out = _csv(ROWS)
+    assert out[0] == ["name", "total", "joined_date"]
+    assert [r[0] for r in out[1:]] == [
+        "'=HYPERLINK(\"http://evil\")", "'+1555", "'@SUM(A1)", "'-2+3", "Acme",
+    ]
+
+
+def test_csv_leaves_negative_numbers_alone():
+    out = _csv(ROWS)
+    assert out[1][1:] == ["-1,234.50", "03/09/2024"]
+
+
+def _sheet_xml(rows):
+    enc = _XlsxEncoder(COLUMNS, TenantFormats(), "Clients")
+    data = enc.begin() + enc.rows(rows) + enc.finish()
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        return zf.read("xl/worksheets/sheet1.xml").decode(), zf.read("xl/styles.xml").decode()
+
+
+def test_xlsx_quote_prefixes_formula_text():
+    sheet, styles = _sheet_xml(ROWS)
+    assert 'quotePrefix="1"' in styles
+    assert "<f>" not in sheet
+    assert '<c t="inlineStr" s="5"><is><t xml:space="preserve">=HYPERLINK' in sheet
+    assert '<c t="inlineStr" s="5"><is><t xml:space="preserve">+1555' in sheet
+    assert '<c t="inlineStr"><is><t xml:space="preserve">Acme</t>' in sheet
+    # the value itself is unchanged, and numbers stay numeric
+    assert "'=" not in sheet
+    assert '<c s="3"><v>-1234.5</v></c>' in sheet
+
+
+def test_tenant_formats_from_settings():
+    fmt = TenantFormats.from_settings("DD.MM.YYYY", "1.234,5")
+    assert (fmt.strftime_date, fmt.excel_date) == ("%d.%m.%Y", "dd.mm.yyyy")
+    assert (fmt.group_sep, fmt.decimal_sep, fmt.decimals) == (".", ",", 1)
+    assert fmt.number(Decimal("-1234567.25")) == "-1.234.567,2"
+    assert fmt.excel_number == "#,##0.0"
+    assert fmt.date(date(2024, 3, 9)) == "09.03.2024"
+
+
+def test_tenant_formats_literals_and_fallbacks():
+    fmt = TenantFormats.from_settings("YYYY年MM月 D%", "1234")
+    assert fmt.strftime_date == "%Y年%m月 %d%%"
+    assert fmt.excel_date == "yyyy\\年mm\\月 d%"
+    assert (fmt.group_sep, fmt.decimals, fmt.excel_number) == ("", 0, "0")
+    assert TenantFormats.from_settings(None, "garbage") == TenantFormats()
+    assert TenantFormats.from_settings("no tokens", None) == TenantFormats()
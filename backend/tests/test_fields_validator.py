@@ -0,0 +1,24 @@
+# tests/test_fields_validator.py
+import pytest
+from fastapi import HTTPException
+
+from app.validators.fields_validator import parse_fields
+
+ALLOWED = ("id", "name", "email", "status", "created_at")
+
+
+@pytest.mark.parametrize("fields", [None, "", " , "])
+def test_no_fieldset_means_everything(fields):
+    assert parse_fields(fields, ALLOWED) is None
+
+
+def test_schema_order_and_always_included():
+    assert parse_fields(" status,name ", ALLOWED) == ("id", "name", "status")
+    assert parse_fields("email", ALLOWED, always=("id", "created_at")) == ("id", "email", "created_at")
+
+
+def test_unknown_field_is_422():
+    with pytest.raises(HTTPException) as exc:
+        parse_fields("name,password", ALLOWED)
+    assert exc.value.status_code == 422
+    assert "password" in exc.value.detail
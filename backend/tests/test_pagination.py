@@ -0,0 +1,65 @@
+# tests/test_pagination.py
+import base64
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.crud.client import _trim_page
+from app.utils.pagination import Cursor, decode_cursor, encode_cursor, page_cursors
+
+Row = namedtuple("Row", "id created_at")
+T0 = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+
+def _rows(n):
+    # newest first, as the list query returns them
+    return [Row(UUID(int=i + 1), T0 - timedelta(minutes=i)) for i in range(n)]
+
+
+def test_cursor_round_trip():
+    client_id = uuid4()
+    token = encode_cursor(T0, client_id, "prev")
+    assert "=" not in token
+    assert decode_cursor(token) == Cursor(T0, client_id, "prev")
+
+
+@pytest.mark.parametrize("token", [
+    "",
+    "not base64!",
+    base64.urlsafe_b64encode(b"[]").decode(),
+    base64.urlsafe_b64encode(b'{"c":"2024-05-01","i":"x","d":"next"}').decode(),
+    base64.urlsafe_b64encode(b'{"c":"2024-05-01T00:00:00","i":"%s","d":"up"}' % str(uuid4()).encode()).decode(),
+])
+def test_decode_rejects_foreign_tokens(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+
+def test_trim_page_next():
+    rows = _rows(4)
+    page, has_more = _trim_page(rows, 3, None)
+    assert page == rows[:3] and has_more
+    page, has_more = _trim_page(rows[:2], 3, Cursor(T0, uuid4(), "next"))
+    assert page == rows[:2] and not has_more
+
+
+def test_trim_page_prev_returns_newest_first():
+    oldest_first = list(reversed(_rows(4)))
+    page, has_more = _trim_page(oldest_first, 3, Cursor(T0, uuid4(), "prev"))
+    assert has_more
+    assert page == list(reversed(oldest_first[:3]))
+
+
+def test_page_cursors():
+    rows = _rows(3)
+    first = page_cursors(rows, True, None, page=1)
+    assert first.prev is None
+    assert decode_cursor(first.next) == Cursor(rows[-1].created_at, rows[-1].id, "next")
+
+    back = page_cursors(rows, False, Cursor(T0, uuid4(), "prev"))
+    assert back.prev is None
+    assert decode_cursor(back.next).id == rows[-1].id
+
+    assert page_cursors([], True, None).next is None
@@ -0,0 +1,57 @@
+# tests/test_xlsx_stream.py
+import io
+import zipfile
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from app.utils.xlsx_stream import XlsxStreamWriter
+
+
+def _workbook(writer, batches):
+    data = writer.begin()
+    for batch in batches:
+        data += writer.write_rows(batch)
+    data += writer.finish()
+    return zipfile.ZipFile(io.BytesIO(data))
+
+
+def test_package_parts_and_typed_cells():
+    writer = XlsxStreamWriter(
+        ["name", "count", "total", "day", "at"],
+        ["text", "int", "number", "date", "datetime"],
+        sheet_name="Clients & <Co>",
+        date_format="dd/mm/yyyy",
+    )
+    zf = _workbook(writer, [
+        [("Ada & Co", 3, Decimal("12.50"), date(1900, 3, 1), datetime(2024, 1, 1, 6, tzinfo=timezone.utc))],
+        [("x\x01y", None, "n/a", None, None)],
+    ])
+    assert zf.testzip() is None
+    assert set(zf.namelist()) == {
+        "[Content_Types].xml", "_rels/.rels", "xl/workbook.xml", "xl/_rels/workbook.xml.rels",
+        "xl/styles.xml", "xl/worksheets/sheet1.xml",
+    }
+    assert 'name="Clients &amp; &lt;Co&gt;"' in zf.read("xl/workbook.xml").decode()
+    assert 'formatCode="dd/mm/yyyy"' in zf.read("xl/styles.xml").decode()
+
+    sheet = zf.read("xl/worksheets/sheet1.xml").decode()
+    assert '<row r="1"><c t="inlineStr" s="4"><is><t xml:space="preserve">name</t>' in sheet
+    assert '<row r="2"><c t="inlineStr"><is><t xml:space="preserve">Ada &amp; Co</t></is></c>' in sheet
+    assert "<c><v>3</v></c>" in sheet
+    assert '<c s="3"><v>12.50</v></c>' in sheet
+    assert '<c s="1"><v>61.0</v></c>' in sheet  # 1900-03-01 is serial 61
+    assert '<c s="2"><v>45292.25</v></c>' in sheet
+    # invalid XML characters dropped, a non-number in a number column stays text
+    assert '<row r="3"><c t="inlineStr"><is><t xml:space="preserve">xy</t></is></c><c/>' in sheet
+    assert '<t xml:space="preserve">n/a</t>' in sheet
+    assert sheet.endswith("</sheetData></worksheet>")
+
+
+def test_chunks_concatenate_into_one_zip():
+    writer = XlsxStreamWriter(["n"], ["int"])
+    head = writer.begin()
+    body = writer.write_rows([(i,) for i in range(1000)])
+    tail = writer.finish()
+    assert head.startswith(b"PK") and tail  # body may still sit in zlib's buffer
+    sheet = zipfile.ZipFile(io.BytesIO(head + body + tail)).read("xl/worksheets/sheet1.xml").decode()
+    assert sheet.count("<row ") == 1001